@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { installPrimaryPinning } from './primaryPin';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'https://chama-savings-app.onrender.com/api';
 
@@ -44,4 +45,6 @@ api.interceptors.response.use(
   }
 );
 
+installPrimaryPinning(api);
+
 export default api;
@@ -1,6 +1,7 @@
 // src/api/contributionApi.ts
 import axios, { AxiosError } from 'axios';
 import { Contribution } from '../types/Contribution';
+import { installPrimaryPinning } from './primaryPin';
 
 const API_URL = import.meta.env.VITE_API_URL || 'https://chama-savings-app.onrender.com/api';
 
@@ -13,6 +14,17 @@ const api = axios.create({
   },
 });
 
+installPrimaryPinning(api);
+
+// Recording and confirming contributions requires a signed-in treasurer, group admin or member
+api.interceptors.request.use((config) => {
+  const token = localStorage.getItem('token');
+  if (token) {
+    config.headers.Authorization = `Bearer ${token}`;
+  }
+  return config;
+});
+
 // Add response interceptor for consistent error handling
 api.interceptors.response.use(
   (response) => response,
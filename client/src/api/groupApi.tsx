@@ -1,6 +1,7 @@
 // src/api/groupApi.ts
 import axios from 'axios';
 import { Group, CreateGroupPayload } from '../types/group';
+import { installPrimaryPinning } from './primaryPin';
 
 const API_URL = import.meta.env.VITE_API_URL || 'https://chama-savings-app.onrender.com/api';
 
@@ -9,6 +10,8 @@ const instance = axios.create({
   withCredentials: true,
 });
 
+installPrimaryPinning(instance);
+
 // Automatically attach JWT token to all requests
 instance.interceptors.request.use((config) => {
   const token = localStorage.getItem('token');
@@ -0,0 +1,26 @@
+// Read-your-writes with a database read replica.
+//
+// After a write the API returns X-DB-Primary-Until (epoch seconds). Until
+// then, echoing it back sends our reads to the primary, so we see the write
+// even while the replica lags. Shared by every axios instance in the app.
+import axios, { AxiosInstance } from 'axios';
+
+export const PRIMARY_HEADER = 'X-DB-Primary-Until';
+
+let primaryUntil = 0;
+
+export function installPrimaryPinning(instance: AxiosInstance = axios) {
+  instance.interceptors.request.use((config) => {
+    if (primaryUntil > Date.now() / 1000) {
+      config.headers[PRIMARY_HEADER] = String(primaryUntil);
+    }
+    return config;
+  });
+  instance.interceptors.response.use((response) => {
+    const until = Number(response.headers[PRIMARY_HEADER.toLowerCase()]);
+    if (until > primaryUntil) {
+      primaryUntil = until;
+    }
+    return response;
+  });
+}
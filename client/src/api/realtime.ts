@@ -0,0 +1,138 @@
+// Live group updates from the API's Socket.IO endpoint.
+//
+// Speaks the Socket.IO v5 (Engine.IO v4) wire format over the browser's
+// WebSocket, so no client library is needed. One connection is shared by
+// every subscriber: rooms are joined with "join_group", re-joined after a
+// reconnect, and the socket closes when the last subscriber leaves.
+// Events (see server/services/realtime.py):
+//   contribution.created / contribution.confirmed / contribution.rejected
+//   group.balance {group_id, current_amount}
+import { useEffect, useRef } from 'react';
+
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'https://chama-savings-app.onrender.com/api';
+const MAX_RETRY_MS = 30000;
+
+export type ContributionEventName = 'contribution.created' | 'contribution.confirmed' | 'contribution.rejected';
+
+export interface ContributionEvent {
+  id: number;
+  group_id: number;
+  member_id: number;
+  amount: number;
+  status: 'pending' | 'confirmed' | 'rejected';
+  created_at: string | null;
+}
+
+export interface BalanceEvent {
+  group_id: number;
+  current_amount: number;
+}
+
+export interface GroupEventHandlers {
+  onBalance?: (event: BalanceEvent) => void;
+  onContribution?: (name: ContributionEventName, event: ContributionEvent) => void;
+}
+
+type Listener = (name: string, payload: { group_id: number }) => void;
+
+const listeners = new Map<number, Set<Listener>>();
+let socket: WebSocket | null = null;
+let joined = false;
+let retryMs = 1000;
+let retryTimer: ReturnType<typeof setTimeout> | undefined;
+
+function socketUrl() {
+  const url = new URL(API_BASE_URL.replace(/\/api\/?$/, ''), window.location.href);
+  url.protocol = url.protocol === 'https:' ? 'wss:' : 'ws:';
+  url.pathname = '/socket.io/';
+  url.search = 'EIO=4&transport=websocket';
+  return url.toString();
+}
+
+function emit(event: string, data: unknown) {
+  if (joined && socket?.readyState === WebSocket.OPEN) {
+    socket.send('42' + JSON.stringify([event, data]));
+  }
+}
+
+function onSocketPacket(packet: string) {
+  switch (packet[0]) {
+    case '0': // namespace connected
+      joined = true;
+      retryMs = 1000;
+      listeners.forEach((_, groupId) => emit('join_group', { group_id: groupId }));
+      break;
+    case '2': { // event
+      const [name, payload] = JSON.parse(packet.slice(1));
+      listeners.get(payload?.group_id)?.forEach((listener) => listener(name, payload));
+      break;
+    }
+    case '4': // refused: missing, expired or revoked token
+      socket?.close();
+      break;
+  }
+}
+
+function connect() {
+  const token = localStorage.getItem('token');
+  if (socket || !token || listeners.size === 0) return;
+
+  const ws = new WebSocket(socketUrl());
+  socket = ws;
+  ws.onmessage = ({ data }) => {
+    const packet = String(data);
+    if (packet[0] === '0') ws.send('40' + JSON.stringify({ token })); // engine open -> connect with auth
+    else if (packet[0] === '2') ws.send('3'); // ping -> pong
+    else if (packet[0] === '4') onSocketPacket(packet.slice(1));
+  };
+  ws.onclose = () => {
+    socket = null;
+    joined = false;
+    if (listeners.size > 0) {
+      retryTimer = setTimeout(connect, retryMs);
+      retryMs = Math.min(retryMs * 2, MAX_RETRY_MS);
+    }
+  };
+}
+
+export function subscribeToGroup(groupId: number, listener: Listener) {
+  const group = listeners.get(groupId) ?? new Set<Listener>();
+  if (!listeners.has(groupId)) {
+    listeners.set(groupId, group);
+    emit('join_group', { group_id: groupId });
+  }
+  group.add(listener);
+  connect();
+
+  return () => {
+    group.delete(listener);
+    if (group.size === 0 && listeners.get(groupId) === group) {
+      listeners.delete(groupId);
+      emit('leave_group', { group_id: groupId });
+    }
+    if (listeners.size === 0) {
+      clearTimeout(retryTimer);
+      socket?.close();
+    }
+  };
+}
+
+// Subscribe a component to events for `groupIds` while it is mounted
+export function useGroupEvents(groupIds: number[], handlers: GroupEventHandlers) {
+  const latest = useRef(handlers);
+  latest.current = handlers;
+  const key = [...new Set(groupIds)].sort((a, b) => a - b).join(',');
+
+  useEffect(() => {
+    if (!key) return;
+    const listener: Listener = (name, payload) => {
+      if (name === 'group.balance') {
+        latest.current.onBalance?.(payload as BalanceEvent);
+      } else if (name.startsWith('contribution.')) {
+        latest.current.onContribution?.(name as ContributionEventName, payload as ContributionEvent);
+      }
+    };
+    const unsubscribes = key.split(',').map((groupId) => subscribeToGroup(Number(groupId), listener));
+    return () => unsubscribes.forEach((unsubscribe) => unsubscribe());
+  }, [key]);
+}
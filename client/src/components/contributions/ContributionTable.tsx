@@ -4,6 +4,7 @@ import axios from 'axios';
 import { FiPlus, FiEdit2, FiTrash2 } from 'react-icons/fi';
 import { useAuth } from '../../context/AuthContext';
 import toast from 'react-hot-toast';
+import { useGroupEvents } from '../../api/realtime';
 
 interface Contribution {
   id: number;
@@ -34,6 +35,7 @@ const ContributionTable = () => {
   const auth = useAuth();
   const user = auth.user as AuthUser | null;
   const [contributions, setContributions] = useState<Contribution[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [groups, setGroups] = useState<Group[]>([]);
   const [showForm, setShowForm] = useState(false);
   const [formData, setFormData] = useState({
@@ -46,18 +48,22 @@ const ContributionTable = () => {
   const [searchTerm, setSearchTerm] = useState('');
 
   const API_BASE = 'https://chama-savings-app.onrender.com/api';
+  const PAGE_SIZE = 100;
 
-  const fetchContributions = async () => {
+  // Keyset paging: the API returns { items, next_cursor }; pass the cursor to load the next page
+  const fetchContributions = async (cursor?: string) => {
     try {
       const res = await axios.get(`${API_BASE}/contributions`, {
+        params: { limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) },
         headers: {
           Authorization: `Bearer ${auth.token}`,
         },
         withCredentials: true,
       });
-      const all = res.data;
-      const filtered = user?.role === 'admin' ? all : all.filter((c: Contribution) => c.member_id === user?.id);
-      setContributions(filtered);
+      const { items, next_cursor } = res.data as { items: Contribution[]; next_cursor: string | null };
+      const filtered = user?.role === 'admin' ? items : items.filter((c: Contribution) => c.member_id === user?.id);
+      setContributions((previous) => (cursor ? [...previous, ...filtered] : filtered));
+      setNextCursor(next_cursor);
     } catch (err) {
       console.error('Failed to fetch contributions:', err);
     }
@@ -146,6 +152,19 @@ const ContributionTable = () => {
     fetchGroups();
   }, []);
 
+  // Live updates for the groups on screen instead of re-fetching after other users' changes
+  useGroupEvents(contributions.map((c) => c.group_id), {
+    onContribution: (name, event) => {
+      if (name === 'contribution.created') {
+        fetchContributions();
+        return;
+      }
+      setContributions((previous) =>
+        previous.map((c) => (c.id === event.id ? { ...c, status: event.status } : c))
+      );
+    },
+  });
+
   const filteredContributions = contributions.filter((c) =>
     (c.member_name || '').toLowerCase().includes(searchTerm.toLowerCase())
   );
@@ -269,6 +288,16 @@ const ContributionTable = () => {
             ))}
           </tbody>
         </table>
+        {nextCursor && (
+          <div className="flex justify-center py-4">
+            <button
+              onClick={() => fetchContributions(nextCursor)}
+              className="px-4 py-2 text-emerald-700 border border-emerald-600 rounded hover:bg-emerald-50"
+            >
+              Load more
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useParams } from 'react-router-dom';
 import axios from 'axios';
+import { useGroupEvents } from '../../api/realtime';
 
 type Member = {
   id: number;
@@ -35,6 +36,12 @@ const GroupDetails: React.FC = () => {
       });
   }, [groupId]);
 
+  // The server pushes the new balance after each confirmed contribution
+  useGroupEvents(group ? [group.id] : [], {
+    onBalance: ({ current_amount }) =>
+      setGroup((previous) => (previous ? { ...previous, current_amount } : previous)),
+  });
+
   if (loading) return <div className="text-center mt-10">Loading group details...</div>;
   if (!group) return <div className="text-center mt-10 text-red-500">Group not found</div>;
 
@@ -2,6 +2,9 @@ import { StrictMode } from 'react'
 import { createRoot } from 'react-dom/client'
 import './global.css'
 import App from './App.tsx'
+import { installPrimaryPinning } from './api/primaryPin'
+
+installPrimaryPinning()
 
 createRoot(document.getElementById('root')!).render(
   <StrictMode>
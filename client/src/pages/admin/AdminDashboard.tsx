@@ -1,12 +1,26 @@
 import { useEffect, useState } from "react";
 import AdminStatCard from "../../components/admin/AdminStatCard";
 
+// Shape of GET /api/admin/summary
+interface AdminSummary {
+  users: number;
+  groups: number;
+  members: number;
+  active_members: number;
+  contributions: number;
+  contributions_by_status: { pending: number; confirmed: number; rejected: number };
+  confirmed_total: number;
+}
+
 const AdminDashboard = () => {
-  const [stats, setStats] = useState({
+  const [stats, setStats] = useState<AdminSummary>({
     users: 0,
-    loans: 0,
+    groups: 0,
+    members: 0,
+    active_members: 0,
     contributions: 0,
-    payments: 0,
+    contributions_by_status: { pending: 0, confirmed: 0, rejected: 0 },
+    confirmed_total: 0,
   });
 
   const fetchStats = async () => {
@@ -52,15 +66,19 @@ const AdminDashboard = () => {
 
       <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-4">
         <AdminStatCard title="Total Users" value={stats.users} icon="users" />
-        <AdminStatCard title="Active Loans" value={stats.loans} icon="loans" />
         <AdminStatCard
           title="Total Contributions"
           value={stats.contributions}
           icon="contributions"
         />
         <AdminStatCard
-          title="Total Payments"
-          value={stats.payments}
+          title="Pending Contributions"
+          value={stats.contributions_by_status.pending}
+          icon="contributions"
+        />
+        <AdminStatCard
+          title="Confirmed Total"
+          value={stats.confirmed_total.toLocaleString()}
           icon="payments"
         />
       </div>
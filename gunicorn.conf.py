@@ -0,0 +1,59 @@
+# Gunicorn settings for the API, picked by environment variables.
+#
+#   gunicorn -c gunicorn.conf.py 'server.app:create_app()'
+#
+# GUNICORN_WORKER_CLASS
+#   sync     one request per worker process (gunicorn's default)
+#   gthread  GUNICORN_THREADS requests per worker on OS threads
+#   gevent   GUNICORN_WORKER_CONNECTIONS requests per worker on greenlets;
+#            psycopg2 and password hashing are made cooperative by
+#            server/green.py and SocketIO runs in gevent mode
+#
+# The database pool is sized from the worker's concurrency and a
+# platform-wide DB_MAX_CONNECTIONS budget split across workers, with no
+# overflow, so WEB_CONCURRENCY x pool never exceeds what Postgres allows.
+# Requests beyond the pool wait up to DB_POOL_TIMEOUT for a connection.
+# Explicit DB_POOL_SIZE / DB_MAX_OVERFLOW / SOCKETIO_ASYNC_MODE win.
+#
+# With more than one worker the app requires JWT_BLOCKLIST_URL and
+# IDEMPOTENCY_URL, since revocations and Idempotency-Key reservations must be
+# seen by every worker, and the response cache stays off unless
+# RESPONSE_CACHE_URL is set.
+#
+# SocketIO long-polling needs every request of a session to reach the same
+# worker, so gevent defaults to a single worker; run more only with
+# SOCKETIO_MESSAGE_QUEUE set and sticky sessions in front.
+import multiprocessing
+import os
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+if worker_class not in ('sync', 'gthread', 'gevent'):
+    raise RuntimeError(f'Unsupported GUNICORN_WORKER_CLASS {worker_class!r}')
+
+green = worker_class == 'gevent'
+workers = int(os.getenv('WEB_CONCURRENCY', 1 if green else multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 200))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 20))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# Requests one worker can have in flight, and its share of the DB budget
+worker_concurrency = worker_connections if green else threads
+db_budget = int(os.getenv('DB_MAX_CONNECTIONS', 20))
+pool_size = max(1, min(worker_concurrency, db_budget // workers))
+
+# The app refuses per-process stores (token blocklist, idempotency keys, response cache) with several workers,
+# and only hashes passwords on a pool in workers that serve several requests at once
+os.environ['WEB_CONCURRENCY'] = str(workers)
+os.environ['GUNICORN_WORKER_CLASS'] = worker_class
+os.environ.setdefault('DB_POOL_SIZE', str(pool_size))
+os.environ.setdefault('DB_MAX_OVERFLOW', '0')
+os.environ.setdefault('SOCKETIO_ASYNC_MODE', 'gevent' if green else 'threading')
+
+
+def on_starting(server):
+    server.log.info(
+        "%s x %s worker(s), %s request(s) each, DB pool %s+%s per worker",
+        workers, worker_class, worker_concurrency, os.environ['DB_POOL_SIZE'], os.environ['DB_MAX_OVERFLOW']
+    )
@@ -2,12 +2,26 @@ import os
 from flask import Flask, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
-from server.extensions import db, migrate, api, jwt
+from server.extensions import db, migrate, api, jwt, socketio
 from server.routes.auth import auth_bp
 from server.routes.user import user_bp
 from server.routes.group import group_bp
 from server.routes.member_routes import member_bp
 from server.routes.contribution_routes import contribution_bp
+from server.routes.admin import admin_bp
+from server.commands import register_commands
+from server.query_budget import init_query_budget
+from server.instrumentation import init_instrumentation
+from server.green import init_green, is_green
+from server.db_routing import PRIMARY_HEADER, configure_database, init_replica_routing
+from server.services.passwords import password_verifier, DEFAULT_HASH_METHOD
+from server.services.principal import init_principal_cache
+from server.services.token_blocklist import token_blocklist
+from server.services.cache import response_cache
+from server.services.realtime import balance_coalescer
+from server.services.jobs import job_queue
+from server.services.idempotency import idempotency_store
+from server.services.admin_summary import init_admin_summary
 
 # Load environment variables
 load_dotenv()
@@ -18,20 +32,72 @@ def create_app():
     # === Configuration ===
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///chama.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['WEB_CONCURRENCY'] = int(os.getenv('WEB_CONCURRENCY', 1))  # server worker processes
+    app.config['SERVER_WORKER_CLASS'] = os.getenv('GUNICORN_WORKER_CLASS', 'sync')  # sync / gthread / gevent
+    app.config['DATABASE_REPLICA_URL'] = os.getenv('DATABASE_REPLICA_URL')
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 5))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    app.config['DB_POOL_TIMEOUT'] = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    app.config['DB_POOL_PRE_PING'] = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    app.config['DB_STATEMENT_TIMEOUT_MS'] = int(os.getenv('DB_STATEMENT_TIMEOUT_MS')) if os.getenv('DB_STATEMENT_TIMEOUT_MS') else None
+    app.config['DB_REPLICA_STICKY_SECONDS'] = int(os.getenv('DB_REPLICA_STICKY_SECONDS', 5))
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', os.urandom(24))
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'default-jwt-secret')
     app.config['JWT_TOKEN_LOCATION'] = ['headers']
     app.config['CORS_SUPPORTS_CREDENTIALS'] = True
+    app.config['JWT_BLOCKLIST_URL'] = os.getenv('JWT_BLOCKLIST_URL')
+    app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+    app.config['PASSWORD_WORKERS'] = int(os.getenv('PASSWORD_WORKERS', 2))  # gthread / gevent workers only
+    app.config['PASSWORD_QUEUE_SIZE'] = int(os.getenv('PASSWORD_QUEUE_SIZE', 8))
+    app.config['PRINCIPAL_CACHE_TTL'] = int(os.getenv('PRINCIPAL_CACHE_TTL', 30))
+    app.config['RESPONSE_CACHE_TTL'] = int(os.getenv('RESPONSE_CACHE_TTL', 60))
+    app.config['RESPONSE_CACHE_URL'] = os.getenv('RESPONSE_CACHE_URL')
+    # eventlet / gevent / threading; gevent only in a monkey-patched process, where its greenlets run
+    app.config['SOCKETIO_ASYNC_MODE'] = os.getenv('SOCKETIO_ASYNC_MODE') or ('gevent' if is_green() else 'threading')
+    app.config['SOCKETIO_MESSAGE_QUEUE'] = os.getenv('SOCKETIO_MESSAGE_QUEUE')  # redis:// for multi-worker
+    app.config['SOCKETIO_COALESCE_SECONDS'] = float(os.getenv('SOCKETIO_COALESCE_SECONDS', 0.25))
+    app.config['ADMIN_SUMMARY_TTL'] = int(os.getenv('ADMIN_SUMMARY_TTL', 30))
+    app.config['IDEMPOTENCY_TTL'] = int(os.getenv('IDEMPOTENCY_TTL', 86400))
+    app.config['IDEMPOTENCY_URL'] = os.getenv('IDEMPOTENCY_URL')  # redis:// for multi-worker
+    app.config['GROUP_MEMBER_CAP'] = int(os.getenv('GROUP_MEMBER_CAP')) if os.getenv('GROUP_MEMBER_CAP') else None
+    app.config['JOBS_WORKERS'] = int(os.getenv('JOBS_WORKERS', 2))  # 0 = run after-commit jobs inline
+    app.config['SQL_QUERY_BUDGET'] = int(os.getenv('SQL_QUERY_BUDGET')) if os.getenv('SQL_QUERY_BUDGET') else None
+    app.config['LOG_FORMAT'] = os.getenv('LOG_FORMAT', 'json')  # json / text
+    app.config['LOG_LEVEL'] = os.getenv('LOG_LEVEL', 'INFO')
+    app.config['SLOW_QUERY_MS'] = float(os.getenv('SLOW_QUERY_MS')) if os.getenv('SLOW_QUERY_MS') else None
+    app.config['SLOW_QUERY_EXPLAIN'] = os.getenv('SLOW_QUERY_EXPLAIN', 'true').lower() == 'true'
+    app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')
 
     # === CORS Setup ===
     frontend_origin = os.getenv("FRONTEND_ORIGIN", "https://chama-savings-app-1.onrender.com")
-    CORS(app, supports_credentials=True, resources={r"/api/*": {"origins": [frontend_origin]}})
+    CORS(app, supports_credentials=True, expose_headers=[PRIMARY_HEADER],
+         resources={r"/api/*": {"origins": [frontend_origin]}})
 
     # === Init Extensions ===
+    init_green(app)
+    configure_database(app)
     db.init_app(app)
+    init_replica_routing(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    token_blocklist.init_app(app)
     api.init_app(app)
+    init_query_budget(app)
+    init_instrumentation(app)
+    password_verifier.init_app(app)
+    init_principal_cache(app)
+    response_cache.init_app(app)
+    idempotency_store.init_app(app)
+    init_admin_summary(app)
+    socketio.init_app(
+        app,
+        async_mode=app.config['SOCKETIO_ASYNC_MODE'],
+        message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'],
+        cors_allowed_origins=[frontend_origin]
+    )
+    balance_coalescer.init_app(app)
+    job_queue.init_app(app)
 
     # === Register Blueprints ===
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -39,6 +105,10 @@ def create_app():
     app.register_blueprint(group_bp, url_prefix='/api/groups')
     app.register_blueprint(member_bp, url_prefix='/api/member')
     app.register_blueprint(contribution_bp, url_prefix='/api/contributions')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
+
+    # === CLI Commands ===
+    register_commands(app)
 
     # === Root Route ===
     @app.route('/')
@@ -52,4 +122,4 @@ def create_app():
 if __name__ == '__main__':
     app = create_app()
     port = int(os.getenv('PORT', 10000))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    socketio.run(app, host='0.0.0.0', port=port, debug=True)
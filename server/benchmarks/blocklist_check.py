@@ -0,0 +1,47 @@
+"""Benchmark the per-request token revocation check.
+
+    python -m server.benchmarks.blocklist_check --revoked 100000 --checks 200000
+"""
+import argparse
+import time
+import uuid
+from server.services.token_blocklist import MemoryBlocklist, RedisBlocklist
+
+
+def measure(store, revoked, checks):
+    expires_at = time.time() + 3600
+    for jti in revoked:
+        store.revoke(jti, expires_at)
+    # Mostly live tokens, with every tenth check hitting a revoked one
+    probes = [revoked[i % len(revoked)] if i % 10 == 0 else str(uuid.uuid4()) for i in range(checks)]
+    started = time.perf_counter()
+    hits = sum(store.is_revoked(jti) for jti in probes)
+    elapsed = time.perf_counter() - started
+    return elapsed / checks * 1e6, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--revoked', type=int, default=100000)
+    parser.add_argument('--checks', type=int, default=200000)
+    parser.add_argument('--redis-url', help='Benchmark a real Redis instead of fakeredis')
+    args = parser.parse_args()
+
+    revoked = [str(uuid.uuid4()) for _ in range(args.revoked)]
+    stores = [('memory (bloom + map)', MemoryBlocklist(maxsize=args.revoked))]
+    if args.redis_url:
+        stores.append(('redis', RedisBlocklist.from_url(args.redis_url)))
+    else:
+        try:
+            import fakeredis
+            stores.append(('fakeredis', RedisBlocklist(fakeredis.FakeRedis())))
+        except ImportError:
+            pass
+
+    for name, store in stores:
+        per_check, hits = measure(store, revoked, args.checks)
+        print(f'{name:>22}: {per_check:.2f} µs per check ({hits} revoked hits)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Bulk-load synthetic users, groups, members and contributions.
+
+    python -m server.benchmarks.datagen --groups 10000 --members 1000000 --contributions 50000000
+
+Writes to DATABASE_URL (tables must exist: run ``flask db upgrade`` first)
+or to a fresh temporary SQLite file. Rows go in with COPY on PostgreSQL and
+chunked executemany elsewhere; derived data (group balances, member_stats,
+contribution_rollups) is rebuilt with set-based SQL at the end. Every
+user can log in with BENCH_PASSWORD.
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+
+BENCH_PASSWORD = 'bench-password'
+CHUNK_SIZE = 50000
+CONTRIBUTION_STATUSES = ('confirmed',) * 6 + ('pending',) * 3 + ('rejected',)
+
+
+def _copy_rows(connection, table, columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(['' if row[column] is None else row[column] for column in columns])
+    buffer.seek(0)
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def write_rows(connection, table, rows):
+    """Insert a chunk of row dicts: COPY on PostgreSQL, executemany elsewhere."""
+    if not rows:
+        return
+    if connection.dialect.name == 'postgresql':
+        _copy_rows(connection, table, list(rows[0]), rows)
+    else:
+        connection.execute(table.insert(), rows)
+
+
+def _next_id(connection, table):
+    return (connection.scalar(select(func.max(table.c.id))) or 0) + 1
+
+
+def _reset_sequences(connection, tables):
+    if connection.dialect.name != 'postgresql':
+        return
+    for table in tables:
+        connection.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+        )
+
+
+def generate(db, groups, members, contributions, users=None, days=365, seed=0, chunk_size=CHUNK_SIZE, log=print):
+    """Load the requested row counts and return them as a dict."""
+    from server.models import User, Group, Member, Contribution
+    from server.services.balances import (
+        reconcile_group_balances, rebuild_contribution_rollups, rebuild_member_stats
+    )
+    from server.services.passwords import hash_password
+
+    rng = random.Random(seed)
+    per_group = max(1, members // groups)
+    members = per_group * groups
+    users = max(users or members // 2, per_group)
+    now = datetime.utcnow()
+    connection = db.session.connection()
+    users_t, groups_t, members_t = User.__table__, Group.__table__, Member.__table__
+
+    # One hash for every user keeps generation fast and logins realistic
+    password_hash = hash_password(BENCH_PASSWORD)
+    first_user = _next_id(connection, users_t)
+    started = time.perf_counter()
+    for start in range(0, users, chunk_size):
+        write_rows(connection, users_t, [
+            {'id': first_user + i, 'username': f'bench_{first_user + i}', 'email': f'bench_{first_user + i}@chama.test',
+             'password_hash': password_hash, 'role': 'member', 'created_at': now, 'is_active': True,
+             'is_verified': True}
+            for i in range(start, min(start + chunk_size, users))
+        ])
+    log(f'users: {users} in {time.perf_counter() - started:.1f}s')
+
+    def member_user(group_index, k):
+        return first_user + (group_index * per_group + k) % users
+
+    first_group = _next_id(connection, groups_t)
+    first_member = _next_id(connection, members_t)
+    started = time.perf_counter()
+    group_rows, member_rows = [], []
+    for g in range(groups):
+        statuses = ['active'] + [('active' if rng.random() < 0.8 else 'pending') for _ in range(per_group - 1)]
+        group_rows.append({
+            'id': first_group + g, 'name': f'Bench Group {first_group + g}', 'created_at': now,
+            'target_amount': rng.choice((50000, 100000, 250000)), 'current_amount': 0, 'is_public': g % 5 != 0,
+            'admin_id': member_user(g, 0), 'status': 'active',
+            'member_count': per_group, 'active_member_count': statuses.count('active')
+        })
+        for k, status in enumerate(statuses):
+            member_rows.append({
+                'id': first_member + g * per_group + k, 'user_id': member_user(g, k), 'group_id': first_group + g,
+                'join_date': now, 'status': status, 'is_admin': k == 0
+            })
+        if len(member_rows) >= chunk_size or g == groups - 1:
+            write_rows(connection, groups_t, group_rows)
+            write_rows(connection, members_t, member_rows)
+            group_rows, member_rows = [], []
+    log(f'groups: {groups}, members: {members} in {time.perf_counter() - started:.1f}s')
+
+    started = time.perf_counter()
+    contributions_t = Contribution.__table__
+    span = days * 86400
+    for start in range(0, contributions, chunk_size):
+        rows = []
+        for _ in range(start, min(start + chunk_size, contributions)):
+            member_index = rng.randrange(members)
+            rows.append({
+                'member_id': first_member + member_index,
+                'group_id': first_group + member_index // per_group,
+                'amount': rng.randint(100, 5000),
+                'created_at': now - timedelta(seconds=rng.randrange(span)),
+                'status': rng.choice(CONTRIBUTION_STATUSES)
+            })
+        write_rows(connection, contributions_t, rows)
+        if start and start % (chunk_size * 20) == 0:
+            log(f'  {start} contributions...')
+    log(f'contributions: {contributions} in {time.perf_counter() - started:.1f}s')
+
+    _reset_sequences(connection, (users_t, groups_t, members_t))
+    db.session.commit()
+
+    started = time.perf_counter()
+    reconcile_group_balances(fix=True)
+    rebuild_member_stats()
+    rebuild_contribution_rollups()
+    log(f'derived balances, member stats and rollups in {time.perf_counter() - started:.1f}s')
+    return {'users': users, 'groups': groups, 'members': members, 'contributions': contributions,
+            'first_user_id': first_user}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=1000)
+    parser.add_argument('--members', type=int, default=20000)
+    parser.add_argument('--contributions', type=int, default=1000000)
+    parser.add_argument('--users', type=int, help='Defaults to members / 2 (two groups per user)')
+    parser.add_argument('--days', type=int, default=365, help='Spread contributions over this many days')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if not os.getenv('DATABASE_URL'):
+        path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+        print(f'DATABASE_URL=sqlite:///{path}')
+
+    from server.app import create_app
+    from server.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            db.create_all()
+        generate(db, args.groups, args.members, args.contributions, users=args.users, days=args.days, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark GET /api/groups/ query count and latency.
+
+    python -m server.benchmarks.group_list --groups 1000 --contributions 1000000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from sqlalchemy import event
+from server.benchmarks.datagen import generate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=1000)
+    parser.add_argument('--members-per-group', type=int, default=10)
+    parser.add_argument('--contributions', type=int, default=1000000)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ.setdefault('RESPONSE_CACHE_TTL', '0')  # measure the query, not the cache
+
+    from server.app import create_app
+    from server.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        generate(db, args.groups, args.groups * args.members_per_group, args.contributions,
+                 log=lambda message: None)
+        print(f'Populated {args.groups} groups / {args.contributions} contributions '
+              f'in {time.perf_counter() - started:.1f}s')
+
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *a: statements.append(a[2]))
+        client = app.test_client()
+        timings = []
+        for _ in range(args.runs):
+            statements.clear()
+            started = time.perf_counter()
+            response = client.get('/api/groups/')
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.data
+
+    print(f'GET /api/groups/: {len(statements)} SQL statements per request')
+    print(f'latency ms: median {statistics.median(timings):.1f}, max {max(timings):.1f}')
+
+
+if __name__ == '__main__':
+    main()
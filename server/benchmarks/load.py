@@ -0,0 +1,198 @@
+"""Locust-style HTTP load test: concurrent virtual users running weighted tasks.
+
+    python -m server.benchmarks.load --users 20 --duration 30 --output load.json
+    python -m server.benchmarks.load --host http://localhost:10000 --users 50 --duration 60
+
+Without --host a local server is started in a background thread on a
+generated SQLite database. With --host the target must hold datagen data
+(server.benchmarks.datagen), since virtual users log in as bench users.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+import requests
+from server.benchmarks.datagen import BENCH_PASSWORD
+from server.benchmarks.results import compare, summarize, write_results
+
+# (name, weight): reads dominate, as they do in the app
+TASKS = (
+    ('group_list', 4),
+    ('group_detail', 4),
+    ('contribution_list', 3),
+    ('member_summary', 3),
+    ('contribution_create', 1),
+)
+
+
+class VirtualUser:
+    def __init__(self, host, username, rng):
+        self.host = host.rstrip('/')
+        self.username = username
+        self.rng = rng
+        self.http = requests.Session()
+        self.member_row = None
+
+    def call(self, method, path, **kwargs):
+        return self.http.request(method, self.host + path, timeout=30, **kwargs)
+
+    def on_start(self):
+        response = self.call('POST', '/api/auth/login', json={'username': self.username, 'password': BENCH_PASSWORD})
+        response.raise_for_status()
+        body = response.json()
+        self.http.headers['Authorization'] = f"Bearer {body['access_token']}"
+        groups = self.call('GET', '/api/groups/').json()
+        self.group_ids = [group['id'] for group in groups[:500]] or [1]
+        members = self.call('GET', f'/api/member/group/{self.rng.choice(self.group_ids)}').json()
+        self.member_row = members[0] if members else None
+        return response
+
+    def group_list(self):
+        return self.call('GET', '/api/groups/')
+
+    def group_detail(self):
+        return self.call('GET', f'/api/groups/{self.rng.choice(self.group_ids)}')
+
+    def contribution_list(self):
+        return self.call('GET', '/api/contributions/?limit=50')
+
+    def member_summary(self):
+        return self.call('GET', '/api/member/summary')
+
+    def contribution_create(self):
+        row = self.member_row
+        return self.call('POST', '/api/contributions/', json={
+            'member_id': row['id'], 'group_id': row['group_id'], 'amount': self.rng.randint(100, 5000)
+        })
+
+
+def run_user(host, username, seed, deadline, think_time, stats, lock):
+    rng = random.Random(seed)
+    user = VirtualUser(host, username, rng)
+    names, weights = zip(*TASKS)
+    timings, failures = defaultdict(list), defaultdict(int)
+
+    def timed(name, request):
+        started = time.perf_counter()
+        try:
+            ok = request().status_code < 400
+        except requests.RequestException:
+            ok = False
+        timings[name].append((time.perf_counter() - started) * 1000)
+        if not ok:
+            failures[name] += 1
+
+    timed('login', user.on_start)
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        timed(name, getattr(user, name))
+        if think_time:
+            time.sleep(rng.uniform(0, think_time))
+
+    with lock:
+        for name, values in timings.items():
+            stats['timings'][name].extend(values)
+        for name, count in failures.items():
+            stats['failures'][name] += count
+
+
+def start_local_server(args):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load.db')}?timeout=30"
+    os.environ.setdefault('JOBS_WORKERS', '0')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from server.app import create_app
+    from server.extensions import db
+    from server.benchmarks.datagen import generate
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        generate(db, args.groups, args.members, args.contributions)
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server
+
+
+def bench_usernames(count, first_user_id=1):
+    # datagen names users bench_<id>
+    return [f'bench_{first_user_id + i}' for i in range(count)]
+
+
+def run_load(host, usernames, duration, think_time=0.0):
+    """Run one virtual user per username against ``host``; return ``(stats, elapsed_seconds)``."""
+    stats = {'timings': defaultdict(list), 'failures': defaultdict(int)}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=run_user, args=(host, username, i, deadline, think_time, stats, lock))
+        for i, username in enumerate(usernames)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats, time.perf_counter() - started
+
+
+def summarize_load(stats, elapsed):
+    """Per-task summaries with failures and throughput; prints one line per task."""
+    results = {}
+    total = 0
+    for name, values in sorted(stats['timings'].items()):
+        results[name] = summarize(values)
+        results[name]['failures'] = stats['failures'][name]
+        results[name]['rps'] = round(len(values) / elapsed, 2)
+        total += len(values)
+        r = results[name]
+        print(f"{name:<24} {r['runs']:>7} req  {r['rps']:>8.1f}/s  median {r['median_ms']:>8.2f} ms  "
+              f"p95 {r['p95_ms']:>8.2f} ms  failures {r['failures']}")
+    print(f'total {total} requests in {elapsed:.1f}s ({total / elapsed:.1f}/s)')
+    return results, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host')
+    parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Max random pause between tasks (s)')
+    parser.add_argument('--groups', type=int, default=100)
+    parser.add_argument('--members', type=int, default=2000)
+    parser.add_argument('--contributions', type=int, default=100000)
+    parser.add_argument('--first-user-id', type=int, default=1, help='Lowest datagen user id on --host')
+    parser.add_argument('--output', default='load-results.json')
+    parser.add_argument('--compare', help='Previous results file to compare against')
+    args = parser.parse_args()
+
+    server = None
+    host = args.host
+    if not host:
+        host, server = start_local_server(args)
+
+    stats, elapsed = run_load(host, bench_usernames(args.users, args.first_user_id), args.duration, args.think_time)
+    if server is not None:
+        server.shutdown()
+    results, total = summarize_load(stats, elapsed)
+
+    if args.compare:
+        for line in compare(args.compare, results, key='p95_ms'):
+            print(line)
+    config = {'host': args.host or 'local', 'users': args.users, 'duration': args.duration,
+              'think_time': args.think_time, 'total_rps': round(total / elapsed, 2)}
+    write_results(args.output, 'load', config, results)
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
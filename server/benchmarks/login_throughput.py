@@ -0,0 +1,56 @@
+"""Benchmark POST /api/auth/login throughput against password worker count.
+
+    python -m server.benchmarks.login_throughput --workers 0 1 2 4 --clients 16 --logins 200
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run(app, clients, logins):
+    def login(i):
+        with app.test_client() as client:
+            return client.post('/api/auth/login', json={'username': 'bench_user', 'password': 'bench-password'}).status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        codes = Counter(pool.map(login, range(logins)))
+    return time.perf_counter() - started, codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--queue-size', type=int, default=64)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+    from server.app import create_app
+    from server.extensions import db
+    from server.models.user import User
+    from server.services.passwords import password_verifier
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username='bench_user', email='bench@chama.test', password='bench-password'))
+        db.session.commit()
+
+    print(f"{'workers':>8} {'logins/s':>10} {'ok':>6} {'429':>6}")
+    for workers in args.workers:
+        app.config['SERVER_WORKER_CLASS'] = 'gthread'  # the bench client sends concurrent requests
+        app.config['PASSWORD_WORKERS'] = workers
+        app.config['PASSWORD_QUEUE_SIZE'] = args.queue_size
+        password_verifier.init_app(app)
+        elapsed, codes = run(app, args.clients, args.logins)
+        print(f"{workers or 'inline':>8} {args.logins / elapsed:>10.1f} {codes.get(200, 0):>6} {codes.get(429, 0):>6}")
+
+
+if __name__ == '__main__':
+    main()
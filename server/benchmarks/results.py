@@ -0,0 +1,62 @@
+"""Timing summaries and JSON result files shared by the benchmark scripts."""
+import json
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(timings_ms):
+    return {
+        'runs': len(timings_ms),
+        'mean_ms': round(statistics.fmean(timings_ms), 3) if timings_ms else 0.0,
+        'median_ms': round(statistics.median(timings_ms), 3) if timings_ms else 0.0,
+        'p95_ms': round(percentile(timings_ms, 95), 3),
+        'p99_ms': round(percentile(timings_ms, 99), 3),
+        'min_ms': round(min(timings_ms), 3) if timings_ms else 0.0,
+        'max_ms': round(max(timings_ms), 3) if timings_ms else 0.0,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path, kind, config, results):
+    document = {
+        'kind': kind,
+        'commit': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'config': config,
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, default=str)
+    return document
+
+
+def compare(previous_path, results, key='median_ms'):
+    """Yield one line per scenario comparing ``key`` with a previous results file."""
+    with open(previous_path) as f:
+        previous = json.load(f)
+    yield f"vs {previous.get('commit')} ({previous.get('timestamp')}):"
+    for name, current in results.items():
+        before = previous.get('results', {}).get(name)
+        if not before or not before.get(key):
+            yield f'  {name:<24} new'
+            continue
+        change = (current[key] - before[key]) / before[key] * 100
+        yield f'  {name:<24} {before[key]:>9.2f} -> {current[key]:>9.2f} {key} ({change:+.1f}%)'
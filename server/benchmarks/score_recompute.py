@@ -0,0 +1,101 @@
+"""Time the set-based contribution score recompute against the per-member ORM path.
+
+    python -m server.benchmarks.score_recompute --groups 20000 --members 1000000 --contributions 5000000
+    python -m server.benchmarks.score_recompute --database-url postgresql://... --chunk-size 1000
+
+Without --database-url a fresh SQLite database is generated with
+server.benchmarks.datagen; with it, the database must already hold datagen
+data. Scores in member_stats are reset to zero first so the full run rewrites
+every member with a confirmed contribution; a second run measures the no-change pass.
+The ORM path (load each member's contributions and count in Python) is
+timed on --sample members and extrapolated to the whole table.
+"""
+import argparse
+import os
+import tempfile
+import time
+from sqlalchemy import func, select
+from server.benchmarks.datagen import generate
+from server.benchmarks.results import compare, summarize, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url')
+    parser.add_argument('--groups', type=int, default=2000)
+    parser.add_argument('--members', type=int, default=100000)
+    parser.add_argument('--contributions', type=int, default=500000)
+    parser.add_argument('--chunk-size', type=int, default=500, help='Groups per UPDATE')
+    parser.add_argument('--sample', type=int, default=1000, help='Members timed on the ORM path')
+    parser.add_argument('--output', default='score-recompute-results.json')
+    parser.add_argument('--compare', help='Previous results file to compare against')
+    args = parser.parse_args()
+
+    generated = not args.database_url
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'scores.db')}"
+    os.environ.setdefault('JOBS_WORKERS', '0')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from server.app import create_app
+    from server.extensions import db
+    from server.models import Member, MemberStats
+    from server.services.scores import recompute_contribution_scores
+
+    app = create_app()
+    with app.app_context():
+        if generated:
+            db.create_all()
+            generate(db, args.groups, args.members, args.contributions)
+        member_total = db.session.scalar(select(func.count(Member.id)))
+
+        db.session.execute(MemberStats.__table__.update().values(score=0))
+        db.session.commit()
+        chunks = []
+
+        def report(done, total, changed):
+            now = time.perf_counter()
+            chunks.append((now - report.last) * 1000)
+            report.last = now
+            print(f'  {done}/{total} groups, {changed} member(s) updated', end='\r')
+
+        report.last = started = time.perf_counter()
+        changed = recompute_contribution_scores(args.chunk_size, progress=report)
+        full_ms = (time.perf_counter() - started) * 1000
+        print()
+
+        started = time.perf_counter()
+        unchanged = recompute_contribution_scores(args.chunk_size)
+        noop_ms = (time.perf_counter() - started) * 1000
+
+        member_ids = db.session.scalars(select(Member.id).order_by(Member.id).limit(args.sample)).all()
+        started = time.perf_counter()
+        for member_id in member_ids:
+            member = db.session.get(Member, member_id)
+            if member.stats is not None:
+                member.stats.score = sum(1 for c in member.contributions if c.status == 'confirmed')
+        db.session.commit()
+        orm_ms = (time.perf_counter() - started) * 1000
+        orm_estimate_ms = orm_ms / max(len(member_ids), 1) * member_total
+
+        results = {
+            'set_based_full': {**summarize([full_ms]), 'members_changed': changed},
+            'set_based_chunk': summarize(chunks),
+            'set_based_noop': {**summarize([noop_ms]), 'members_changed': unchanged},
+            'orm_per_member_extrapolated': {**summarize([orm_estimate_ms]), 'sampled_members': len(member_ids)},
+        }
+        for name, r in results.items():
+            print(f"{name:<28} median {r['median_ms']:>12.2f} ms  p95 {r['p95_ms']:>12.2f} ms")
+
+        config = {'database': db.engine.dialect.name, 'members': member_total, 'chunk_size': args.chunk_size}
+        if generated:
+            config.update(groups=args.groups, contributions=args.contributions)
+
+    if args.compare:
+        for line in compare(args.compare, results):
+            print(line)
+    write_results(args.output, 'score_recompute', config, results)
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Load-test the API under each gunicorn worker profile and compare them.
+
+    python -m server.benchmarks.serving --users 50 --duration 30
+    python -m server.benchmarks.serving --database-url postgresql://... --profiles sync gevent \
+        --workers 2 --redis-url redis://localhost:6379/0
+
+For each profile in gunicorn.conf.py (sync, gthread, gevent) a gunicorn
+server is started on a local port against the same database, and the
+server.benchmarks.load virtual users are run against it. Without
+--database-url a SQLite database is generated first; point it at Postgres
+(ideally a remote one) to see the effect of cooperative I/O, since SQLite
+calls never yield. Profiles whose worker class is not installed are skipped.
+More than one worker needs --redis-url for the shared token blocklist,
+response cache and idempotency store.
+"""
+import argparse
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import requests
+from server.benchmarks.load import bench_usernames, run_load, summarize_load
+from server.benchmarks.results import compare, write_results
+
+ROOT = Path(__file__).resolve().parents[2]
+PROFILES = ('sync', 'gthread', 'gevent')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(profile, database_url, args):
+    port = free_port()
+    env = {
+        **os.environ,
+        'PYTHONPATH': str(ROOT),
+        'DATABASE_URL': database_url,
+        'GUNICORN_WORKER_CLASS': profile,
+        'WEB_CONCURRENCY': str(args.workers),
+        'LOG_LEVEL': 'WARNING',
+    }
+    if args.redis_url:
+        for key in ('JWT_BLOCKLIST_URL', 'RESPONSE_CACHE_URL', 'IDEMPOTENCY_URL'):
+            env[key] = args.redis_url
+    if args.threads:
+        env['GUNICORN_THREADS'] = str(args.threads)
+    if not args.cache:
+        env['RESPONSE_CACHE_TTL'] = '0'
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', str(ROOT / 'gunicorn.conf.py'),
+         '--bind', f'127.0.0.1:{port}', 'server.app:create_app()'],
+        cwd=ROOT, env=env
+    )
+    host = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn ({profile}) exited with {process.returncode}')
+        try:
+            if requests.get(f'{host}/api/groups/', timeout=5).status_code == 200:
+                return host, process
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f'gunicorn ({profile}) did not come up on {host}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url')
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    parser.add_argument('--workers', type=int, default=1, help='WEB_CONCURRENCY for every profile')
+    parser.add_argument('--redis-url', help='Shared stores; required with more than one worker')
+    parser.add_argument('--threads', type=int, help='GUNICORN_THREADS for gthread')
+    parser.add_argument('--users', type=int, default=50, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds per profile')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Max random pause between tasks (s)')
+    parser.add_argument('--groups', type=int, default=100)
+    parser.add_argument('--members', type=int, default=2000)
+    parser.add_argument('--contributions', type=int, default=100000)
+    parser.add_argument('--first-user-id', type=int, default=1, help='Lowest datagen user id')
+    parser.add_argument('--cache', action='store_true', help='Leave the response cache on')
+    parser.add_argument('--output', default='serving-results.json')
+    parser.add_argument('--compare', help='Previous results file to compare against')
+    args = parser.parse_args()
+    if args.workers > 1 and not args.redis_url:
+        parser.error('--workers > 1 needs --redis-url')
+
+    database_url = args.database_url
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'serving.db')}?timeout=30"
+        os.environ['DATABASE_URL'] = database_url
+        os.environ.setdefault('JOBS_WORKERS', '0')
+        os.environ.setdefault('LOG_LEVEL', 'WARNING')
+        from server.app import create_app
+        from server.extensions import db
+        from server.benchmarks.datagen import generate
+
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            generate(db, args.groups, args.members, args.contributions)
+            db.engine.dispose()
+
+    results, totals = {}, {}
+    usernames = bench_usernames(args.users, args.first_user_id)
+    for profile in args.profiles:
+        if profile == 'gevent' and importlib.util.find_spec('gevent') is None:
+            print('gevent is not installed; skipping the gevent profile')
+            continue
+        print(f'== {profile} ==')
+        host, process = start_gunicorn(profile, database_url, args)
+        try:
+            stats, elapsed = run_load(host, usernames, args.duration, args.think_time)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        profile_results, total = summarize_load(stats, elapsed)
+        totals[profile] = round(total / elapsed, 2)
+        for name, summary in profile_results.items():
+            results[f'{profile}/{name}'] = summary
+
+    print('total throughput: ' + ', '.join(f'{profile} {rps}/s' for profile, rps in totals.items()))
+    if args.compare:
+        for line in compare(args.compare, results, key='p95_ms'):
+            print(line)
+    config = {'database': database_url.split(':', 1)[0], 'workers': args.workers, 'threads': args.threads,
+              'users': args.users, 'duration': args.duration, 'think_time': args.think_time,
+              'cache': args.cache, 'total_rps': totals}
+    write_results(args.output, 'serving', config, results)
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Time the main API scenarios in-process and write the results as JSON.
+
+    python -m server.benchmarks.suite --groups 200 --members 4000 --contributions 200000 --output bench.json
+    python -m server.benchmarks.suite --database-url postgresql://... --compare bench.json
+
+Each scenario runs through the Flask test client, so timings cover routing,
+serialization and SQL but not the network. Without --database-url a fresh
+SQLite database is generated with server.benchmarks.datagen; with it, the
+database must already hold datagen data. The response cache is off unless
+--cache is given, so reads measure the database path.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from sqlalchemy import event, select
+from server.benchmarks.datagen import BENCH_PASSWORD, generate
+from server.benchmarks.results import compare, summarize, write_results
+
+
+def scenarios(client, db, rng):
+    from server.models import Member, User
+
+    member = db.session.execute(
+        select(Member.id, Member.group_id, User.username)
+        .join(User, User.id == Member.user_id)
+        .where(User.username.like('bench_%'), Member.status == 'active')
+        .order_by(Member.id).limit(1)
+    ).one()
+    login = client.post('/api/auth/login', json={'username': member.username, 'password': BENCH_PASSWORD})
+    assert login.status_code == 200, login.data
+    auth = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+    group_ids = db.session.scalars(select(Member.group_id).distinct().limit(500)).all()
+
+    return {
+        'login': lambda: client.post('/api/auth/login',
+                                     json={'username': member.username, 'password': BENCH_PASSWORD}),
+        'group_list': lambda: client.get('/api/groups/'),
+        'group_detail': lambda: client.get(f'/api/groups/{rng.choice(group_ids)}'),
+        'contribution_list': lambda: client.get('/api/contributions/?limit=50'),
+        'contribution_create': lambda: client.post('/api/contributions/', json={
+            'member_id': member.id, 'group_id': member.group_id, 'amount': rng.randint(100, 5000)
+        }),
+        'member_summary': lambda: client.get('/api/member/summary', headers=auth),
+    }
+
+
+def run_scenario(request, db, runs, warmup):
+    statements = []
+    listener = lambda *args: statements.append(1)
+    for _ in range(warmup):
+        request()
+    timings = []
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            response = request()
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code < 400, (response.status_code, response.data[:200])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    result = summarize(timings)
+    result['sql_statements'] = round(len(statements) / runs, 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url')
+    parser.add_argument('--groups', type=int, default=200)
+    parser.add_argument('--members', type=int, default=4000)
+    parser.add_argument('--contributions', type=int, default=200000)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--only', nargs='+', help='Run just these scenarios')
+    parser.add_argument('--cache', action='store_true', help='Leave the response cache on')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--compare', help='Previous results file to compare against')
+    args = parser.parse_args()
+
+    generated = not args.database_url
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'suite.db')}"
+    os.environ.setdefault('JOBS_WORKERS', '0')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    if not args.cache:
+        os.environ['RESPONSE_CACHE_TTL'] = '0'
+
+    from server.app import create_app
+    from server.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        if generated:
+            db.create_all()
+            generate(db, args.groups, args.members, args.contributions)
+        client = app.test_client()
+        results = {}
+        for name, request in scenarios(client, db, random.Random(0)).items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = run_scenario(request, db, args.runs, args.warmup)
+            r = results[name]
+            print(f"{name:<24} median {r['median_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f} ms  "
+                  f"{r['sql_statements']:>5} SQL/req")
+
+        config = {'database': db.engine.dialect.name, 'runs': args.runs, 'cache': args.cache}
+        if generated:
+            config.update(groups=args.groups, members=args.members, contributions=args.contributions)
+
+    if args.compare:
+        for line in compare(args.compare, results):
+            print(line)
+    write_results(args.output, 'suite', config, results)
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
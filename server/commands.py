@@ -0,0 +1,69 @@
+import click
+from flask.cli import AppGroup
+from server.services.balances import reconcile_group_balances, rebuild_contribution_rollups, rebuild_member_stats
+from server.services.ledger_export import EXPORT_FORMATS, iter_export
+from server.services.scores import DEFAULT_CHUNK_SIZE, recompute_contribution_scores
+
+balances_cli = AppGroup('balances', help='Group balance maintenance.')
+ledger_cli = AppGroup('ledger', help='Contribution ledger tools.')
+members_cli = AppGroup('members', help='Member maintenance.')
+
+
+@balances_cli.command('reconcile')
+@click.option('--dry-run', is_flag=True, help='Report drift without rewriting balances.')
+def reconcile_balances(dry_run):
+    drift = reconcile_group_balances(fix=not dry_run)
+    if not drift:
+        click.echo('✅ All group balances match their confirmed contributions.')
+        return
+    for group_id, stored, expected in drift:
+        click.echo(f'⚠️  Group {group_id}: stored {stored} != confirmed {expected} (drift {expected - stored})')
+    action = 'found' if dry_run else 'fixed'
+    click.echo(f'{len(drift)} drifted group balance(s) {action}.')
+
+
+@balances_cli.command('rebuild-member-stats')
+def rebuild_member_stats_command():
+    rows = rebuild_member_stats()
+    click.echo(f'✅ Rebuilt member stats for {rows} member(s).')
+
+
+@balances_cli.command('rebuild-rollups')
+def rebuild_rollups_command():
+    rows = rebuild_contribution_rollups()
+    click.echo(f'✅ Rebuilt {rows} contribution rollup row(s).')
+
+
+@members_cli.command('recompute-scores')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=DEFAULT_CHUNK_SIZE, show_default=True,
+              help='Groups per UPDATE statement/transaction.')
+@click.option('--quiet', is_flag=True, help='Only print the final count.')
+def recompute_scores_command(chunk_size, quiet):
+    def report(done, total, changed):
+        if not quiet:
+            click.echo(f'  {done}/{total} groups, {changed} member(s) updated')
+
+    changed = recompute_contribution_scores(chunk_size, progress=report)
+    click.echo(f'✅ Recomputed contribution scores; {changed} member(s) changed.')
+
+
+@ledger_cli.command('export')
+@click.argument('group_id', type=int)
+@click.option('--format', 'export_format', type=click.Choice(list(EXPORT_FORMATS)), default='csv')
+@click.option('--output', type=click.Path(dir_okay=False, writable=True), help='Defaults to stdout.')
+def export_ledger(group_id, export_format, output):
+    if output:
+        with open(output, 'wb') as handle:
+            for chunk in iter_export(group_id, export_format):
+                handle.write(chunk.encode() if isinstance(chunk, str) else chunk)
+        click.echo(f'✅ Group {group_id} ledger written to {output}')
+        return
+    stream = click.get_binary_stream('stdout')
+    for chunk in iter_export(group_id, export_format):
+        stream.write(chunk.encode() if isinstance(chunk, str) else chunk)
+
+
+def register_commands(app):
+    app.cli.add_command(balances_cli)
+    app.cli.add_command(ledger_cli)
+    app.cli.add_command(members_cli)
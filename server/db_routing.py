@@ -0,0 +1,123 @@
+# Engine options from configuration, and read-replica routing.
+#
+# Pool sizing, pre-ping, recycle and a statement timeout come from the
+# DB_* settings. When DATABASE_REPLICA_URL is set, SELECTs issued while
+# handling GET/HEAD requests go to the replica bind; everything else
+# (writes, SELECT ... FOR UPDATE, CLI commands, jobs) uses the primary.
+# After a request commits a write, the response carries an
+# X-DB-Primary-Until timestamp; the client echoes it on later requests
+# (a header, not a cookie, so it also works cross-origin) and its reads
+# stay on the primary until then so it sees its own writes despite
+# replication lag.
+import time
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session as BaseSession
+from sqlalchemy.sql import Select
+
+REPLICA_BIND = 'replica'
+PRIMARY_HEADER = 'X-DB-Primary-Until'
+READ_METHODS = ('GET', 'HEAD')
+
+
+def engine_options(url, config):
+    """SQLAlchemy create_engine() options for ``url`` from DB_* settings."""
+    dialect = make_url(url).get_backend_name()
+    options = {
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+    }
+    if dialect != 'sqlite':
+        # SQLite uses a file-lock pool where these do not apply
+        options['pool_size'] = config.get('DB_POOL_SIZE', 5)
+        options['max_overflow'] = config.get('DB_MAX_OVERFLOW', 10)
+        options['pool_timeout'] = config.get('DB_POOL_TIMEOUT', 30)
+    timeout = config.get('DB_STATEMENT_TIMEOUT_MS')
+    if timeout and dialect == 'postgresql':
+        options['connect_args'] = {'options': f'-c statement_timeout={int(timeout)}'}
+    return options
+
+
+def configure_database(app):
+    """Fill in engine options and the replica bind; call before db.init_app()."""
+    config = app.config
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(config['SQLALCHEMY_DATABASE_URI'], config)
+    replica_url = config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        config.setdefault('SQLALCHEMY_BINDS', {})[REPLICA_BIND] = {
+            'url': replica_url, **engine_options(replica_url, config)
+        }
+
+
+def use_primary():
+    """Send the rest of this request's reads to the primary."""
+    g.db_use_primary = True
+
+
+def _sticky_seconds():
+    return current_app.config.get('DB_REPLICA_STICKY_SECONDS', 5)
+
+
+def replica_lag_seconds():
+    """How long a committed write may be missing from reads; 0 without a replica."""
+    if REPLICA_BIND not in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        return 0
+    return _sticky_seconds()
+
+
+def pinned_to_primary():
+    """Whether this request's reads are sent to the primary after a recent write."""
+    if REPLICA_BIND not in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        return False
+    if g.get('db_use_primary'):
+        return True
+    try:
+        until = float(request.headers.get(PRIMARY_HEADER, 0))
+    except ValueError:
+        return False
+    # Ignore stale values and anything further out than we would ever issue
+    now = time.time()
+    return now < until <= now + _sticky_seconds()
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        if REPLICA_BIND not in self._db.engines or self._flushing or self.info.get('wrote'):
+            return False
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return False
+        if not has_request_context() or request.method not in READ_METHODS:
+            return False
+        return not pinned_to_primary()
+
+
+@event.listens_for(BaseSession, 'after_flush')
+def remember_write(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(BaseSession, 'after_commit')
+def pin_after_write(session):
+    if session.info.pop('wrote', False) and has_request_context():
+        g.db_use_primary = True
+        g.db_committed_write = True
+
+
+@event.listens_for(BaseSession, 'after_rollback')
+def forget_write(session):
+    session.info.pop('wrote', None)
+
+
+def init_replica_routing(app):
+    @app.after_request
+    def set_primary_header(response):
+        if g.get('db_committed_write') and REPLICA_BIND in app.config.get('SQLALCHEMY_BINDS', {}):
+            response.headers[PRIMARY_HEADER] = f'{time.time() + _sticky_seconds():.3f}'
+        return response
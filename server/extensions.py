@@ -7,12 +7,19 @@ from flask_jwt_extended import JWTManager
 from flask_marshmallow import Marshmallow
 from flask_socketio import SocketIO
 from flask_cors import CORS
+from server.services.token_blocklist import token_blocklist
+from server.db_routing import RoutingSession
 
 # Initialize Flask extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 api = Api()
 bcrypt = Bcrypt()
 jwt = JWTManager()
 ma = Marshmallow()
-socketio = SocketIO(cors_allowed_origins="*")
\ No newline at end of file
+socketio = SocketIO(cors_allowed_origins="*")
+
+
+@jwt.token_in_blocklist_loader
+def check_if_token_revoked(jwt_header, jwt_payload):
+    return token_blocklist.is_revoked(jwt_payload)
@@ -0,0 +1,67 @@
+# Cooperative serving under gunicorn's gevent worker.
+#
+# The worker monkey-patches the standard library before the app is loaded,
+# but psycopg2 talks to libpq in C and would still block every greenlet in
+# the worker for the length of each round trip. init_green() installs a
+# psycopg2 wait callback so database I/O yields to the gevent hub, and
+# run_blocking() moves CPU-heavy calls (password hashing) onto gevent's
+# native thread pool. Outside a patched process both are no-ops.
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def is_green():
+    """True when running in a gevent monkey-patched process."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('socket')
+
+
+def _gevent_wait_callback(conn, timeout=None):
+    import psycopg2
+    from psycopg2 import extensions
+    from gevent.socket import wait_read, wait_write
+
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(f'Bad result from poll: {state!r}')
+
+
+def patch_psycopg():
+    """Make psycopg2 connections cooperative; COPY is unavailable afterwards."""
+    try:
+        from psycopg2 import extensions
+    except ImportError:
+        return False
+    if extensions.get_wait_callback() is None:
+        extensions.set_wait_callback(_gevent_wait_callback)
+    return True
+
+
+def run_blocking(fn, *args, timeout=None):
+    """Run ``fn(*args)`` on a native thread and wait for it without blocking the hub.
+
+    Raises TimeoutError when ``timeout`` seconds pass first.
+    """
+    from gevent import Timeout, get_hub
+
+    try:
+        return get_hub().threadpool.spawn(fn, *args).get(timeout=timeout)
+    except Timeout:
+        raise TimeoutError(f'{getattr(fn, "__name__", fn)} did not finish in {timeout}s')
+
+
+def init_green(app):
+    app.config['GREEN'] = is_green()
+    if app.config['GREEN'] and patch_psycopg():
+        logger.info("gevent worker detected; psycopg2 wait callback installed")
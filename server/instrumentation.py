@@ -0,0 +1,269 @@
+# Request-level metrics, structured logs and slow-query profiling.
+#
+# Every request records its latency, SQL statement count and time, and
+# response size per endpoint. Totals are served in Prometheus text format
+# on /metrics (per process: scrape each worker, or run one worker per pod)
+# and each request is logged as one JSON line on the "server.requests"
+# logger. Set SLOW_QUERY_MS to log statements slower than that, with their
+# EXPLAIN plan when SLOW_QUERY_EXPLAIN is on.
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from flask import Response, current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from server.query_budget import statement_count
+
+logger = logging.getLogger('server.requests')
+slow_query_logger = logging.getLogger('server.sql')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+EXPLAIN_PREFIXES = {'sqlite': 'EXPLAIN QUERY PLAN ', 'postgresql': 'EXPLAIN ', 'mysql': 'EXPLAIN '}
+
+_listening = False
+
+
+# ─────────────────────────────────────────────
+# Metrics
+# ─────────────────────────────────────────────
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{str(value).replace(chr(34), chr(39))}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield f'{self.name}{_format_labels(self.labels, labels)} {value}'
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, description, buckets, labels=()):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.labels = labels
+        self._values = {}
+
+    def observe(self, labels, value):
+        counts, total = self._values.get(labels, ([0] * (len(self.buckets) + 1), 0))
+        counts[bisect_left(self.buckets, value)] += 1
+        self._values[labels] = (counts, total + value)
+
+    def samples(self):
+        names = self.labels + ('le',)
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                yield f'{self.name}_bucket{_format_labels(names, labels + (bound,))} {cumulative}'
+            yield f'{self.name}_sum{_format_labels(self.labels, labels)} {total}'
+            yield f'{self.name}_count{_format_labels(self.labels, labels)} {cumulative}'
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        endpoint = ('method', 'endpoint')
+        self.requests = Counter('http_requests_total', 'Requests handled', endpoint + ('status',))
+        self.latency = Histogram('http_request_duration_seconds', 'Request latency', LATENCY_BUCKETS, endpoint)
+        self.statements = Histogram('http_request_sql_statements', 'SQL statements per request',
+                                    STATEMENT_BUCKETS, endpoint)
+        self.sql_seconds = Counter('http_request_sql_seconds_total', 'Time spent in SQL', endpoint)
+        self.response_bytes = Histogram('http_response_size_bytes', 'Response body size', SIZE_BUCKETS, endpoint)
+        self.slow_queries = Counter('sql_slow_queries_total', 'Statements over SLOW_QUERY_MS', ('endpoint',))
+
+    def record(self, method, endpoint, status, seconds, statements, sql_seconds, size):
+        labels = (method, endpoint)
+        with self._lock:
+            self.requests.inc(labels + (status,))
+            self.latency.observe(labels, seconds)
+            self.statements.observe(labels, statements)
+            self.sql_seconds.inc(labels, sql_seconds)
+            if size is not None:
+                self.response_bytes.observe(labels, size)
+
+    def record_slow_query(self, endpoint):
+        with self._lock:
+            self.slow_queries.inc((endpoint,))
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for metric in (self.requests, self.latency, self.statements, self.sql_seconds,
+                           self.response_bytes, self.slow_queries):
+                lines.append(f'# HELP {metric.name} {metric.description}')
+                lines.append(f'# TYPE {metric.name} {metric.kind}')
+                lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics()
+
+
+# ─────────────────────────────────────────────
+# Structured logging
+# ─────────────────────────────────────────────
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(app):
+    """Send everything under the ``server`` logger to stderr, as JSON unless LOG_FORMAT=text."""
+    server_logger = logging.getLogger('server')
+    server_logger.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+    if any(getattr(handler, '_chama', False) for handler in server_logger.handlers):
+        return
+    handler = logging.StreamHandler()
+    handler._chama = True
+    if app.config.get('LOG_FORMAT', 'json') == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    server_logger.addHandler(handler)
+    server_logger.propagate = False
+
+
+# ─────────────────────────────────────────────
+# SQL timing and slow-query log
+# ─────────────────────────────────────────────
+def _endpoint_label():
+    if has_request_context() and request.url_rule is not None:
+        return request.url_rule.rule
+    return 'unmatched' if has_request_context() else 'background'
+
+
+def _explain(cursor, dialect_name, statement, parameters):
+    prefix = EXPLAIN_PREFIXES.get(dialect_name)
+    if prefix is None:
+        return None
+    # A raw DBAPI cursor keeps the EXPLAIN itself out of these listeners
+    explain_cursor = cursor.connection.cursor()
+    try:
+        explain_cursor.execute(prefix + statement, parameters)
+        return [' '.join(str(column) for column in row) for row in explain_cursor.fetchall()]
+    finally:
+        explain_cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the per-statement context, so a statement that raises leaves nothing behind
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_query_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if not has_app_context():
+        return
+    g.sql_seconds = g.get('sql_seconds', 0.0) + elapsed
+
+    threshold = current_app.config.get('SLOW_QUERY_MS')
+    if threshold is None or elapsed * 1000 < threshold:
+        return
+    endpoint = _endpoint_label()
+    request_metrics.record_slow_query(endpoint)
+    fields = {'duration_ms': round(elapsed * 1000, 2), 'endpoint': endpoint, 'statement': statement}
+    if (current_app.config.get('SLOW_QUERY_EXPLAIN') and not executemany
+            and statement.lstrip().upper().startswith('SELECT')):
+        try:
+            fields['plan'] = _explain(cursor, conn.dialect.name, statement, parameters)
+        except Exception as e:
+            fields['plan_error'] = str(e)
+    slow_query_logger.warning('slow query', extra={'fields': fields})
+
+
+def _ensure_listening():
+    global _listening
+    if not _listening:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _listening = True
+
+
+# ─────────────────────────────────────────────
+# Middleware
+# ─────────────────────────────────────────────
+def _record_request(status, size, exc_info=None):
+    started = g.pop('request_started', None)
+    if started is None or request.endpoint == 'metrics':
+        return
+    seconds = time.perf_counter() - started
+    endpoint = _endpoint_label()
+    statements = statement_count()
+    sql_seconds = g.get('sql_seconds', 0.0)
+    request_metrics.record(request.method, endpoint, status, seconds, statements, sql_seconds, size)
+    logger.log(logging.ERROR if exc_info else logging.INFO, 'request', exc_info=exc_info, extra={'fields': {
+        'method': request.method,
+        'path': request.path,
+        'endpoint': endpoint,
+        'status': status,
+        'duration_ms': round(seconds * 1000, 2),
+        'sql_statements': statements,
+        'sql_ms': round(sql_seconds * 1000, 2),
+        'response_bytes': size,
+    }})
+
+
+def init_instrumentation(app):
+    configure_logging(app)
+    _ensure_listening()
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        g.sql_seconds = 0.0
+
+    @app.after_request
+    def record_request(response):
+        # Streamed bodies (ndjson, exports) have no length yet; latency is time to first byte
+        size = None if response.is_streamed else response.calculate_content_length()
+        _record_request(response.status_code, size)
+        return response
+
+    @app.teardown_request
+    def record_failed_request(exc):
+        # after_request is skipped when a view raises; still count the 500
+        if exc is not None:
+            _record_request(500, None, exc_info=exc)
+
+    @app.route('/metrics')
+    def metrics():
+        token = app.config.get('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return Response('unauthorized\n', status=401, mimetype='text/plain')
+        return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,46 @@
+"""add query indexes
+
+Revision ID: 3f2a9c1d7e45
+Revises: 97deca111273
+Create Date: 2026-10-17 09:12:31.418220
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7e45'
+down_revision = '97deca111273'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.create_index('idx_contribution_group_status_created', ['group_id', 'status', 'created_at'], unique=False)
+        batch_op.create_index('idx_contribution_member_status', ['member_id', 'status'], unique=False)
+        batch_op.create_index('idx_contribution_created_id', ['created_at', 'id'], unique=False)
+
+    # Partial index for confirmed-only aggregates (Postgres and SQLite both support WHERE)
+    op.create_index(
+        'idx_contribution_confirmed_group', 'contributions', ['group_id', 'amount'], unique=False,
+        postgresql_where=sa.text("status = 'confirmed'"),
+        sqlite_where=sa.text("status = 'confirmed'")
+    )
+
+    # members.user_id lookups are already served by the unique_member (user_id, group_id) index
+    with op.batch_alter_table('members', schema=None) as batch_op:
+        batch_op.create_index('idx_member_group', ['group_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('members', schema=None) as batch_op:
+        batch_op.drop_index('idx_member_group')
+
+    op.drop_index('idx_contribution_confirmed_group', table_name='contributions')
+
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.drop_index('idx_contribution_created_id')
+        batch_op.drop_index('idx_contribution_member_status')
+        batch_op.drop_index('idx_contribution_group_status_created')
@@ -0,0 +1,39 @@
+"""widen password hash
+
+Revision ID: 5e9b3f7a1c62
+Revises: c4d7a2e91b38
+Create Date: 2026-10-17 12:41:17.092853
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9b3f7a1c62'
+down_revision = 'c4d7a2e91b38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # scrypt hashes are ~160 characters, too long for the original column.
+    # SQLite does not enforce VARCHAR lengths, and a batch rebuild of users
+    # there would drop the user_search FTS triggers.
+    if op.get_bind().dialect.name == 'sqlite':
+        return
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=128),
+               type_=sa.String(length=255),
+               existing_nullable=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        return
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=255),
+               type_=sa.String(length=128),
+               existing_nullable=False)
@@ -0,0 +1,32 @@
+"""drop member contribution score
+
+Revision ID: 6d3f1b8c9a40
+Revises: b8e2f4a7d915
+Create Date: 2026-10-18 11:04:27.519306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d3f1b8c9a40'
+down_revision = 'b8e2f4a7d915'
+branch_labels = None
+depends_on = None
+
+
+# member_stats.score is the only stored score; the members column was a
+# second copy that nothing kept in sync.
+def upgrade():
+    with op.batch_alter_table('members', schema=None) as batch_op:
+        batch_op.drop_column('contribution_score')
+
+
+def downgrade():
+    with op.batch_alter_table('members', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('contribution_score', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE members SET contribution_score = COALESCE("
+        "(SELECT score FROM member_stats WHERE member_stats.member_id = members.id), 0)"
+    )
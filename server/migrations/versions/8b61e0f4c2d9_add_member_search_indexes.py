@@ -0,0 +1,68 @@
+"""add member search indexes
+
+Revision ID: 8b61e0f4c2d9
+Revises: 3f2a9c1d7e45
+Create Date: 2026-10-17 10:03:54.771902
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8b61e0f4c2d9'
+down_revision = '3f2a9c1d7e45'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER user_search_ai AFTER INSERT ON users BEGIN
+        INSERT INTO user_search(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER user_search_ad AFTER DELETE ON users BEGIN
+        INSERT INTO user_search(user_search, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER user_search_au AFTER UPDATE OF username, email ON users BEGIN
+        INSERT INTO user_search(user_search, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+        INSERT INTO user_search(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END
+    """,
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute('CREATE INDEX ix_users_username_trgm ON users USING gin (username gin_trgm_ops)')
+        op.execute('CREATE INDEX ix_users_email_trgm ON users USING gin (email gin_trgm_ops)')
+
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE user_search USING fts5("
+            "username, email, content='users', content_rowid='id', tokenize='unicode61')"
+        )
+        for trigger in SQLITE_TRIGGERS:
+            op.execute(trigger)
+        op.execute("INSERT INTO user_search(user_search) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_users_email_trgm')
+        op.execute('DROP INDEX IF EXISTS ix_users_username_trgm')
+
+    elif dialect == 'sqlite':
+        for name in ('user_search_au', 'user_search_ad', 'user_search_ai'):
+            op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.execute('DROP TABLE IF EXISTS user_search')
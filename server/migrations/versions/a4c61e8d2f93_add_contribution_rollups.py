@@ -0,0 +1,47 @@
+"""add contribution rollups
+
+Revision ID: a4c61e8d2f93
+Revises: f7b2d9e4a6c1
+Create Date: 2026-10-17 16:31:54.901227
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c61e8d2f93'
+down_revision = 'f7b2d9e4a6c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('contribution_rollups',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('confirmed_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('confirmed_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id', 'member_id', 'day')
+    )
+    with op.batch_alter_table('contribution_rollups', schema=None) as batch_op:
+        batch_op.create_index('idx_rollup_group_day', ['group_id', 'day'], unique=False)
+        batch_op.create_index('idx_rollup_member_day', ['member_id', 'day'], unique=False)
+
+    # Backfill from the existing ledger in one statement
+    op.execute(
+        "INSERT INTO contribution_rollups (group_id, member_id, day, confirmed_sum, confirmed_count) "
+        "SELECT group_id, member_id, DATE(created_at), SUM(amount), COUNT(id) "
+        "FROM contributions WHERE status = 'confirmed' GROUP BY group_id, member_id, DATE(created_at)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('contribution_rollups', schema=None) as batch_op:
+        batch_op.drop_index('idx_rollup_member_day')
+        batch_op.drop_index('idx_rollup_group_day')
+
+    op.drop_table('contribution_rollups')
@@ -0,0 +1,56 @@
+"""restore user search triggers
+
+Revision ID: b8e2f4a7d915
+Revises: a4c61e8d2f93
+Create Date: 2026-10-18 09:12:40.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2f4a7d915'
+down_revision = 'a4c61e8d2f93'
+branch_labels = None
+depends_on = None
+
+
+# Same triggers as 8b61e0f4c2d9. Databases upgraded through the old
+# 5e9b3f7a1c62 lost them when SQLite rebuilt the users table.
+SQLITE_TRIGGERS = {
+    'user_search_ai': """
+    CREATE TRIGGER user_search_ai AFTER INSERT ON users BEGIN
+        INSERT INTO user_search(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END
+    """,
+    'user_search_ad': """
+    CREATE TRIGGER user_search_ad AFTER DELETE ON users BEGIN
+        INSERT INTO user_search(user_search, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+    END
+    """,
+    'user_search_au': """
+    CREATE TRIGGER user_search_au AFTER UPDATE OF username, email ON users BEGIN
+        INSERT INTO user_search(user_search, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+        INSERT INTO user_search(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END
+    """,
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite' or not sa.inspect(bind).has_table('user_search'):
+        return
+    for name, trigger in SQLITE_TRIGGERS.items():
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.execute(trigger)
+    # Users added while the triggers were missing are not indexed yet
+    op.execute("INSERT INTO user_search(user_search) VALUES ('rebuild')")
+
+
+def downgrade():
+    # The triggers belong to 8b61e0f4c2d9; leave them in place
+    pass
@@ -0,0 +1,39 @@
+"""add member stats
+
+Revision ID: c4d7a2e91b38
+Revises: 8b61e0f4c2d9
+Create Date: 2026-10-17 11:26:08.530417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d7a2e91b38'
+down_revision = '8b61e0f4c2d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('member_stats',
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('confirmed_total', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('confirmed_count', sa.Integer(), nullable=False),
+    sa.Column('last_contribution_at', sa.DateTime(), nullable=True),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('member_id')
+    )
+
+    # Backfill from the existing ledger in one statement
+    op.execute(
+        "INSERT INTO member_stats (member_id, confirmed_total, confirmed_count, last_contribution_at, score) "
+        "SELECT member_id, SUM(amount), COUNT(id), MAX(created_at), COUNT(id) "
+        "FROM contributions WHERE status = 'confirmed' GROUP BY member_id"
+    )
+
+
+def downgrade():
+    op.drop_table('member_stats')
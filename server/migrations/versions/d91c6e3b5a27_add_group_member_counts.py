@@ -0,0 +1,36 @@
+"""add group member counts
+
+Revision ID: d91c6e3b5a27
+Revises: 5e9b3f7a1c62
+Create Date: 2026-10-17 13:52:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91c6e3b5a27'
+down_revision = '5e9b3f7a1c62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('active_member_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill both counters from the members table in one statement
+    op.execute(
+        "UPDATE groups SET "
+        "member_count = (SELECT COUNT(*) FROM members WHERE members.group_id = groups.id), "
+        "active_member_count = (SELECT COUNT(*) FROM members "
+        "WHERE members.group_id = groups.id AND members.status = 'active')"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.drop_column('active_member_count')
+        batch_op.drop_column('member_count')
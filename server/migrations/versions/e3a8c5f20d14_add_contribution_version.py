@@ -0,0 +1,26 @@
+"""add contribution version
+
+Revision ID: e3a8c5f20d14
+Revises: d91c6e3b5a27
+Create Date: 2026-10-17 15:08:12.664931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a8c5f20d14'
+down_revision = 'd91c6e3b5a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.drop_column('version_id')
@@ -0,0 +1,65 @@
+"""contribution amount numeric
+
+Revision ID: f7b2d9e4a6c1
+Revises: e3a8c5f20d14
+Create Date: 2026-10-17 15:47:30.215876
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b2d9e4a6c1'
+down_revision = 'e3a8c5f20d14'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 10000
+
+
+def _backfill(source, target):
+    """Copy ``source`` into ``target`` in id-range batches, committing each one."""
+    bind = op.get_bind()
+    low, high = bind.execute(sa.text("SELECT MIN(id), MAX(id) FROM contributions")).one()
+    if low is None:
+        return
+    # Short transactions keep row locks brief while the app keeps writing
+    with op.get_context().autocommit_block():
+        for start in range(low, high + 1, BATCH_SIZE):
+            bind.execute(
+                sa.text(
+                    f"UPDATE contributions SET {target} = ROUND(CAST({source} AS NUMERIC), 2) "
+                    f"WHERE id >= :start AND id < :end AND {target} IS NULL"
+                ),
+                {'start': start, 'end': start + BATCH_SIZE}
+            )
+
+
+def _swap(old_type, new_type):
+    # Rows written by the app during the backfill, then the column swap itself
+    op.execute(
+        "UPDATE contributions SET amount_new = ROUND(CAST(amount AS NUMERIC), 2) WHERE amount_new IS NULL"
+    )
+    op.drop_index('idx_contribution_confirmed_group', table_name='contributions')
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.drop_column('amount')
+        batch_op.alter_column('amount_new', new_column_name='amount', existing_type=new_type, nullable=False)
+    op.create_index(
+        'idx_contribution_confirmed_group', 'contributions', ['group_id', 'amount'], unique=False,
+        postgresql_where=sa.text("status = 'confirmed'"), sqlite_where=sa.text("status = 'confirmed'")
+    )
+
+
+def upgrade():
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('amount_new', sa.Numeric(precision=12, scale=2), nullable=True))
+    _backfill('amount', 'amount_new')
+    _swap(sa.Float(), sa.Numeric(precision=12, scale=2))
+
+
+def downgrade():
+    with op.batch_alter_table('contributions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('amount_new', sa.Float(), nullable=True))
+    _backfill('amount', 'amount_new')
+    _swap(sa.Numeric(precision=12, scale=2), sa.Float())
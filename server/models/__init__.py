@@ -1,4 +1,6 @@
 from .user import User
 from .group import Group
 from .member import Member
-from .contribution import Contribution
\ No newline at end of file
+from .member_stats import MemberStats
+from .contribution import Contribution
+from .contribution_rollup import ContributionRollup
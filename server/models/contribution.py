@@ -1,25 +1,57 @@
 # ✅ BACKEND MODEL: models/contribution.py
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from server.extensions import db
-from sqlalchemy import event
+from server.models.group import Group
+from server.models.member_stats import apply_member_stats_delta, refresh_last_contribution
+from server.models.contribution_rollup import apply_rollup_delta
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import validates, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
 class Contribution(db.Model):
     __tablename__ = 'contributions'
 
     id = db.Column(db.Integer, primary_key=True)
-    member_id = db.Column(db.Integer, db.ForeignKey('members.id', ondelete='CASCADE'), nullable=False)
-    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), nullable=False)
-    amount = db.Column(db.Float, nullable=False)
+    # Balance, stats and rollup deltas need the previous values, so load them even when expired
+    member_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('members.id', ondelete='CASCADE'), nullable=False),
+        active_history=True
+    )
+    group_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), nullable=False),
+        active_history=True
+    )
+    amount = db.column_property(db.Column(db.Numeric(12, 2), nullable=False), active_history=True)
     note = db.Column(db.String(255))
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    status = db.Column(db.String(50), default='pending', nullable=False)
+    created_at = db.column_property(
+        db.Column(db.DateTime, nullable=False, default=datetime.utcnow), active_history=True
+    )
+    status = db.column_property(
+        db.Column(db.String(50), default='pending', nullable=False), active_history=True
+    )
     receipt_number = db.Column(db.String(50), unique=True)
+    # Optimistic lock: an UPDATE from a stale read matches no row and raises StaleDataError
+    version_id = db.Column(db.Integer, nullable=False, server_default='1')
 
     # Relationships
     member = db.relationship('Member', back_populates='contributions')
     group = db.relationship('Group', back_populates='contributions')
 
+    __table_args__ = (
+        db.Index('idx_contribution_group_status_created', 'group_id', 'status', 'created_at'),
+        db.Index('idx_contribution_member_status', 'member_id', 'status'),
+        db.Index('idx_contribution_created_id', 'created_at', 'id'),
+        db.Index(
+            'idx_contribution_confirmed_group', 'group_id', 'amount',
+            postgresql_where=db.text("status = 'confirmed'"),
+            sqlite_where=db.text("status = 'confirmed'")
+        ),
+    )
+
+    __mapper_args__ = {'version_id_col': version_id}
+
     def __init__(self, member_id, group_id, amount, note=None, receipt_number=None, status='pending', created_at=None):
         self.member_id = member_id
         self.group_id = group_id
@@ -29,6 +61,10 @@ class Contribution(db.Model):
         self.receipt_number = receipt_number
         self.created_at = created_at or datetime.utcnow()
 
+    @validates('amount')
+    def validate_amount(self, key, amount):
+        return parse_amount(amount)
+
     @validates('status')
     def validate_status(self, key, status):
         valid_statuses = ['pending', 'confirmed', 'rejected']
@@ -55,23 +91,123 @@ class Contribution(db.Model):
             self.status = 'confirmed'
 
     def reject(self):
-        self.status = 'rejected'
+        if self.status != 'rejected':
+            self.status = 'rejected'
 
     def __repr__(self):
         return f'<Contribution {self.amount} (ID: {self.id}) by Member {self.member_id}>'
 
 
-def recalculate_group_amount(group):
-    group.current_amount = sum(
-        contrib.amount for contrib in group.contributions if contrib.status == 'confirmed'
+CENT = Decimal('0.01')
+# Largest value the Numeric(12, 2) amount column holds
+MAX_AMOUNT = Decimal('9999999999.99')
+
+
+def parse_amount(value):
+    """Return ``value`` as a positive two-place Decimal, or raise ValueError."""
+    try:
+        amount = Decimal(str(value).strip())
+    except (InvalidOperation, AttributeError):
+        raise ValueError('Invalid amount')
+    if not amount.is_finite() or amount <= 0:
+        raise ValueError('Amount must be positive')
+    if amount > MAX_AMOUNT:
+        raise ValueError(f'Amount cannot exceed {MAX_AMOUNT}')
+    try:
+        quantized = amount.quantize(CENT)
+    except InvalidOperation:
+        raise ValueError('Invalid amount')
+    if amount != quantized:
+        raise ValueError('Amount cannot have more than two decimal places')
+    return quantized
+
+
+def _to_decimal(amount):
+    return Decimal(str(amount or 0))
+
+
+def _previous(state, key):
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, key)
+
+
+def apply_group_delta(connection, session, group_id, delta):
+    """Shift a group's balance by ``delta`` with one atomic UPDATE."""
+    if group_id is None or not delta:
+        return
+    groups = Group.__table__
+    connection.execute(
+        groups.update()
+        .where(groups.c.id == group_id)
+        .values(current_amount=groups.c.current_amount + delta)
+    )
+
+    # Keep an already-loaded Group in step without reloading it
+    group = session.identity_map.get(identity_key(Group, group_id)) if session else None
+    if group is not None and 'current_amount' in group.__dict__:
+        set_committed_value(group, 'current_amount', _to_decimal(group.current_amount) + delta)
+
+
+def confirmed_deltas(old, new, key):
+    """Return ``{key value: (amount_delta, count_delta)}`` for moving a contribution from ``old`` to ``new``."""
+    deltas = {}
+
+    def shift(snapshot, sign):
+        if snapshot and snapshot['status'] == 'confirmed':
+            amount, count = deltas.get(snapshot[key], (Decimal('0'), 0))
+            deltas[snapshot[key]] = (amount + sign * _to_decimal(snapshot['amount']), count + sign)
+
+    shift(old, -1)
+    shift(new, 1)
+    return {value: delta for value, delta in deltas.items() if delta[0] or delta[1]}
+
+
+def rollup_key(group_id, member_id, created_at):
+    return (group_id, member_id, created_at.date() if created_at else None)
+
+
+def _snapshot(state, previous=False):
+    read = (lambda key: _previous(state, key)) if previous else (lambda key: getattr(state.object, key))
+    snapshot = {key: read(key) for key in ('status', 'amount', 'group_id', 'member_id')}
+    snapshot['created_at'] = read('created_at')
+    snapshot['rollup'] = rollup_key(snapshot['group_id'], snapshot['member_id'], snapshot['created_at'])
+    return snapshot
+
+
+def _redated(old, new):
+    """True when a confirmed contribution stays with its member but its date changes."""
+    return (
+        old and new and old['status'] == new['status'] == 'confirmed'
+        and old['member_id'] == new['member_id'] and old['created_at'] != new['created_at']
     )
 
 
+def _apply_ledger_deltas(connection, target, old, new):
+    session = object_session(target)
+    for group_id, (delta, _) in confirmed_deltas(old, new, 'group_id').items():
+        apply_group_delta(connection, session, group_id, delta)
+    for member_id, (delta, count) in confirmed_deltas(old, new, 'member_id').items():
+        apply_member_stats_delta(connection, member_id, delta, count, target.created_at)
+    for (group_id, member_id, day), (delta, count) in confirmed_deltas(old, new, 'rollup').items():
+        apply_rollup_delta(connection, group_id, member_id, day, delta, count)
+    if _redated(old, new):
+        # Count deltas cancel out, so the latest confirmed date has to be re-read
+        refresh_last_contribution(connection, new['member_id'])
+
+
 @event.listens_for(Contribution, 'after_insert')
+def after_contribution_insert(mapper, connection, target):
+    _apply_ledger_deltas(connection, target, None, _snapshot(inspect(target)))
+
+
 @event.listens_for(Contribution, 'after_update')
+def after_contribution_update(mapper, connection, target):
+    state = inspect(target)
+    _apply_ledger_deltas(connection, target, _snapshot(state, previous=True), _snapshot(state))
+
+
 @event.listens_for(Contribution, 'after_delete')
-def update_group_current_amount(mapper, connection, target):
-    session = object_session(target)
-    if target.group:
-        recalculate_group_amount(target.group)
-        session.add(target.group)
+def after_contribution_delete(mapper, connection, target):
+    _apply_ledger_deltas(connection, target, _snapshot(inspect(target), previous=True), None)
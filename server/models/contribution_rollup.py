@@ -0,0 +1,40 @@
+from decimal import Decimal
+from server.extensions import db
+from server.models.member_stats import upsert
+
+
+class ContributionRollup(db.Model):
+    """Confirmed contributions per group, member and day, kept in step by the contribution listeners."""
+    __tablename__ = 'contribution_rollups'
+
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), primary_key=True)
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    confirmed_sum = db.Column(db.Numeric(14, 2), default=Decimal('0.00'), nullable=False)
+    confirmed_count = db.Column(db.Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        db.Index('idx_rollup_group_day', 'group_id', 'day'),
+        db.Index('idx_rollup_member_day', 'member_id', 'day'),
+    )
+
+    def __repr__(self):
+        return f'<ContributionRollup Group {self.group_id} Member {self.member_id} {self.day}: {self.confirmed_sum}>'
+
+
+def apply_rollup_delta(connection, group_id, member_id, day, amount_delta, count_delta):
+    """Adjust one (group, member, day) bucket in the current transaction."""
+    if group_id is None or member_id is None or day is None or not (amount_delta or count_delta):
+        return
+    rollups = ContributionRollup.__table__
+    values = {
+        'group_id': group_id,
+        'member_id': member_id,
+        'day': day,
+        'confirmed_sum': amount_delta,
+        'confirmed_count': count_delta,
+    }
+    upsert(connection, rollups, values, lambda new: {
+        'confirmed_sum': rollups.c.confirmed_sum + amount_delta,
+        'confirmed_count': rollups.c.confirmed_count + count_delta,
+    })
@@ -1,8 +1,21 @@
+import logging
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
-from sqlalchemy import event, func
-from sqlalchemy.orm import validates
+from flask import current_app, has_app_context
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.orm import validates, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from server.extensions import db
+from server.models.user import User
+from server.models.member import Member
+from server.services.jobs import enqueue, job
+
+logger = logging.getLogger(__name__)
+
+
+class GroupFull(ValueError):
+    pass
 
 
 class Group(db.Model):
@@ -20,6 +33,9 @@ class Group(db.Model):
     location = db.Column(db.String(100))
     status = db.Column(db.String(20), default='active', nullable=False)
     logo_url = db.Column(db.String(255))
+    # Maintained by the member listeners below
+    member_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    active_member_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
 
     # Relationships
     admin = db.relationship('User', back_populates='admin_groups')
@@ -50,44 +66,58 @@ class Group(db.Model):
             raise ValueError('Invalid target amount')
 
     def calculate_current_amount(self):
-        try:
-            return float(sum([
-                float(c.amount or 0) for c in self.contributions or [] if c.status == 'confirmed'
-            ]))
-        except Exception as e:
-            print(f"❌ Error in calculate_current_amount for group {self.id}: {e}")
-            return 0.0
+        # current_amount is kept equal to the confirmed total by contribution listeners
+        return self.current_amount or Decimal('0.00')
 
-    def calculate_progress(self):
+    def calculate_progress(self, current_amount=None):
         try:
+            if current_amount is None:
+                current_amount = self.calculate_current_amount()
             if self.target_amount and self.target_amount > 0:
-                return float(self.calculate_current_amount() / self.target_amount * 100)
+                return float(Decimal(current_amount) / Decimal(self.target_amount) * 100)
             return 0.0
-        except Exception as e:
-            print(f"❌ Error in calculate_progress for group {self.id}: {e}")
+        except Exception:
+            logger.exception("Error in calculate_progress for group %s", self.id)
             return 0.0
 
-    def serialize(self):
+    @classmethod
+    def summary_query(cls):
+        """Groups with admin name and member count, resolved in one query."""
+        return (
+            select(cls, User.username, cls.member_count)
+            .outerjoin(User, User.id == cls.admin_id)
+            .order_by(cls.id)
+        )
+
+    def count_members(self):
+        return self.member_count or 0
+
+    def serialize(self, admin_name=None, member_count=None):
         try:
+            current_amount = self.calculate_current_amount()
+            if admin_name is None:
+                admin_name = self.admin.username if self.admin else 'Unknown'
+            if member_count is None:
+                member_count = self.count_members()
             return {
                 'id': self.id,
                 'name': self.name,
                 'description': self.description,
                 'created_at': self.created_at.isoformat() if self.created_at else None,
                 'target_amount': float(self.target_amount or 0),
-                'current_amount': self.calculate_current_amount(),
+                'current_amount': float(current_amount),
                 'is_public': self.is_public,
                 'status': self.status or 'active',
-                'admin_name': self.admin.username if self.admin else 'Unknown',
+                'admin_name': admin_name,
                 'admin_id': self.admin_id,
                 'meeting_schedule': self.meeting_schedule,
                 'location': self.location,
                 'logo_url': self.logo_url,
-                'progress': round(self.calculate_progress(), 2),
-                'member_count': len(self.members or [])
+                'progress': round(self.calculate_progress(current_amount), 2),
+                'member_count': member_count
             }
-        except Exception as e:
-            print(f"❌ Error serializing group {self.id}: {e}")
+        except Exception:
+            logger.exception("Error serializing group %s", self.id)
             return {'error': f'Failed to serialize group {self.id}'}
 
     def __repr__(self):
@@ -96,10 +126,108 @@ class Group(db.Model):
 
 @event.listens_for(Group, 'after_insert')
 def after_group_insert(mapper, connection, target):
-    print(f"✅ New group created: {target.name} (ID: {target.id})")
+    enqueue(object_session(target), 'group.created', group_id=target.id, name=target.name)
+
+
+@job('group.created')
+def handle_group_created(group_id, name):
+    logger.info("New group created: %s (ID: %s)", name, group_id)
 
 
 @event.listens_for(Group, 'before_update')
 def before_group_update(mapper, connection, target):
     if target.status == 'archived' and target.current_amount < target.target_amount:
         raise ValueError("Cannot archive group before reaching target amount")
+
+
+# ─────────────────────────────────────────────
+# Membership counters
+# ─────────────────────────────────────────────
+def member_cap():
+    if has_app_context():
+        return current_app.config.get('GROUP_MEMBER_CAP')
+    return None
+
+
+def shift_member_counts(connection, session, group_id, total, active, cap=None):
+    """Atomically shift a group's member counters; returns the new member_count.
+
+    When ``cap`` is set the UPDATE only matches while the group is below it,
+    so concurrent joins cannot overshoot the limit.
+    """
+    groups = Group.__table__
+    stmt = (
+        groups.update()
+        .where(groups.c.id == group_id)
+        .values(
+            member_count=groups.c.member_count + total,
+            active_member_count=groups.c.active_member_count + active
+        )
+    )
+    if cap and total > 0:
+        stmt = stmt.where(groups.c.member_count + total <= cap)
+
+    if connection.dialect.update_returning:
+        row = connection.execute(stmt.returning(groups.c.member_count, groups.c.active_member_count)).first()
+    else:
+        result = connection.execute(stmt)
+        row = None
+        if result.rowcount:
+            row = connection.execute(
+                select(groups.c.member_count, groups.c.active_member_count).where(groups.c.id == group_id)
+            ).first()
+
+    if row is None:
+        if cap and total > 0:
+            raise GroupFull(f"Group {group_id} has reached its limit of {cap} members")
+        return None
+
+    # Keep an already-loaded Group in step without reloading it
+    group = session.identity_map.get(identity_key(Group, group_id)) if session else None
+    if group is not None:
+        set_committed_value(group, 'member_count', row[0])
+        set_committed_value(group, 'active_member_count', row[1])
+    return row[0]
+
+
+def _member_previous(state, key):
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, key)
+
+
+@event.listens_for(Member, 'before_insert')
+def count_member_insert(mapper, connection, target):
+    groups = Group.__table__
+    # The first member of a group becomes its active admin, decided by the same UPDATE
+    active = case((groups.c.member_count == 0, 1), else_=int(target.status == 'active'))
+    member_count = shift_member_counts(
+        connection, object_session(target), target.group_id, 1, active, cap=member_cap()
+    )
+    if member_count == 1:
+        target.status = 'active'
+        target.is_admin = True
+    inspect(target).info['member_count'] = member_count
+
+
+@event.listens_for(Member, 'after_update')
+def count_member_update(mapper, connection, target):
+    state = inspect(target)
+    old_group, new_group = _member_previous(state, 'group_id'), target.group_id
+    old_active = int(_member_previous(state, 'status') == 'active')
+    new_active = int(target.status == 'active')
+    session = object_session(target)
+
+    if old_group != new_group:
+        shift_member_counts(connection, session, new_group, 1, new_active, cap=member_cap())
+        shift_member_counts(connection, session, old_group, -1, -old_active)
+    elif old_active != new_active:
+        shift_member_counts(connection, session, new_group, 0, new_active - old_active)
+
+
+@event.listens_for(Member, 'after_delete')
+def count_member_delete(mapper, connection, target):
+    state = inspect(target)
+    active = int(_member_previous(state, 'status') == 'active')
+    shift_member_counts(connection, object_session(target), _member_previous(state, 'group_id'), -1, -active)
@@ -1,19 +1,28 @@
+import logging
 from datetime import datetime
-from sqlalchemy import event
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import validates
 from server.extensions import db
+from server.services.jobs import enqueue, job
+
+logger = logging.getLogger(__name__)
 
 class Member(db.Model):
     __tablename__ = 'members'
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
-    group_id = db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), nullable=False)
+    # Group member counters need the previous values, so load them even when expired
+    group_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('groups.id', ondelete='CASCADE'), nullable=False),
+        active_history=True
+    )
     join_date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    status = db.Column(db.String(20), default='pending', nullable=False)
+    status = db.column_property(
+        db.Column(db.String(20), default='pending', nullable=False), active_history=True
+    )
     is_admin = db.Column(db.Boolean, default=False, nullable=False)
     last_active = db.Column(db.DateTime)
-    contribution_score = db.Column(db.Integer, default=0)
     phone = db.Column(db.String(20))
     address = db.Column(db.String(255))
   
@@ -22,6 +31,7 @@ class Member(db.Model):
     user = db.relationship('User', back_populates='members')
     group = db.relationship('Group', back_populates='members')
     contributions = db.relationship('Contribution', back_populates='member', cascade='all, delete-orphan')
+    stats = db.relationship('MemberStats', back_populates='member', uselist=False, cascade='all, delete-orphan')
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
   
    
@@ -29,6 +39,7 @@ class Member(db.Model):
     __table_args__ = (
         db.UniqueConstraint('user_id', 'group_id', name='unique_member'),
         db.Index('idx_member_status', 'status'),
+        db.Index('idx_member_group', 'group_id'),
     )
 
     def __init__(self, user_id, group_id, is_admin=False, **kwargs):
@@ -45,7 +56,12 @@ class Member(db.Model):
             raise ValueError(f"Invalid status. Must be one of: {valid_statuses}")
         return status
 
-    def serialize(self):
+    def confirmed_total(self):
+        return float(self.stats.confirmed_total) if self.stats else 0.0
+
+    def serialize(self, total_contributions=None):
+        if total_contributions is None:
+            total_contributions = self.confirmed_total()
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -54,7 +70,7 @@ class Member(db.Model):
             'status': self.status,
             'is_admin': self.is_admin,
             'last_active': self.last_active.isoformat() if self.last_active else None,
-            'contribution_score': self.contribution_score,
+            'contribution_score': self.stats.score if self.stats else 0,
             'phone': self.phone,
             'address': self.address,
             'user_details': {
@@ -62,9 +78,7 @@ class Member(db.Model):
                 'email': self.user.email
             } if self.user else None,
             'group_name': self.group.name if self.group else None,
-            'total_contributions': sum(c.amount for c in self.contributions if c.status == 'confirmed'),
-            'active_loans': len([l for l in self.loans if l.status in ['active', 'defaulted']]),
-            'active_investments': len([i for i in self.investments if i.status == 'active'])
+            'total_contributions': total_contributions
         }
 
     def activate(self):
@@ -75,11 +89,6 @@ class Member(db.Model):
     def update_activity(self):
         self.last_active = datetime.utcnow()
 
-    def update_contribution_score(self):
-        confirmed_contributions = sum(1 for c in self.contributions if c.status == 'confirmed')
-        timely_repayments = sum(1 for l in self.loans for r in l.repayments if r.status == 'full')
-        self.contribution_score = confirmed_contributions + timely_repayments
-
     def can_request_loan(self):
         return (
             self.status == 'active' and
@@ -92,22 +101,29 @@ class Member(db.Model):
             f'Status: {self.status}, Admin: {self.is_admin}>'
         )
 
-# Event listeners
+# Event listeners: side effects run from the job queue after commit
 @event.listens_for(Member, 'after_insert')
 def after_member_insert(mapper, connection, target):
-    print(f"New member joined: User {target.user_id} to Group {target.group_id}")
-    session = db.object_session(target)
-    member_count = session.query(Member).filter_by(group_id=target.group_id).count()
+    # member_count is set by the group counter listener in before_insert
+    enqueue(db.object_session(target), 'member.joined', user_id=target.user_id,
+            group_id=target.group_id, member_count=inspect(target).info.get('member_count'))
 
-    if member_count == 1:
-        target.status = 'active'
-        target.is_admin = True
-        session.commit()
-        print(f"User {target.user_id} is the group creator and now admin of Group {target.group_id}")
-    elif member_count > 30:
-        print(f"Warning: Group {target.group_id} exceeded 30 members!")
 
 @event.listens_for(Member, 'after_update')
 def after_member_update(mapper, connection, target):
-    if target.status == 'active':
-        print(f"Member {target.id} activated in Group {target.group_id}")
+    if target.status == 'active' and inspect(target).attrs.status.history.has_changes():
+        enqueue(db.object_session(target), 'member.activated', member_id=target.id, group_id=target.group_id)
+
+
+@job('member.joined')
+def handle_member_joined(user_id, group_id, member_count):
+    logger.info("New member joined: User %s to Group %s", user_id, group_id)
+    if member_count == 1:
+        logger.info("User %s is the group creator and now admin of Group %s", user_id, group_id)
+    elif member_count and member_count > 30:
+        logger.warning("Group %s exceeded 30 members!", group_id)
+
+
+@job('member.activated')
+def handle_member_activated(member_id, group_id):
+    logger.info("Member %s activated in Group %s", member_id, group_id)
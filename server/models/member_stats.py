@@ -0,0 +1,95 @@
+from decimal import Decimal
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from server.extensions import db
+
+
+class MemberStats(db.Model):
+    __tablename__ = 'member_stats'
+
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id', ondelete='CASCADE'), primary_key=True)
+    confirmed_total = db.Column(db.Numeric(12, 2), default=Decimal('0.00'), nullable=False)
+    confirmed_count = db.Column(db.Integer, default=0, nullable=False)
+    last_contribution_at = db.Column(db.DateTime)
+    score = db.Column(db.Integer, default=0, nullable=False)
+
+    member = db.relationship('Member', back_populates='stats')
+
+    def serialize(self):
+        return {
+            'member_id': self.member_id,
+            'confirmed_total': float(self.confirmed_total or 0),
+            'confirmed_count': self.confirmed_count,
+            'last_contribution_at': self.last_contribution_at.isoformat() if self.last_contribution_at else None,
+            'score': self.score
+        }
+
+    def __repr__(self):
+        return f'<MemberStats Member {self.member_id}: {self.confirmed_total} over {self.confirmed_count}>'
+
+
+def upsert(connection, table, values, set_):
+    """Insert ``values`` or, if the primary key exists, update with ``set_(columns)``."""
+    key = list(table.primary_key.columns)
+    dialect = connection.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        statement = insert(table).values(**values)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=key, set_=set_(statement.excluded)
+        ))
+        return
+
+    result = connection.execute(
+        table.update().where(*[column == values[column.name] for column in key]).values(**set_(table.c))
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(**values))
+
+
+def apply_member_stats_delta(connection, member_id, amount_delta, count_delta, contributed_at):
+    """Adjust a member's confirmed total/count in the current transaction."""
+    if member_id is None or not (amount_delta or count_delta):
+        return
+    stats = MemberStats.__table__
+    values = {
+        'member_id': member_id,
+        'confirmed_total': amount_delta,
+        'confirmed_count': count_delta,
+        'score': count_delta,
+        'last_contribution_at': contributed_at if count_delta > 0 else None,
+    }
+
+    def increments(new):
+        set_ = {
+            'confirmed_total': stats.c.confirmed_total + amount_delta,
+            'confirmed_count': stats.c.confirmed_count + count_delta,
+            'score': stats.c.score + count_delta,
+        }
+        if count_delta > 0:
+            set_['last_contribution_at'] = case(
+                (stats.c.last_contribution_at.is_(None), contributed_at),
+                (stats.c.last_contribution_at < contributed_at, contributed_at),
+                else_=stats.c.last_contribution_at
+            )
+        return set_
+
+    upsert(connection, stats, values, increments)
+
+    if count_delta < 0:
+        # A confirmed row went away
+        refresh_last_contribution(connection, member_id)
+
+
+def refresh_last_contribution(connection, member_id):
+    """Re-read a member's latest confirmed date, which comes from the (member_id, status) index."""
+    from server.models.contribution import Contribution
+    stats = MemberStats.__table__
+    latest = (
+        select(func.max(Contribution.created_at))
+        .where(Contribution.member_id == member_id, Contribution.status == 'confirmed')
+        .scalar_subquery()
+    )
+    connection.execute(
+        stats.update().where(stats.c.member_id == member_id).values(last_contribution_at=latest)
+    )
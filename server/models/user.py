@@ -1,17 +1,22 @@
+import logging
 from datetime import datetime
 from server.extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from server.services.passwords import hash_password
+from server.services.jobs import enqueue, job
 from flask_jwt_extended import create_access_token
 import re
 from sqlalchemy import event
 
+logger = logging.getLogger(__name__)
+
 class User(db.Model):
     __tablename__ = 'users'
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False, index=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), nullable=False, default='member')
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     last_login = db.Column(db.DateTime)
@@ -56,7 +61,7 @@ class User(db.Model):
     def set_password(self, password):
         if not password or len(password) < 8:
             raise ValueError('Password must be at least 8 characters long')
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -103,4 +108,9 @@ def validate_user(mapper, connection, target):
 
 @event.listens_for(User, 'after_insert')
 def send_welcome_notification(mapper, connection, target):
-    print(f"🎉 New user registered: {target.username}")
+    enqueue(db.object_session(target), 'user.welcome', user_id=target.id, username=target.username)
+
+
+@job('user.welcome')
+def handle_welcome_notification(user_id, username):
+    logger.info("New user registered: %s", username)
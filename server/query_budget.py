@@ -0,0 +1,75 @@
+# Per-request SQL statement counting with an optional hard cap.
+#
+# Set SQL_QUERY_BUDGET to an integer to cap statements per request. With
+# TESTING enabled an overrun raises, so N+1 regressions fail the test run;
+# otherwise it is logged as a warning.
+import logging
+from contextlib import contextmanager
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_listening = False
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context():
+        g.sql_statement_count = g.get('sql_statement_count', 0) + 1
+
+
+def _ensure_listening():
+    global _listening
+    if not _listening:
+        event.listen(Engine, 'before_cursor_execute', _count_statement)
+        _listening = True
+
+
+def statement_count():
+    return g.get('sql_statement_count', 0)
+
+
+@contextmanager
+def assert_max_queries(limit):
+    """Fail if the wrapped block issues more than ``limit`` SQL statements.
+
+    Counts at the engine, so requests made through a test client inside the
+    block are included; yields the list of statements seen so far.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, 'before_cursor_execute', record)
+    if len(statements) > limit:
+        listing = '\n'.join(statements)
+        raise QueryBudgetExceeded(f"{len(statements)} SQL statements issued, budget is {limit}:\n{listing}")
+
+
+def init_query_budget(app):
+    _ensure_listening()
+
+    @app.before_request
+    def reset_statement_count():
+        g.sql_statement_count = 0
+
+    @app.after_request
+    def check_statement_count(response):
+        budget = app.config.get('SQL_QUERY_BUDGET')
+        used = statement_count()
+        if budget is not None and used > budget:
+            message = f"{request.method} {request.path} issued {used} SQL statements (budget {budget})"
+            if app.config.get('TESTING'):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
@@ -1,19 +1,22 @@
 # server/routes/admin.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from server.services.admin_summary import admin_summary
+from server.services.principal import current_claims
 
+admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+
+ADMIN_ROLES = ('admin', 'superadmin')
+
+
+# Platform totals; ?exact=true counts every row instead of using estimates
 @admin_bp.route('/summary', methods=['GET'])
 @jwt_required()
 def get_admin_summary():
+    if current_claims()['role'] not in ADMIN_ROLES:
+        return jsonify({'error': 'Admin access required'}), 403
     try:
-        users_count = User.query.count()
-        loans_count = Loan.query.count()  # or 0 if not implemented
-        contributions_count = Contribution.query.count()
-        payments_count = 0  # Placeholder or actual value
-
-        return jsonify({
-            'users': users_count,
-            'loans': loans_count,
-            'contributions': contributions_count,
-            'payments': payments_count,
-        }), 200
+        exact = request.args.get('exact', '').lower() in ('1', 'true', 'yes')
+        return jsonify(admin_summary(exact=exact)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,14 +1,21 @@
+import logging
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import (
-    create_access_token, create_refresh_token, jwt_required,
-    get_jwt_identity, unset_jwt_cookies
+    create_access_token, decode_token, get_jwt, jwt_required, unset_jwt_cookies
 )
+from jwt.exceptions import PyJWTError
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from server.models.user import User
 from server.extensions import db
+from server.services.passwords import password_verifier, PasswordVerifierBusy
+from server.services.token_blocklist import token_blocklist
+from server.services.principal import (
+    build_claims, cached_user, current_user_id, issue_tokens
+)
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
+logger = logging.getLogger(__name__)
 
 
 # ====== Register ======
@@ -35,8 +42,7 @@ def register():
         db.session.add(user)
         db.session.commit()
 
-        access_token = create_access_token(identity=user.serialize())
-        refresh_token = create_refresh_token(identity=user.serialize())
+        access_token, refresh_token = issue_tokens(user)
 
         return jsonify({
             "message": "Registration successful",
@@ -45,6 +51,12 @@ def register():
             "refresh_token": refresh_token
         }), 201
 
+    except PasswordVerifierBusy as busy:
+        db.session.rollback()
+        response = jsonify({"error": str(busy)})
+        response.headers['Retry-After'] = str(busy.retry_after)
+        return response, 429
+
     except ValueError as ve:
         db.session.rollback()
         return jsonify({"error": str(ve)}), 400
@@ -55,8 +67,7 @@ def register():
 
     except Exception as e:
         db.session.rollback()
-        import traceback
-        traceback.print_exc()
+        logger.exception("Registration failed")
         return jsonify({"error": "Registration failed", "details": str(e)}), 500
 
 
@@ -77,17 +88,28 @@ def login():
             User.query.filter_by(username=username_or_email).first()
         )
 
-        if not user or not user.check_password(password):
+        if not user:
             return jsonify({"error": "Invalid credentials"}), 401
 
+        try:
+            matches, new_hash = password_verifier.verify(user.password_hash, password)
+        except PasswordVerifierBusy as busy:
+            response = jsonify({"error": str(busy)})
+            response.headers['Retry-After'] = str(busy.retry_after)
+            return response, 429
+
+        if not matches:
+            return jsonify({"error": "Invalid credentials"}), 401
+        if new_hash:
+            user.password_hash = new_hash
+
         if not user.is_active:
             return jsonify({"error": "Account inactive"}), 403
 
         user.last_login = datetime.utcnow()
         db.session.commit()
 
-        access_token = create_access_token(identity=user.serialize())
-        refresh_token = create_refresh_token(identity=user.serialize())
+        access_token, refresh_token = issue_tokens(user)
 
         return jsonify({
             "message": "Login successful",
@@ -97,8 +119,7 @@ def login():
         }), 200
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Login failed")
         return jsonify({"error": "Login failed", "details": str(e)}), 500
 
 
@@ -106,8 +127,11 @@ def login():
 @auth_bp.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
-    current_user = get_jwt_identity()
-    new_token = create_access_token(identity=current_user)
+    user = db.session.get(User, current_user_id())
+    if not user or not user.is_active:
+        return jsonify({"error": "User not found"}), 404
+    # Refresh re-reads memberships so new groups show up in the claims
+    new_token = create_access_token(identity=str(user.id), additional_claims=build_claims(user))
     return jsonify({"access_token": new_token}), 200
 
 
@@ -115,6 +139,16 @@ def refresh():
 @auth_bp.route('/logout', methods=['POST'])
 @jwt_required()
 def logout():
+    token_blocklist.revoke(get_jwt())
+
+    # Revoke the refresh token too when the client sends it
+    refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+    if refresh_token:
+        try:
+            token_blocklist.revoke(decode_token(refresh_token))
+        except PyJWTError:
+            pass
+
     response = jsonify({"message": "Logout successful"})
     unset_jwt_cookies(response)
     return response, 200
@@ -124,8 +158,7 @@ def logout():
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def me():
-    current_identity = get_jwt_identity()
-    user = User.query.get(current_identity['id'])
+    user = cached_user(current_user_id())
     if not user:
         return jsonify({"error": "User not found"}), 404
-    return jsonify(user.serialize()), 200
+    return jsonify(user), 200
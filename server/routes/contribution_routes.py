@@ -1,33 +1,112 @@
 # ✅ BACKEND ROUTE (Flask): contribution_routes.py
 
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 from server.extensions import db
 from server.models.contribution import Contribution
+from server.serializers import with_eager_loads, serialize_contributions
+from server.services import principal
+from server.services.cache import cached_response
+from server.services.contribution_import import import_contributions, parse_csv
+from server.services.idempotency import idempotent
+from server.services.pagination import (
+    InvalidCursor, parse_limit, encode_cursor, decode_cursor, keyset_after, keyset_pages
+)
 
 contribution_bp = Blueprint('contribution', __name__, url_prefix='/api/contributions')
 
+STREAM_BATCH_SIZE = 1000
+BULK_IMPORT_MAX_ROWS = 10000
+
+
+def _filtered_contributions():
+    query = with_eager_loads(Contribution.query, Contribution)
+
+    member_id = request.args.get('member_id')
+    group_id = request.args.get('group_id')
+    status = request.args.get('status')
+
+    if member_id:
+        query = query.filter_by(member_id=member_id)
+    if group_id:
+        query = query.filter_by(group_id=group_id)
+    if status:
+        query = query.filter_by(status=status)
+    return query
+
+
+def _listing_tags():
+    group_id = request.args.get('group_id')
+    return [f'contributions:group:{group_id}'] if group_id else ['contributions']
+
+
+def _may_record(data, claims):
+    """Treasurers and group admins record any contribution; members only their own pending ones."""
+    if principal.can_manage_group(int(data['group_id']), claims):
+        return True
+    return int(data['member_id']) in claims['member_ids'] and data.get('status', 'pending') == 'pending'
+
+
+def _unmanaged_groups(records, claims):
+    group_ids = set()
+    for record in records:
+        try:
+            group_ids.add(int(record.get('group_id')))
+        except (AttributeError, TypeError, ValueError):
+            continue  # reported as a row error by the import
+    return sorted(group_id for group_id in group_ids if not principal.can_manage_group(group_id, claims))
+
+
+def _stream_ndjson(query, cursor):
+    def generate():
+        for batch in keyset_pages(query, Contribution.created_at, Contribution.id, STREAM_BATCH_SIZE, cursor):
+            yield ''.join(json.dumps(item) + '\n' for item in serialize_contributions(batch))
+            # Drop the batch from the identity map so memory stays flat
+            for c in batch:
+                db.session.expunge(c)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+# GET contributions
+#   ?limit=&cursor=    keyset page: {"items": [...], "next_cursor": "..."}
+#                      (limit defaults to 50, capped at 500; there is no unpaged listing)
+#   ?format=ndjson     stream every matching row as newline-delimited JSON
 @contribution_bp.route('/', methods=['GET'])
+@cached_response(_listing_tags)
 def get_all_contributions():
     try:
-        member_id = request.args.get('member_id')
-        group_id = request.args.get('group_id')
-        status = request.args.get('status')
+        query = _filtered_contributions()
+        cursor = request.args.get('cursor')
+        cursor = decode_cursor(cursor) if cursor else None
 
-        query = Contribution.query
-
-        if member_id:
-            query = query.filter_by(member_id=member_id)
-        if group_id:
-            query = query.filter_by(group_id=group_id)
-        if status:
-            query = query.filter_by(status=status)
+        wants_ndjson = (
+            request.args.get('format') == 'ndjson' or
+            request.accept_mimetypes.best == 'application/x-ndjson'
+        )
+        if wants_ndjson:
+            return _stream_ndjson(query, cursor)
 
-        contributions = query.order_by(Contribution.created_at.desc()).all()
-        return jsonify([c.serialize() for c in contributions]), 200
+        limit = parse_limit(request.args.get('limit'))
+        if cursor is not None:
+            query = query.filter(keyset_after(Contribution.created_at, Contribution.id, cursor))
+        rows = query.order_by(Contribution.created_at.desc(), Contribution.id.desc()).limit(limit + 1).all()
+        items, has_more = rows[:limit], len(rows) > limit
+        return jsonify({
+            'items': serialize_contributions(items),
+            'next_cursor': encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+        }), 200
+    except (InvalidCursor, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @contribution_bp.route('/<int:id>', methods=['GET'])
+@cached_response(lambda id: ['contributions'])
 def get_contribution(id):
     try:
         contribution = Contribution.query.get_or_404(id)
@@ -36,9 +115,13 @@ def get_contribution(id):
         return jsonify({'error': str(e)}), 500
 
 @contribution_bp.route('/', methods=['POST'])
+@jwt_required()
+@idempotent
 def create_contribution():
     data = request.get_json()
     try:
+        if not _may_record(data, principal.current_claims()):
+            return jsonify({'error': 'Not allowed to record this contribution'}), 403
         contribution = Contribution(
             member_id=data['member_id'],
             group_id=data['group_id'],
@@ -50,10 +133,44 @@ def create_contribution():
         db.session.add(contribution)
         db.session.commit()
         return jsonify(contribution.serialize()), 201
+    except IntegrityError as e:
+        db.session.rollback()
+        if 'receipt_number' in str(e.orig):
+            return jsonify({'error': 'A contribution with this receipt number already exists'}), 409
+        return jsonify({'error': str(e.orig)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+# Bulk import: JSON array / {"contributions": [...]}, text/csv body, or a CSV "file" upload
+@contribution_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+@idempotent
+def bulk_create_contributions():
+    try:
+        if 'file' in request.files:
+            records = parse_csv(request.files['file'].read().decode('utf-8-sig'))
+        elif request.mimetype == 'text/csv':
+            records = parse_csv(request.get_data(as_text=True))
+        else:
+            data = request.get_json(silent=True)
+            records = data.get('contributions') if isinstance(data, dict) else data
+        if not isinstance(records, list) or not records:
+            return jsonify({'error': 'No contributions provided'}), 400
+        if len(records) > BULK_IMPORT_MAX_ROWS:
+            return jsonify({'error': f'At most {BULK_IMPORT_MAX_ROWS} rows per request'}), 413
+        forbidden = _unmanaged_groups(records, principal.current_claims())
+        if forbidden:
+            return jsonify({'error': 'Not allowed to import into these groups', 'group_ids': forbidden}), 403
+
+        inserted, errors = import_contributions(records)
+        return jsonify({'inserted': inserted, 'errors': errors}), 201 if inserted else 400
+    except UnicodeDecodeError:
+        return jsonify({'error': 'CSV must be UTF-8 encoded'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @contribution_bp.route('/<int:id>', methods=['PUT'])
 def update_contribution(id):
     data = request.get_json()
@@ -68,10 +185,59 @@ def update_contribution(id):
 
         db.session.commit()
         return jsonify(contribution.serialize()), 200
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'error': 'Contribution was changed by another request; reload and retry'}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+# Confirm / reject: safe to retry, and only one concurrent request moves a pending contribution
+def _set_status(id, status):
+    try:
+        # SKIP LOCKED: a second treasurer gets an immediate 409 instead of queueing
+        # behind the first (ignored on SQLite, where the version check applies)
+        contribution = db.session.execute(
+            select(Contribution).where(Contribution.id == id).with_for_update(skip_locked=True)
+        ).scalar_one_or_none()
+        if contribution is None:
+            if db.session.get(Contribution, id) is None:
+                return jsonify({'error': 'Contribution not found'}), 404
+            return jsonify({'error': 'Contribution is being updated by another request'}), 409
+        if not principal.can_manage_group(contribution.group_id):
+            db.session.rollback()
+            return jsonify({'error': 'Only a treasurer or the group admin can change this contribution'}), 403
+
+        if contribution.status == status:
+            return jsonify(contribution.serialize()), 200
+        if contribution.status != 'pending':
+            return jsonify({'error': f'Contribution is already {contribution.status}'}), 409
+
+        if status == 'confirmed':
+            contribution.confirm()
+        else:
+            contribution.reject()
+        db.session.commit()
+        return jsonify(contribution.serialize()), 200
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'error': 'Contribution was changed by another request; reload and retry'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@contribution_bp.route('/<int:id>/confirm', methods=['POST'])
+@jwt_required()
+@idempotent
+def confirm_contribution(id):
+    return _set_status(id, 'confirmed')
+
+@contribution_bp.route('/<int:id>/reject', methods=['POST'])
+@jwt_required()
+@idempotent
+def reject_contribution(id):
+    return _set_status(id, 'rejected')
+
 @contribution_bp.route('/<int:id>', methods=['DELETE'])
 def delete_contribution(id):
     try:
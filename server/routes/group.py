@@ -1,22 +1,32 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import logging
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_jwt_extended import jwt_required
 from server.extensions import db
 from server.models.group import Group
+from server.services import principal
+from server.services.cache import cached_response
+from server.services.ledger_export import EXPORT_FORMATS, ExportUnavailable, iter_export
+from server.services.rollups import contribution_series, parse_series_args
 from decimal import Decimal
 
 group_bp = Blueprint('group', __name__, url_prefix='/api/groups')
+logger = logging.getLogger(__name__)
 
 
 # ─────────────────────────────
 # GET all groups
 # ─────────────────────────────
 @group_bp.route('/', methods=['GET'])
+@cached_response(lambda: ['groups'])
 def get_all_groups():
     try:
-        groups = Group.query.all()
-        return jsonify([group.serialize() for group in groups]), 200
-    except Exception as e:
-        print("❌ Error in /api/groups/:", e)
+        rows = db.session.execute(Group.summary_query()).all()
+        return jsonify([
+            group.serialize(admin_name=admin_name or 'Unknown', member_count=member_count)
+            for group, admin_name, member_count in rows
+        ]), 200
+    except Exception:
+        logger.exception("Error in /api/groups/")
         return jsonify({'error': 'Internal Server Error'}), 500
 
 
@@ -24,14 +34,65 @@ def get_all_groups():
 # GET a single group by ID
 # ─────────────────────────────
 @group_bp.route('/<int:id>', methods=['GET'])
+@cached_response(lambda id: [f'group:{id}'])
 def get_group(id):
     try:
-        group = Group.query.get_or_404(id)
-        return jsonify(group.serialize()), 200
-    except Exception as e:
-        print("❌ Error fetching group:", repr(e))
+        row = db.session.execute(Group.summary_query().where(Group.id == id)).first()
+        if not row:
+            return jsonify({'error': 'Group not found'}), 404
+        group, admin_name, member_count = row
+        return jsonify(group.serialize(admin_name=admin_name or 'Unknown', member_count=member_count)), 200
+    except Exception:
+        logger.exception("Error fetching group %s", id)
+        return jsonify({'error': 'Group not found'}), 404
+
+
+# ─────────────────────────────
+# GET - Confirmed contributions over time (?interval=day|week|month&from=&to=&max_points=)
+# ─────────────────────────────
+@group_bp.route('/<int:id>/series', methods=['GET'])
+@cached_response(lambda id: [f'group:{id}'])
+def get_group_series(id):
+    try:
+        options = parse_series_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        if db.session.get(Group, id) is None:
+            return jsonify({'error': 'Group not found'}), 404
+        return jsonify({
+            'group_id': id,
+            'interval': options['interval'],
+            'points': contribution_series(group_id=id, **options)
+        }), 200
+    except Exception:
+        logger.exception("Error building series for group %s", id)
+        return jsonify({'error': 'Failed to load contribution series'}), 500
+
+
+# ─────────────────────────────
+# GET - Stream a group's contribution ledger (CSV / Parquet)
+# ─────────────────────────────
+@group_bp.route('/<int:id>/export', methods=['GET'])
+@jwt_required()
+def export_group_ledger(id):
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    if db.session.get(Group, id) is None:
         return jsonify({'error': 'Group not found'}), 404
 
+    try:
+        chunks = iter_export(id, export_format)
+    except ExportUnavailable as e:
+        return jsonify({'error': str(e)}), 501
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename=group-{id}-ledger.{export_format}'}
+    )
+
 
 # ─────────────────────────────
 # POST - Create a new group
@@ -39,7 +100,7 @@ def get_group(id):
 @group_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_group():
-    current_user_id = get_jwt_identity()
+    current_user_id = principal.current_user_id()
     data = request.get_json()
 
     if not data.get('name') or not data.get('target_amount'):
@@ -50,7 +111,7 @@ def create_group():
         if target_amount <= 0:
             raise ValueError("Target amount must be greater than 0")
     except Exception as e:
-        print("❌ Invalid target_amount:", e)
+        logger.warning("Invalid target_amount: %s", e)
         return jsonify({'error': 'Invalid target amount'}), 400
 
     try:
@@ -68,9 +129,9 @@ def create_group():
         db.session.commit()
         return jsonify(group.serialize()), 201
 
-    except Exception as e:
+    except Exception:
         db.session.rollback()
-        print("❌ Error creating group:", e)
+        logger.exception("Error creating group")
         return jsonify({'error': 'Failed to create group'}), 500
 
 
@@ -80,7 +141,7 @@ def create_group():
 @group_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()
 def update_group(id):
-    current_user_id = get_jwt_identity()
+    current_user_id = principal.current_user_id()
     data = request.get_json()
 
     try:
@@ -108,9 +169,9 @@ def update_group(id):
         db.session.commit()
         return jsonify(group.serialize()), 200
 
-    except Exception as e:
+    except Exception:
         db.session.rollback()
-        print("❌ Error updating group:", repr(e))
+        logger.exception("Error updating group %s", id)
         return jsonify({'error': 'Failed to update group'}), 500
 
 
@@ -120,7 +181,7 @@ def update_group(id):
 @group_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()
 def delete_group(id):
-    current_user_id = get_jwt_identity()
+    current_user_id = principal.current_user_id()
 
     try:
         group = Group.query.get_or_404(id)
@@ -132,7 +193,7 @@ def delete_group(id):
         db.session.commit()
         return jsonify({'message': 'Group deleted successfully'}), 200
 
-    except Exception as e:
+    except Exception:
         db.session.rollback()
-        print("❌ Error deleting group:", repr(e))
+        logger.exception("Error deleting group %s", id)
         return jsonify({'error': 'Failed to delete group'}), 500
@@ -1,11 +1,19 @@
+import logging
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from server.extensions import db
 from server.models.member import Member
-from server.models.contribution import Contribution
-from sqlalchemy import or_
+from server.models.group import GroupFull
+from server.models.member_stats import MemberStats
+from sqlalchemy import select
+from server.serializers import with_eager_loads, serialize_members
+from server.services import member_search
+from server.services.member_search import DEFAULT_SEARCH_LIMIT
+from server.services.principal import current_claims
+from server.services.rollups import contribution_series, parse_series_args
 
 member_bp = Blueprint('member', __name__, url_prefix='/api/member')
+logger = logging.getLogger(__name__)
 
 
 # Get all members
@@ -13,10 +21,10 @@ member_bp = Blueprint('member', __name__, url_prefix='/api/member')
 @jwt_required()
 def get_all_members():
     try:
-        members = Member.query.all()
-        return jsonify([m.serialize() for m in members]), 200
-    except Exception as e:
-        print("❌ Failed to get members:", e)
+        members = with_eager_loads(Member.query, Member).all()
+        return jsonify(serialize_members(members)), 200
+    except Exception:
+        logger.exception("Failed to get members")
         return jsonify({'error': 'Failed to retrieve members'}), 500
 
 
@@ -25,8 +33,8 @@ def get_all_members():
 @jwt_required()
 def get_member(id):
     try:
-        member = Member.query.get_or_404(id)
-        return jsonify(member.serialize()), 200
+        member = with_eager_loads(Member.query, Member).filter_by(id=id).first_or_404()
+        return jsonify(serialize_members([member])[0]), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -66,6 +74,9 @@ def create_member():
         db.session.add(member)
         db.session.commit()
         return jsonify(member.serialize()), 201
+    except GroupFull as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
@@ -83,6 +94,9 @@ def update_member(id):
                 setattr(member, field, data[field])
         db.session.commit()
         return jsonify(member.serialize()), 200
+    except GroupFull as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
@@ -107,8 +121,8 @@ def delete_member(id):
 @jwt_required()
 def get_members_by_group(group_id):
     try:
-        members = Member.query.filter_by(group_id=group_id).all()
-        return jsonify([m.serialize() for m in members]), 200
+        members = with_eager_loads(Member.query, Member).filter_by(group_id=group_id).all()
+        return jsonify(serialize_members(members)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -119,13 +133,11 @@ def get_members_by_group(group_id):
 def search_members():
     query = request.args.get('q', '')
     try:
-        members = Member.query.filter(
-            or_(
-                Member.name.ilike(f"%{query}%"),
-                Member.email.ilike(f"%{query}%")
-            )
-        ).all()
-        return jsonify([m.serialize() for m in members]), 200
+        limit = int(request.args.get('limit', DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    try:
+        return jsonify(member_search.search_members(query, limit)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -149,23 +161,56 @@ def invite_member():
         return jsonify({'error': str(e)}), 500
 
 
+# Confirmed contributions over time (?interval=day|week|month&from=&to=&max_points=)
+@member_bp.route('/<int:id>/series', methods=['GET'])
+@jwt_required()
+def get_member_series(id):
+    try:
+        options = parse_series_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        member = db.session.get(Member, id)
+        if member is None:
+            return jsonify({'error': 'Member not found'}), 404
+        return jsonify({
+            'member_id': id,
+            'group_id': member.group_id,
+            'interval': options['interval'],
+            'points': contribution_series(member_id=id, **options)
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 # Dashboard summary for current member
 @member_bp.route('/summary', methods=['GET'])
 @jwt_required()
 def get_member_summary():
     try:
-        current_user = get_jwt_identity()
-        member = Member.query.filter_by(user_id=current_user['id']).first()
-
-        if not member:
+        claims = current_claims()
+        query = (
+            select(Member.id, MemberStats.confirmed_total, MemberStats.confirmed_count,
+                   MemberStats.last_contribution_at)
+            .outerjoin(MemberStats, MemberStats.member_id == Member.id)
+        )
+        if claims['member_ids']:
+            # Member id comes from the token, so this is a primary-key lookup
+            query = query.where(Member.id == claims['member_ids'][0])
+        else:
+            # Token predates the user's first membership
+            query = query.where(Member.user_id == claims['id']).order_by(Member.id).limit(1)
+        row = db.session.execute(query).first()
+
+        if not row:
             return jsonify({'error': 'Member not found'}), 404
 
-        contributions = sum(float(c.amount or 0) for c in member.contributions if c.status == 'confirmed')
-
         return jsonify({
-            'contributions': round(contributions, 2)
+            'contributions': round(float(row.confirmed_total or 0), 2),
+            'contributions_count': row.confirmed_count or 0,
+            'last_contribution_at': row.last_contribution_at.isoformat() if row.last_contribution_at else None
         }), 200
 
-    except Exception as e:
-        print("❌ Error in /summary:", e)
+    except Exception:
+        logger.exception("Error in /summary")
         return jsonify({'error': 'Failed to load member stats'}), 500
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from server.extensions import db
 from server.models.user import User
+from server.services.principal import cached_user, current_user_id, forget_user
 
 user_bp = Blueprint('user', __name__, url_prefix='/api/users')
 
@@ -9,22 +10,28 @@ user_bp = Blueprint('user', __name__, url_prefix='/api/users')
 @user_bp.route('/me', methods=['GET', 'PUT', 'DELETE'])
 @jwt_required()
 def handle_current_user():
-    user_id = get_jwt_identity().get('id')
-    user = User.query.get_or_404(user_id)
+    user_id = current_user_id()
 
     if request.method == 'GET':
-        return jsonify(user.serialize(include_sensitive=True)), 200
+        data = cached_user(user_id, include_sensitive=True)
+        if data is None:
+            return jsonify({'error': 'User not found'}), 404
+        return jsonify(data), 200
+
+    user = User.query.get_or_404(user_id)
 
-    elif request.method == 'PUT':
+    if request.method == 'PUT':
         data = request.get_json()
         user.username = data.get('username', user.username)
         user.phone_number = data.get('phone_number', user.phone_number)
         db.session.commit()
+        forget_user(user_id)
         return jsonify(user.serialize(include_sensitive=True)), 200
 
     elif request.method == 'DELETE':
         db.session.delete(user)
         db.session.commit()
+        forget_user(user_id)
         return jsonify({'message': 'User deleted successfully'}), 200
 
 
@@ -83,6 +90,7 @@ def update_user(id):
         user.role = data.get('role', user.role)
         user.phone_number = data.get('phone_number', user.phone_number)
         db.session.commit()
+        forget_user(id)
         return jsonify(user.serialize()), 200
     except Exception as e:
         db.session.rollback()
@@ -97,6 +105,7 @@ def delete_user(id):
         user = User.query.get_or_404(id)
         db.session.delete(user)
         db.session.commit()
+        forget_user(id)
         return jsonify({'message': 'User deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
@@ -0,0 +1,29 @@
+# Endpoint serializers: each list endpoint declares the relationships it
+# touches here so they are loaded up front instead of lazily per row.
+from sqlalchemy.orm import joinedload
+from server.models.contribution import Contribution
+from server.models.member import Member
+
+EAGER_LOADS = {
+    Member: (
+        joinedload(Member.user),
+        joinedload(Member.group),
+        joinedload(Member.stats),
+    ),
+    Contribution: (
+        joinedload(Contribution.member).joinedload(Member.user),
+        joinedload(Contribution.group),
+    ),
+}
+
+
+def with_eager_loads(query, model):
+    return query.options(*EAGER_LOADS.get(model, ()))
+
+
+def serialize_members(members):
+    return [m.serialize() for m in members]
+
+
+def serialize_contributions(contributions):
+    return [c.serialize() for c in contributions]
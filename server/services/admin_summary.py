@@ -0,0 +1,107 @@
+# Platform-wide totals for the admin dashboard.
+#
+# Members and confirmed totals come from the counters maintained on groups
+# (member_count, active_member_count, current_amount), so they are exact
+# and cost one pass over the groups table. Row counts for the big tables
+# are PostgreSQL planner estimates (pg_class.reltuples, and pg_stats for the
+# contribution status mix) unless exact=True. Other databases always count
+# exactly; they are only used for development. Results are cached for
+# ADMIN_SUMMARY_TTL seconds per mode.
+from datetime import datetime
+from sqlalchemy import func, select, text
+from server.extensions import db
+from server.models import Contribution, Group, Member, User
+from server.services.cache import TTLCache
+
+STATUSES = ('pending', 'confirmed', 'rejected')
+
+summary_cache = TTLCache(ttl=30, maxsize=4)
+
+
+def init_admin_summary(app):
+    summary_cache.ttl = int(app.config.get('ADMIN_SUMMARY_TTL', 30))
+    summary_cache.clear()
+
+
+def _estimated_rows(table_names):
+    rows = db.session.execute(
+        text("SELECT relname, reltuples FROM pg_class "
+             "WHERE oid IN (SELECT to_regclass(unnest(CAST(:names AS text[]))))"),
+        {'names': list(table_names)}
+    ).all()
+    # reltuples is -1 until the table is first analyzed
+    return {name: int(estimate) for name, estimate in rows if estimate >= 0}
+
+
+def _estimated_status_mix(total):
+    row = db.session.execute(text(
+        "SELECT most_common_vals::text::text[], most_common_freqs FROM pg_stats "
+        "WHERE schemaname = current_schema() AND tablename = 'contributions' AND attname = 'status'"
+    )).first()
+    if row is None or row[0] is None:
+        return None
+    frequencies = dict(zip(row[0], row[1]))
+    return {status: int(round(total * frequencies.get(status, 0))) for status in STATUSES}
+
+
+def _exact_counts():
+    counts = {
+        'users': db.session.scalar(select(func.count(User.id))),
+        'groups': db.session.scalar(select(func.count(Group.id))),
+        'members': db.session.scalar(select(func.count(Member.id))),
+    }
+    by_status = dict(db.session.execute(
+        select(Contribution.status, func.count(Contribution.id)).group_by(Contribution.status)
+    ).all())
+    return counts, {status: by_status.get(status, 0) for status in STATUSES}
+
+
+def _counter_totals():
+    member_count, active_count, confirmed_total = db.session.execute(select(
+        func.coalesce(func.sum(Group.member_count), 0),
+        func.coalesce(func.sum(Group.active_member_count), 0),
+        func.coalesce(func.sum(Group.current_amount), 0),
+    )).one()
+    return int(member_count), int(active_count), confirmed_total
+
+
+def build_summary(exact=False):
+    member_count, active_count, confirmed_total = _counter_totals()
+    estimated = not exact and db.engine.dialect.name == 'postgresql'
+
+    counts = by_status = None
+    if estimated:
+        estimates = _estimated_rows(('users', 'groups', 'contributions'))
+        if {'users', 'groups', 'contributions'} <= estimates.keys():
+            counts = {'users': estimates['users'], 'groups': estimates['groups'], 'members': member_count}
+            by_status = _estimated_status_mix(estimates['contributions'])
+    if counts is None or by_status is None:
+        # Tables not analyzed yet (or not PostgreSQL): count once, then serve from cache
+        estimated = False
+        counts, by_status = _exact_counts()
+    if not estimated:
+        # The exact confirmed total comes from the ledger itself
+        confirmed_total = db.session.scalar(
+            select(func.coalesce(func.sum(Contribution.amount), 0)).where(Contribution.status == 'confirmed')
+        )
+
+    return {
+        'mode': 'estimate' if estimated else 'exact',
+        'generated_at': datetime.utcnow().isoformat(),
+        'users': counts['users'],
+        'groups': counts['groups'],
+        'members': counts['members'],
+        'active_members': active_count,
+        'contributions': sum(by_status.values()),
+        'contributions_by_status': by_status,
+        'confirmed_total': float(confirmed_total or 0),
+    }
+
+
+def admin_summary(exact=False):
+    key = 'exact' if exact else 'estimate'
+    summary = summary_cache.get(key)
+    if summary is None:
+        summary = build_summary(exact)
+        summary_cache.set(key, summary)
+    return summary
@@ -0,0 +1,106 @@
+from decimal import Decimal
+from sqlalchemy import func, select, case
+from server.extensions import db
+from server.models.group import Group
+from server.models.contribution import Contribution
+from server.models.member_stats import MemberStats
+from server.models.contribution_rollup import ContributionRollup
+from server.services.cache import group_tags, mark_dirty
+
+
+def confirmed_totals_query():
+    """Confirmed contribution total per group, including groups with none."""
+    confirmed_sum = func.coalesce(
+        func.sum(case((Contribution.status == 'confirmed', Contribution.amount), else_=0)), 0
+    )
+    return (
+        select(Group.id, Group.current_amount, confirmed_sum.label('expected'))
+        .outerjoin(Contribution, Contribution.group_id == Group.id)
+        .group_by(Group.id, Group.current_amount)
+    )
+
+
+def find_balance_drift():
+    """Return ``[(group_id, stored, expected)]`` for every group whose balance has drifted."""
+    drift = []
+    for group_id, stored, expected in db.session.execute(confirmed_totals_query()):
+        stored = Decimal(str(stored or 0)).quantize(Decimal('0.01'))
+        expected = Decimal(str(expected or 0)).quantize(Decimal('0.01'))
+        if stored != expected:
+            drift.append((group_id, stored, expected))
+    return drift
+
+
+def reconcile_group_balances(fix=True):
+    """Report drifted balances and, unless ``fix`` is False, rebuild them in one UPDATE."""
+    drift = find_balance_drift()
+    if fix and drift:
+        confirmed_sum = (
+            select(func.coalesce(func.sum(Contribution.amount), 0))
+            .where(Contribution.group_id == Group.id, Contribution.status == 'confirmed')
+            .scalar_subquery()
+        )
+        db.session.execute(db.update(Group).values(current_amount=confirmed_sum))
+        for group_id, _, _ in drift:
+            mark_dirty(db.session, group_tags(group_id))
+        db.session.commit()
+    return drift
+
+
+def member_stats_select():
+    """Confirmed total/count/last date per member, as rows ready for member_stats."""
+    return (
+        select(
+            Contribution.member_id,
+            func.sum(Contribution.amount),
+            func.count(Contribution.id),
+            func.max(Contribution.created_at),
+            func.count(Contribution.id),
+        )
+        .where(Contribution.status == 'confirmed')
+        .group_by(Contribution.member_id)
+    )
+
+
+def rebuild_member_stats():
+    """Rebuild member_stats from the ledger in two set-based statements."""
+    stats = MemberStats.__table__
+    db.session.execute(stats.delete())
+    result = db.session.execute(
+        stats.insert().from_select(
+            ['member_id', 'confirmed_total', 'confirmed_count', 'last_contribution_at', 'score'],
+            member_stats_select()
+        )
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def rollups_select():
+    """Confirmed sum/count per group, member and day, as rows ready for contribution_rollups."""
+    day = func.date(Contribution.created_at)
+    return (
+        select(
+            Contribution.group_id,
+            Contribution.member_id,
+            day,
+            func.sum(Contribution.amount),
+            func.count(Contribution.id),
+        )
+        .where(Contribution.status == 'confirmed')
+        .group_by(Contribution.group_id, Contribution.member_id, day)
+    )
+
+
+def rebuild_contribution_rollups():
+    """Rebuild contribution_rollups from the ledger in two set-based statements."""
+    rollups = ContributionRollup.__table__
+    db.session.execute(rollups.delete())
+    result = db.session.execute(
+        rollups.insert().from_select(
+            ['group_id', 'member_id', 'day', 'confirmed_sum', 'confirmed_count'],
+            rollups_select()
+        )
+    )
+    db.session.commit()
+    return result.rowcount
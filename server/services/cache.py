@@ -0,0 +1,266 @@
+# Response caching for hot read endpoints.
+#
+# Cached responses are keyed by request path + query string + the current
+# generation of every tag the endpoint depends on. Writes never delete
+# entries: SQLAlchemy after_flush collects the tags touched by changed
+# Group/Member/Contribution/User rows and after_commit bumps their
+# generations, so the next read misses and rebuilds. Entries left behind
+# simply age out of the LRU.
+#
+# With a read replica (DATABASE_REPLICA_URL) a read right after a commit may
+# still see the old rows. Clients pinned to the primary bypass the cache, and
+# for DB_REPLICA_STICKY_SECONDS after a tag is bumped responses built from
+# the replica are served but not stored, so a lagging read is never cached
+# under the new generation.
+#
+# RESPONSE_CACHE_URL unset   -> per-process LRU (TTLCache); only with a single
+#                               worker (WEB_CONCURRENCY=1), since generations
+#                               bumped in one process are invisible to others.
+#                               With more workers caching is off.
+# RESPONSE_CACHE_URL=redis:// -> shared Redis backend, generations via INCR
+# RESPONSE_CACHE_TTL=0        -> caching off (ETags are still sent)
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, make_response, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from server.db_routing import pinned_to_primary, replica_lag_seconds
+
+logger = logging.getLogger(__name__)
+
+ALL_TAG = 'all'
+
+
+class TTLCache:
+    """Thread-safe, size-bounded mapping whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl=30, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class LocalBackend:
+    def __init__(self, ttl, maxsize):
+        self.entries = TTLCache(ttl, maxsize)
+        self._generations = {}
+        self._bumped_at = {}
+        self._lock = threading.Lock()
+
+    def generations(self, tags):
+        """Current generation of each tag, and when the most recent of them was bumped."""
+        generations = [self._generations.get(tag, 0) for tag in tags]
+        return generations, max((self._bumped_at.get(tag, 0) for tag in tags), default=0)
+
+    def bump(self, tags):
+        now = time.time()
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                self._bumped_at[tag] = now
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries.set(key, value)
+
+
+class RedisBackend:
+    def __init__(self, client, ttl, prefix='chama:cache:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, ttl):
+        import redis
+        return cls(redis.Redis.from_url(url), ttl)
+
+    def generations(self, tags):
+        values = self.client.mget(
+            [f'{self.prefix}tag:{tag}' for tag in tags] + [f'{self.prefix}bumped:{tag}' for tag in tags]
+        )
+        generations, bumped_at = values[:len(tags)], values[len(tags):]
+        return [int(value or 0) for value in generations], max(float(value or 0) for value in bumped_at)
+
+    def bump(self, tags):
+        now = time.time()
+        pipeline = self.client.pipeline()
+        for tag in tags:
+            pipeline.incr(f'{self.prefix}tag:{tag}')
+            pipeline.set(f'{self.prefix}bumped:{tag}', now)
+        pipeline.execute()
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        etag, body = raw.split(b'\n', 1)
+        return etag.decode(), body
+
+    def set(self, key, value):
+        etag, body = value
+        self.client.set(self.prefix + key, etag.encode() + b'\n' + body, ex=self.ttl)
+
+
+class ResponseCache:
+    def __init__(self):
+        self.backend = LocalBackend(ttl=60, maxsize=512)
+        self.enabled = True
+
+    def init_app(self, app):
+        ttl = int(app.config.get('RESPONSE_CACHE_TTL', 60))
+        url = app.config.get('RESPONSE_CACHE_URL')
+        workers = int(app.config.get('WEB_CONCURRENCY', 1))
+        self.enabled = ttl > 0
+        if url:
+            self.backend = RedisBackend.from_url(url, ttl)
+        else:
+            self.backend = LocalBackend(ttl, int(app.config.get('RESPONSE_CACHE_SIZE', 512)))
+            if workers > 1 and self.enabled:
+                # Tag generations are per process: a commit in one worker could not
+                # invalidate the others, so they would serve stale balances
+                logger.warning("Response cache disabled: %s workers and no RESPONSE_CACHE_URL", workers)
+                self.enabled = False
+        app.extensions['response_cache'] = self
+
+    def key_for(self, tags):
+        """Cache key for this request, and when any of ``tags`` last changed."""
+        tags = [ALL_TAG, *tags]
+        generations, bumped_at = self.backend.generations(tags)
+        generations = ','.join(str(g) for g in generations)
+        raw = f"{request.path}?{request.query_string.decode()}|{'|'.join(tags)}|{generations}"
+        return hashlib.sha1(raw.encode()).hexdigest(), bumped_at
+
+    def invalidate(self, tags):
+        if tags:
+            self.backend.bump(sorted(tags))
+
+
+response_cache = ResponseCache()
+
+
+def _etag_response(etag, body):
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, status=200, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+
+def cached_response(tags):
+    """Cache a JSON GET view; ``tags`` maps the view kwargs to the tags it depends on."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = None
+            if response_cache.enabled and not pinned_to_primary():
+                key, bumped_at = response_cache.key_for(tags(**kwargs))
+                hit = response_cache.backend.get(key)
+                if hit is not None:
+                    return _etag_response(*hit)
+                if time.time() - bumped_at < replica_lag_seconds():
+                    # The replica may not have this change yet; don't cache what it returns
+                    key = None
+
+            result = view(*args, **kwargs)
+            response = make_response(result)
+            if response.status_code != 200 or response.is_streamed or response.mimetype != 'application/json':
+                return response
+
+            body = response.get_data()
+            etag = hashlib.sha1(body).hexdigest()
+            if key:
+                response_cache.backend.set(key, (etag, body))
+            return _etag_response(etag, body)
+
+        return wrapper
+
+    return decorator
+
+
+# ── Invalidation ─────────────────────────────
+
+def _previous(obj, key):
+    history = inspect(obj).attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(obj, key)
+
+
+def group_tags(group_id):
+    return {'groups', f'group:{group_id}', 'contributions', f'contributions:group:{group_id}'}
+
+
+def tags_for(obj):
+    from server.models import Contribution, Group, Member, User
+
+    if isinstance(obj, (Contribution, Member)):
+        tags = set()
+        for group_id in {_previous(obj, 'group_id'), obj.group_id}:
+            tags |= group_tags(group_id)
+        return tags
+    if isinstance(obj, Group):
+        return group_tags(obj.id)
+    if isinstance(obj, User):
+        # Usernames show up as admin/member names everywhere
+        return {ALL_TAG}
+    return set()
+
+
+def mark_dirty(session, tags):
+    session.info.setdefault('cache_tags', set()).update(tags)
+
+
+@event.listens_for(Session, 'after_flush')
+def collect_cache_tags(session, flush_context):
+    tags = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tags |= tags_for(obj)
+    if tags:
+        mark_dirty(session, tags)
+
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_cache_tags(session):
+    tags = session.info.pop('cache_tags', None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_cache_tags(session):
+    session.info.pop('cache_tags', None)
@@ -0,0 +1,180 @@
+# Bulk contribution import (e.g. reconciled M-Pesa statements).
+#
+# Rows are validated in one pass, receipt numbers and member/group pairs
+# are checked against the database with a handful of IN queries, valid rows
+# are inserted with chunked executemany, and each affected group/member gets
+# a single balance delta. Invalid rows are reported, not fatal.
+import csv
+import io
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from sqlalchemy import select, tuple_
+from server.extensions import db
+from server.models.contribution import Contribution, apply_group_delta, parse_amount, rollup_key
+from server.models.contribution_rollup import apply_rollup_delta
+from server.models.member import Member
+from server.models.member_stats import apply_member_stats_delta
+from server.services.cache import group_tags, mark_dirty
+from server.services.realtime import mark_balance_changed
+
+VALID_STATUSES = ('pending', 'confirmed', 'rejected')
+NOTE_MAX_LENGTH = Contribution.__table__.c.note.type.length
+RECEIPT_MAX_LENGTH = Contribution.__table__.c.receipt_number.type.length
+MAX_ID = 2 ** 31 - 1  # INTEGER primary keys
+INSERT_CHUNK_SIZE = 1000
+LOOKUP_CHUNK_SIZE = 900
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def parse_csv(text):
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def _text(value):
+    """Stripped string form of a JSON/CSV scalar; None when empty."""
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        raise ValueError
+    return str(value).strip() or None
+
+
+def _timestamp(value):
+    """Parse an ISO 8601 timestamp into the naive UTC datetimes the ledger stores."""
+    if not value:
+        return datetime.utcnow()
+    if not isinstance(value, str):
+        raise ValueError
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _clean_row(raw):
+    """Return ``(row, error)`` for one raw JSON/CSV record."""
+    if not isinstance(raw, dict):
+        return None, 'Row must be an object'
+    try:
+        member_id = int(raw.get('member_id'))
+        group_id = int(raw.get('group_id'))
+    except (TypeError, ValueError):
+        return None, 'member_id and group_id must be integers'
+    if not (0 < member_id <= MAX_ID and 0 < group_id <= MAX_ID):
+        return None, 'member_id and group_id are out of range'
+    try:
+        amount = parse_amount(raw.get('amount'))
+    except ValueError as e:
+        return None, str(e)
+
+    try:
+        status = _text(raw.get('status')) or 'pending'
+        note = _text(raw.get('note'))
+        receipt_number = _text(raw.get('receipt_number'))
+    except ValueError:
+        return None, 'status, note and receipt_number must be text'
+    if status not in VALID_STATUSES:
+        return None, f"Invalid status. Must be one of: {list(VALID_STATUSES)}"
+    if note and len(note) > NOTE_MAX_LENGTH:
+        return None, f'note must be at most {NOTE_MAX_LENGTH} characters'
+    if receipt_number and len(receipt_number) > RECEIPT_MAX_LENGTH:
+        return None, f'receipt_number must be at most {RECEIPT_MAX_LENGTH} characters'
+
+    try:
+        created_at = _timestamp(raw.get('created_at'))
+    except (TypeError, ValueError, OverflowError):
+        return None, 'created_at must be an ISO 8601 timestamp'
+
+    return {
+        'member_id': member_id,
+        'group_id': group_id,
+        'amount': amount,
+        'note': note,
+        'receipt_number': receipt_number,
+        'status': status,
+        'created_at': created_at,
+    }, None
+
+
+def _existing_receipts(receipts):
+    found = set()
+    for chunk in _chunks(sorted(receipts), LOOKUP_CHUNK_SIZE):
+        found.update(db.session.scalars(
+            select(Contribution.receipt_number).where(Contribution.receipt_number.in_(chunk))
+        ))
+    return found
+
+
+def _known_memberships(pairs):
+    found = set()
+    for chunk in _chunks(sorted(pairs), LOOKUP_CHUNK_SIZE):
+        found.update(tuple(row) for row in db.session.execute(
+            select(Member.id, Member.group_id).where(tuple_(Member.id, Member.group_id).in_(chunk))
+        ))
+    return found
+
+
+def import_contributions(records):
+    """Validate and insert ``records``; return ``(inserted_count, errors)``."""
+    rows, errors = [], []
+    for index, raw in enumerate(records):
+        row, error = _clean_row(raw)
+        if error:
+            errors.append({'row': index, 'error': error})
+        else:
+            rows.append((index, row))
+
+    receipts = [row['receipt_number'] for _, row in rows if row['receipt_number']]
+    taken = _existing_receipts(set(receipts))
+    memberships = _known_memberships({(row['member_id'], row['group_id']) for _, row in rows})
+
+    valid, seen_receipts = [], set()
+    for index, row in rows:
+        receipt = row['receipt_number']
+        if (row['member_id'], row['group_id']) not in memberships:
+            errors.append({'row': index, 'error': 'Member does not belong to group'})
+        elif receipt and (receipt in taken or receipt in seen_receipts):
+            errors.append({'row': index, 'error': f'Duplicate receipt_number {receipt}'})
+        else:
+            if receipt:
+                seen_receipts.add(receipt)
+            valid.append(row)
+
+    group_deltas = defaultdict(Decimal)
+    member_deltas = defaultdict(lambda: [Decimal('0'), 0, None])
+    rollup_deltas = defaultdict(lambda: [Decimal('0'), 0])
+    for row in valid:
+        if row['status'] == 'confirmed':
+            group_deltas[row['group_id']] += row['amount']
+            stats = member_deltas[row['member_id']]
+            stats[0] += row['amount']
+            stats[1] += 1
+            stats[2] = max(stats[2], row['created_at']) if stats[2] else row['created_at']
+            bucket = rollup_deltas[rollup_key(row['group_id'], row['member_id'], row['created_at'])]
+            bucket[0] += row['amount']
+            bucket[1] += 1
+
+    table = Contribution.__table__
+    connection = db.session.connection()
+    for chunk in _chunks(valid, INSERT_CHUNK_SIZE):
+        connection.execute(table.insert(), chunk)
+    for group_id, delta in group_deltas.items():
+        apply_group_delta(connection, db.session, group_id, delta)
+    for member_id, (delta, count, latest) in member_deltas.items():
+        apply_member_stats_delta(connection, member_id, delta, count, latest)
+    for (group_id, member_id, day), (delta, count) in rollup_deltas.items():
+        apply_rollup_delta(connection, group_id, member_id, day, delta, count)
+    # Core inserts bypass the ORM flush, so flag the cached reads here
+    affected_groups = {row['group_id'] for row in valid}
+    for group_id in affected_groups:
+        mark_dirty(db.session, group_tags(group_id))
+    mark_balance_changed(db.session, affected_groups)
+    db.session.commit()
+
+    errors.sort(key=lambda error: error['row'])
+    return len(valid), errors
@@ -0,0 +1,167 @@
+# Idempotency-Key support for POST endpoints.
+#
+# A client may send an Idempotency-Key header with a write. The first
+# request with a key reserves it, runs, and stores its response (status,
+# body, content type) for IDEMPOTENCY_TTL seconds; retries with the same key
+# and body are answered from the store without running the view again, so
+# the ledger is never touched twice. Server errors, lock conflicts (409) and
+# throttling (429) are not stored: the key is released so a retry runs again.
+# Keys are scoped to method, path and the authenticated user (or, for views
+# without @jwt_required, the Authorization header).
+#
+# IDEMPOTENCY_URL unset    -> per-process store; refused with more than one
+#                             worker, where a retry reaching another worker
+#                             would run the write again
+# IDEMPOTENCY_URL=redis:// -> shared Redis store, reservations via SET NX
+import hashlib
+import json
+import threading
+import time
+from functools import wraps
+from flask import Response, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from server.services.cache import TTLCache
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+# Transient outcomes a retry with the same key should re-run rather than replay
+RETRYABLE_STATUSES = (409, 429)
+
+
+class MemoryIdempotencyStore:
+    def __init__(self, ttl=86400, maxsize=10000):
+        self.entries = TTLCache(ttl, maxsize)
+        self._lock = threading.Lock()
+
+    def reserve(self, key, record):
+        """Store ``record`` unless ``key`` exists; return the existing record, if any."""
+        with self._lock:
+            existing = self.entries.get(key)
+            if existing is None:
+                self.entries.set(key, record)
+            return existing
+
+    def save(self, key, record):
+        self.entries.set(key, record)
+
+    def release(self, key):
+        self.entries.delete(key)
+
+
+class RedisIdempotencyStore:
+    def __init__(self, client, ttl=86400, prefix='chama:idempotency:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, ttl):
+        import redis
+        return cls(redis.Redis.from_url(url), ttl)
+
+    def reserve(self, key, record):
+        if self.client.set(self.prefix + key, json.dumps(record), nx=True, ex=self.ttl):
+            return None
+        existing = self.client.get(self.prefix + key)
+        return json.loads(existing) if existing else None
+
+    def save(self, key, record):
+        self.client.set(self.prefix + key, json.dumps(record), ex=self.ttl)
+
+    def release(self, key):
+        self.client.delete(self.prefix + key)
+
+
+class IdempotencyStore:
+    """Proxy to the configured store so routes can be decorated at import time."""
+
+    def __init__(self):
+        self.store = MemoryIdempotencyStore()
+        self.lock_seconds = 60
+
+    def init_app(self, app):
+        ttl = int(app.config.get('IDEMPOTENCY_TTL', 86400))
+        url = app.config.get('IDEMPOTENCY_URL')
+        if url:
+            self.store = RedisIdempotencyStore.from_url(url, ttl)
+        elif int(app.config.get('WEB_CONCURRENCY', 1)) > 1:
+            raise RuntimeError('IDEMPOTENCY_URL is required when running more than one worker; '
+                               'an in-process store would let a retry on another worker write twice')
+        else:
+            self.store = MemoryIdempotencyStore(ttl, int(app.config.get('IDEMPOTENCY_SIZE', 10000)))
+        # A reservation older than this is treated as abandoned by a crashed request
+        self.lock_seconds = int(app.config.get('IDEMPOTENCY_LOCK_SECONDS', 60))
+        app.extensions['idempotency_store'] = self
+
+
+idempotency_store = IdempotencyStore()
+
+
+def _caller():
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        # Not behind @jwt_required
+        identity = None
+    if identity is not None:
+        return f'user:{identity}'
+    return hashlib.sha1(request.headers.get('Authorization', '').encode()).hexdigest()[:16]
+
+
+def _scope(key):
+    return f'{request.method}:{request.path}:{_caller()}:{key}'
+
+
+def _replay(record):
+    response = Response(record['body'], status=record['status'], mimetype=record['mimetype'])
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view):
+    """Serve retries of a write carrying the same Idempotency-Key from the stored response."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'}), 400
+
+        scope = _scope(key)
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        store = idempotency_store.store
+        existing = store.reserve(scope, {'state': 'pending', 'fingerprint': fingerprint, 'at': time.time()})
+        if existing is not None:
+            if existing['fingerprint'] != fingerprint:
+                return jsonify({'error': f'{HEADER} was already used with a different request'}), 422
+            if existing['state'] == 'done':
+                return _replay(existing)
+            if time.time() - existing['at'] < idempotency_store.lock_seconds:
+                response = jsonify({'error': f'A request with this {HEADER} is still in progress'})
+                response.headers['Retry-After'] = '1'
+                return response, 409
+            store.save(scope, {'state': 'pending', 'fingerprint': fingerprint, 'at': time.time()})
+
+        try:
+            response = make_response(view(*args, **kwargs))
+        except Exception:
+            store.release(scope)
+            raise
+        if response.status_code >= 500 or response.status_code in RETRYABLE_STATUSES or response.is_streamed:
+            # Let the client retry failures and conflicts for real
+            store.release(scope)
+            return response
+
+        store.save(scope, {
+            'state': 'done',
+            'fingerprint': fingerprint,
+            'at': time.time(),
+            'status': response.status_code,
+            'body': response.get_data(as_text=True),
+            'mimetype': response.mimetype,
+        })
+        return response
+
+    return wrapper
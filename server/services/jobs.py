@@ -0,0 +1,81 @@
+# In-process side-effect queue for model listeners.
+#
+# Listeners call enqueue() during flush; nothing runs until the surrounding
+# transaction commits (a rollback discards the jobs). Committed jobs go to a
+# small thread pool, each in its own app context and therefore its own
+# database session, so the write path is just the INSERT/UPDATE.
+#
+# JOBS_WORKERS=0 runs jobs inline right after commit (tests, CLI scripts).
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from server.extensions import db
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def job(name):
+    """Register a handler for jobs called ``name``."""
+    def decorator(handler):
+        _handlers[name] = handler
+        return handler
+    return decorator
+
+
+def enqueue(session, job_name, /, **payload):
+    session.info.setdefault('pending_jobs', []).append((job_name, payload))
+
+
+class JobQueue:
+    def __init__(self):
+        self.app = None
+        self.workers = 0
+        self._executor = None
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = int(app.config.get('JOBS_WORKERS', 2))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='jobs') if self.workers else None
+        app.extensions['job_queue'] = self
+
+    def submit(self, name, payload):
+        if self._executor is None:
+            self.run(name, payload)
+        else:
+            self._executor.submit(self.run, name, payload)
+
+    def run(self, name, payload):
+        handler = _handlers.get(name)
+        if handler is None:
+            logger.error("No handler registered for job %s", name)
+            return
+        if self.app is None:
+            handler(**payload)
+            return
+        with self.app.app_context():
+            try:
+                handler(**payload)
+            except Exception:
+                db.session.rollback()
+                logger.exception("Job %s failed with payload %s", name, payload)
+            finally:
+                db.session.remove()
+
+
+job_queue = JobQueue()
+
+
+@event.listens_for(Session, 'after_commit')
+def dispatch_jobs(session):
+    for name, payload in session.info.pop('pending_jobs', ()):
+        job_queue.submit(name, payload)
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_jobs(session):
+    session.info.pop('pending_jobs', None)
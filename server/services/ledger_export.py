@@ -0,0 +1,120 @@
+# Group ledger export.
+#
+# Rows are read through a server-side cursor (yield_per) and written out
+# batch by batch, so memory stays flat however large the group's ledger is.
+# Parquet output needs the optional pyarrow package.
+import csv
+import io
+from sqlalchemy import select
+from server.extensions import db
+from server.models.contribution import Contribution
+from server.models.member import Member
+from server.models.user import User
+
+EXPORT_BATCH_SIZE = 5000
+EXPORT_COLUMNS = ('id', 'created_at', 'member_id', 'member_name', 'amount', 'status', 'receipt_number', 'note')
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+class ExportUnavailable(RuntimeError):
+    pass
+
+
+def ledger_batches(group_id, batch_size=EXPORT_BATCH_SIZE):
+    """Yield lists of ledger rows for a group, oldest first."""
+    statement = (
+        select(
+            Contribution.id, Contribution.created_at, Contribution.member_id,
+            User.username.label('member_name'), Contribution.amount, Contribution.status,
+            Contribution.receipt_number, Contribution.note
+        )
+        .join(Member, Member.id == Contribution.member_id)
+        .join(User, User.id == Member.user_id)
+        .where(Contribution.group_id == group_id)
+        .order_by(Contribution.created_at, Contribution.id)
+        .execution_options(yield_per=batch_size, stream_results=True)
+    )
+    result = db.session.execute(statement)
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def iter_csv(group_id, batch_size=EXPORT_BATCH_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in ledger_batches(group_id, batch_size):
+        for row in batch:
+            writer.writerow([
+                row.id, row.created_at.isoformat() if row.created_at else '', row.member_id,
+                row.member_name, row.amount, row.status, row.receipt_number or '', row.note or ''
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_parquet(group_id, batch_size=EXPORT_BATCH_SIZE):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportUnavailable('Parquet export requires the pyarrow package')
+
+    schema = pa.schema([
+        ('id', pa.int64()), ('created_at', pa.timestamp('us')), ('member_id', pa.int64()),
+        ('member_name', pa.string()), ('amount', pa.decimal128(12, 2)), ('status', pa.string()),
+        ('receipt_number', pa.string()), ('note', pa.string()),
+    ])
+
+    def generate():
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema) as writer:
+            for batch in ledger_batches(group_id, batch_size):
+                columns = list(zip(*batch))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                yield sink.drain()
+        yield sink.drain()
+
+    return generate()
+
+
+def iter_export(group_id, export_format, batch_size=EXPORT_BATCH_SIZE):
+    if export_format == 'parquet':
+        return iter_parquet(group_id, batch_size)
+    return iter_csv(group_id, batch_size)
@@ -0,0 +1,124 @@
+# Member search backends.
+#
+# Postgres: pg_trgm GIN indexes on users.username / users.email serve the
+# substring ILIKE, and similarity() ranks the hits.
+# SQLite: the user_search FTS5 table (kept in sync by triggers) answers
+# token-prefix MATCH queries ranked by bm25.
+# Any other database, or SQLite without the FTS table, falls back to a
+# substring ILIKE on username and email (a full scan; fine for small data).
+# LIKE wildcards in the term are escaped, so '_' and '%' match literally.
+from sqlalchemy import case, column, func, inspect, literal_column, select, table
+from server.extensions import db
+from server.models.user import User
+from server.models.member import Member
+from server.models.group import Group
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+user_search = table('user_search', column('rowid'), column('rank'))
+
+_fts_available = {}
+
+
+def _projection():
+    return (
+        select(
+            Member.id, Member.user_id, Member.group_id, Member.status,
+            User.username, User.email, Group.name.label('group_name')
+        )
+        .join(User, User.id == Member.user_id)
+        .join(Group, Group.id == Member.group_id)
+    )
+
+
+def _has_fts_table(engine):
+    key = str(engine.url)
+    if key not in _fts_available:
+        _fts_available[key] = inspect(engine).has_table('user_search')
+    return _fts_available[key]
+
+
+def _fts_query(term):
+    # Quote every token so user input can't inject FTS operators
+    tokens = [token.replace('"', '""') for token in term.split()]
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _substring_match(term):
+    pattern = f"%{_escape_like(term)}%"
+    return User.username.ilike(pattern, escape='\\') | User.email.ilike(pattern, escape='\\')
+
+
+def _prefix_first(term):
+    return case((User.username.ilike(f"{_escape_like(term)}%", escape='\\'), 0), else_=1)
+
+
+def _postgres_search(term, limit):
+    return (
+        _projection()
+        .where(_substring_match(term))
+        .order_by(
+            _prefix_first(term),
+            func.similarity(User.username, term).desc(),
+            User.username
+        )
+        .limit(limit)
+    )
+
+
+def _sqlite_fts_search(term, limit):
+    matches = (
+        select(user_search.c.rowid.label('user_id'), user_search.c.rank)
+        .where(literal_column('user_search').op('MATCH')(_fts_query(term)))
+        .subquery()
+    )
+    return (
+        _projection()
+        .join(matches, matches.c.user_id == User.id)
+        .order_by(matches.c.rank, User.username)
+        .limit(limit)
+    )
+
+
+def _like_search(term, limit):
+    return (
+        _projection()
+        .where(_substring_match(term))
+        .order_by(_prefix_first(term), User.username)
+        .limit(limit)
+    )
+
+
+def search_members(term, limit=DEFAULT_SEARCH_LIMIT):
+    """Return a lightweight, ranked projection of members matching ``term``."""
+    term = (term or '').strip()
+    if not term:
+        return []
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+    engine = db.session.get_bind()
+    dialect = engine.dialect.name
+    if dialect == 'postgresql':
+        statement = _postgres_search(term, limit)
+    elif dialect == 'sqlite' and _has_fts_table(engine):
+        statement = _sqlite_fts_search(term, limit)
+    else:
+        statement = _like_search(term, limit)
+
+    return [
+        {
+            'id': row.id,
+            'user_id': row.user_id,
+            'group_id': row.group_id,
+            'group_name': row.group_name,
+            'status': row.status,
+            'username': row.username,
+            'email': row.email,
+        }
+        for row in db.session.execute(statement)
+    ]
@@ -0,0 +1,61 @@
+import base64
+import binascii
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    return min(limit, maximum)
+
+
+def encode_cursor(created_at, row_id):
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def keyset_after(created_at_column, id_column, cursor):
+    """Rows strictly after a decoded ``(created_at, id)`` cursor in DESC order."""
+    created_at, row_id = cursor
+    return or_(
+        created_at_column < created_at,
+        and_(created_at_column == created_at, id_column < row_id)
+    )
+
+
+def keyset_pages(query, created_at_column, id_column, batch_size, cursor=None):
+    """Yield successive lists of rows, walking the keyset instead of using OFFSET."""
+    while True:
+        page = query
+        if cursor is not None:
+            page = page.filter(keyset_after(created_at_column, id_column, cursor))
+        rows = page.order_by(created_at_column.desc(), id_column.desc()).limit(batch_size).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        cursor = (rows[-1].created_at, rows[-1].id)
@@ -0,0 +1,143 @@
+# Password hashing with a per-worker concurrency cap.
+#
+# Hashing is deliberately slow. The caller's request thread still waits for
+# the result, but in a worker that serves several requests at once (gthread,
+# gevent) the hashing itself runs on a small process pool (gevent: its native
+# thread pool, since hashlib releases the GIL), so other requests keep
+# their share of the interpreter. In-flight plus queued hashes are capped per
+# worker; past the cap login and register get PasswordVerifierBusy and answer
+# 429 with Retry-After instead of piling up behind the pool.
+#
+# A sync worker serves one request at a time, so a pool there would only add
+# processes and the cap could never trip; sync workers, flask run and the CLI
+# hash inline. Nothing here limits hashing across workers.
+#
+# Config:
+#   PASSWORD_HASH_METHOD   werkzeug method string, e.g. "scrypt:32768:8:1" or
+#                          "pbkdf2:sha256:600000". Hashes made with anything
+#                          else are transparently rehashed on the next login.
+#   PASSWORD_WORKERS       pool processes per gthread/gevent worker; 0 hashes
+#                          inline
+#   PASSWORD_QUEUE_SIZE    hashes allowed to wait for a pool process
+#   PASSWORD_VERIFY_TIMEOUT  seconds to wait for a result
+#   PASSWORD_RETRY_AFTER   seconds advertised in Retry-After
+#   SERVER_WORKER_CLASS    set from GUNICORN_WORKER_CLASS; the pool is only
+#                          used for "gthread" and "gevent"
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+from server.green import run_blocking
+
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
+POOLED_WORKER_CLASSES = ('gthread', 'gevent')
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordVerifierBusy(RuntimeError):
+    def __init__(self, retry_after):
+        super().__init__('Too many concurrent password checks, try again shortly')
+        self.retry_after = retry_after
+
+
+def hash_method():
+    if has_app_context():
+        return current_app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+    return DEFAULT_HASH_METHOD
+
+
+def hash_password(password, method=None):
+    """Hash ``password``; inside an app this goes through the capped verifier."""
+    method = method or hash_method()
+    if has_app_context():
+        return password_verifier.hash(password, method)
+    return generate_password_hash(password, method=method)
+
+
+def needs_rehash(password_hash, method=None):
+    return password_hash.split('$', 1)[0] != (method or hash_method())
+
+
+def _verify(password_hash, password, method):
+    """Worker task: check the password and rehash it if its parameters are stale."""
+    if not check_password_hash(password_hash, password):
+        return False, None
+    if needs_rehash(password_hash, method):
+        return True, generate_password_hash(password, method=method)
+    return True, None
+
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+class PasswordVerifier:
+    def __init__(self):
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self.workers = 0
+        self.green = False
+        self.timeout = 10
+        self.retry_after = 1
+        self._slots = None
+
+    def init_app(self, app):
+        worker_class = app.config.get('SERVER_WORKER_CLASS', 'sync')
+        configured = int(app.config.get('PASSWORD_WORKERS', 0))
+        self.workers = configured if worker_class in POOLED_WORKER_CLASSES else 0
+        self.green = bool(app.config.get('GREEN'))
+        queue_size = int(app.config.get('PASSWORD_QUEUE_SIZE', self.workers * 4))
+        self.timeout = float(app.config.get('PASSWORD_VERIFY_TIMEOUT', 10))
+        self.retry_after = int(app.config.get('PASSWORD_RETRY_AFTER', 1))
+        self._slots = threading.BoundedSemaphore(self.workers + queue_size) if self.workers else None
+        if configured and not self.workers:
+            logger.info("Hashing passwords inline: %s workers serve one request at a time", worker_class)
+        app.extensions['password_verifier'] = self
+
+    def _pool(self):
+        # Created lazily so every forked gunicorn worker gets its own pool
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            if self.green:
+                return run_blocking(fn, *args)
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise PasswordVerifierBusy(self.retry_after)
+        try:
+            if self.green:
+                try:
+                    return run_blocking(fn, *args, timeout=self.timeout)
+                except TimeoutError:
+                    raise PasswordVerifierBusy(self.retry_after)
+            future = self._pool().submit(fn, *args)
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeout:
+                future.cancel()
+                raise PasswordVerifierBusy(self.retry_after)
+        finally:
+            self._slots.release()
+
+    def verify(self, password_hash, password, method=None):
+        """Return ``(matches, new_hash_or_None)``; raise PasswordVerifierBusy when saturated."""
+        if not password_hash:
+            return False, None
+        return self._run(_verify, password_hash, password, method or hash_method())
+
+    def hash(self, password, method=None):
+        """Return a new hash of ``password``; raise PasswordVerifierBusy when saturated."""
+        return self._run(_hash, password, method or hash_method())
+
+
+password_verifier = PasswordVerifier()
@@ -0,0 +1,78 @@
+# Compact JWT claims and cached principal lookups.
+#
+# Tokens carry only the user id (as the JWT subject) plus role, member ids and
+# the ids of groups the user administers. Hot endpoints authorize from those
+# claims; anything that still needs the user record goes through a small
+# per-process TTL cache that write routes invalidate.
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt, get_jwt_identity
+from sqlalchemy import select
+from server.extensions import db
+from server.models.group import Group
+from server.models.member import Member
+from server.models.user import User
+from server.services.cache import TTLCache
+
+
+principal_cache = TTLCache()
+
+# Roles that may record and confirm contributions in any group
+LEDGER_ROLES = ('treasurer', 'admin', 'superadmin')
+
+
+def init_principal_cache(app):
+    principal_cache.ttl = int(app.config.get('PRINCIPAL_CACHE_TTL', 30))
+    principal_cache.maxsize = int(app.config.get('PRINCIPAL_CACHE_SIZE', 1024))
+
+
+def build_claims(user):
+    member_ids = db.session.scalars(
+        select(Member.id).where(Member.user_id == user.id).order_by(Member.id)
+    ).all()
+    admin_group_ids = db.session.scalars(
+        select(Group.id).where(Group.admin_id == user.id).order_by(Group.id)
+    ).all()
+    return {'role': user.role, 'member_ids': member_ids, 'admin_group_ids': admin_group_ids}
+
+
+def issue_tokens(user):
+    access_token = create_access_token(identity=str(user.id), additional_claims=build_claims(user))
+    refresh_token = create_refresh_token(identity=str(user.id))
+    return access_token, refresh_token
+
+
+def current_user_id():
+    return int(get_jwt_identity())
+
+
+def current_claims():
+    claims = get_jwt()
+    return {
+        'id': int(claims['sub']),
+        'role': claims.get('role'),
+        'member_ids': claims.get('member_ids', []),
+        'admin_group_ids': claims.get('admin_group_ids', []),
+    }
+
+
+def can_manage_group(group_id, claims=None):
+    """Whether the caller may move money in ``group_id``: a ledger role or the group's admin."""
+    claims = claims or current_claims()
+    return claims['role'] in LEDGER_ROLES or group_id in claims['admin_group_ids']
+
+
+def cached_user(user_id, include_sensitive=False):
+    """Serialized user dict, served from the TTL cache when fresh."""
+    key = ('user', user_id, include_sensitive)
+    data = principal_cache.get(key)
+    if data is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        data = user.serialize(include_sensitive=include_sensitive)
+        principal_cache.set(key, data)
+    return data
+
+
+def forget_user(user_id):
+    for include_sensitive in (False, True):
+        principal_cache.delete(('user', user_id, include_sensitive))
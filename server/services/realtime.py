@@ -0,0 +1,197 @@
+# Real-time pushes over Flask-SocketIO.
+#
+# Clients connect with their access token (auth={"token": ...}) and emit
+# "join_group" to subscribe to a group's room. After a commit touching
+# contributions, the room receives:
+#   contribution.created / contribution.confirmed / contribution.rejected
+#   group.balance   {"group_id", "current_amount"}
+# Balance pushes are coalesced: bursts of commits within
+# SOCKETIO_COALESCE_SECONDS produce one event per group with the latest value
+# (0 emits inline after each commit, for tests and scripts).
+import threading
+from flask import request
+from flask_jwt_extended import decode_token
+from flask_socketio import disconnect, join_room, leave_room
+from jwt.exceptions import PyJWTError
+from sqlalchemy import event, inspect, or_, select
+from sqlalchemy.orm import Session
+from server.extensions import db, socketio
+
+
+def group_room(group_id):
+    return f'group:{group_id}'
+
+
+class BalanceCoalescer:
+    def __init__(self):
+        self.app = None
+        self.window = 0.25
+        self._pending = set()
+        self._scheduled = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.window = float(app.config.get('SOCKETIO_COALESCE_SECONDS', 0.25))
+
+    def add(self, group_ids):
+        if not self.window:
+            self._emit(set(group_ids))
+            return
+        with self._lock:
+            self._pending.update(group_ids)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        socketio.start_background_task(self._flush)
+
+    def _flush(self):
+        socketio.sleep(self.window)
+        with self._lock:
+            group_ids, self._pending = self._pending, set()
+            self._scheduled = False
+        self._emit(group_ids)
+
+    def _emit(self, group_ids):
+        if not group_ids:
+            return
+
+        from server.models.group import Group
+        with self.app.app_context():
+            rows = db.session.execute(
+                select(Group.id, Group.current_amount).where(Group.id.in_(group_ids))
+            ).all()
+            db.session.remove()
+        for group_id, current_amount in rows:
+            socketio.emit('group.balance', {
+                'group_id': group_id,
+                'current_amount': float(current_amount or 0)
+            }, to=group_room(group_id))
+
+
+balance_coalescer = BalanceCoalescer()
+
+
+def _enabled():
+    return socketio.server is not None and balance_coalescer.app is not None
+
+
+def mark_balance_changed(session, group_ids):
+    session.info.setdefault('realtime_balances', set()).update(group_ids)
+
+
+def _contribution_event(contribution, name):
+    return name, {
+        'id': contribution.id,
+        'group_id': contribution.group_id,
+        'member_id': contribution.member_id,
+        'amount': float(contribution.amount or 0),
+        'status': contribution.status,
+        'created_at': contribution.created_at.isoformat() if contribution.created_at else None,
+    }
+
+
+@event.listens_for(Session, 'after_flush')
+def collect_realtime_events(session, flush_context):
+    if not _enabled():
+        return
+    from server.models.contribution import Contribution
+
+    events, groups = [], set()
+    for obj in session.new:
+        if isinstance(obj, Contribution):
+            events.append(_contribution_event(obj, 'contribution.created'))
+            groups.add(obj.group_id)
+    for obj in (*session.dirty, *session.deleted):
+        if not isinstance(obj, Contribution):
+            continue
+        status = inspect(obj).attrs.status.history
+        if obj not in session.deleted and status.has_changes() and obj.status in ('confirmed', 'rejected'):
+            events.append(_contribution_event(obj, f'contribution.{obj.status}'))
+        group_history = inspect(obj).attrs.group_id.history
+        groups.update(group_history.deleted or ())
+        groups.add(obj.group_id)
+
+    if events:
+        session.info.setdefault('realtime_events', []).extend(events)
+    if groups:
+        mark_balance_changed(session, groups)
+
+
+@event.listens_for(Session, 'after_commit')
+def publish_realtime_events(session):
+    events = session.info.pop('realtime_events', None)
+    groups = session.info.pop('realtime_balances', None)
+    if not _enabled():
+        return
+    for name, payload in events or ():
+        socketio.emit(name, payload, to=group_room(payload['group_id']))
+    if groups:
+        balance_coalescer.add(groups)
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_realtime_events(session):
+    session.info.pop('realtime_events', None)
+    session.info.pop('realtime_balances', None)
+
+
+# ── Socket handlers ─────────────────────────────
+
+_socket_users = {}
+
+
+@socketio.on('connect')
+def on_connect(auth):
+    token = (auth or {}).get('token') or request.args.get('token')
+    try:
+        claims = decode_token(token) if token else None
+    except PyJWTError:
+        claims = None
+    if not claims or claims.get('type') != 'access':
+        return False
+    from server.services.token_blocklist import token_blocklist
+    if token_blocklist.is_revoked(claims):
+        return False
+    _socket_users[request.sid] = int(claims['sub'])
+
+
+@socketio.on('disconnect')
+def on_disconnect(*args):
+    _socket_users.pop(request.sid, None)
+
+
+def _can_watch(user_id, group_id):
+    from server.models.group import Group
+    from server.models.member import Member
+    member = select(Member.id).where(Member.group_id == group_id, Member.user_id == user_id).exists()
+    return db.session.scalar(
+        select(Group.id).where(
+            Group.id == group_id,
+            or_(Group.is_public.is_(True), Group.admin_id == user_id, member)
+        )
+    ) is not None
+
+
+@socketio.on('join_group')
+def on_join_group(data):
+    user_id = _socket_users.get(request.sid)
+    if user_id is None:
+        disconnect()
+        return
+    try:
+        group_id = int((data or {}).get('group_id'))
+    except (TypeError, ValueError):
+        return {'error': 'group_id is required'}
+    if not _can_watch(user_id, group_id):
+        return {'error': 'Not allowed to watch this group'}
+    join_room(group_room(group_id))
+    return {'joined': group_id}
+
+
+@socketio.on('leave_group')
+def on_leave_group(data):
+    try:
+        leave_room(group_room(int((data or {}).get('group_id'))))
+    except (TypeError, ValueError):
+        disconnect()
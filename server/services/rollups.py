@@ -0,0 +1,82 @@
+# Contribution time series from the contribution_rollups table.
+#
+# Rollups hold one row per (group, member, day); weekly and monthly buckets
+# are grouped in SQL, so a year of history is at most a few hundred rows
+# whatever the ledger size. Only buckets with confirmed contributions are
+# returned.
+import math
+from datetime import date
+from sqlalchemy import Date, cast, func, select
+from server.extensions import db
+from server.models.contribution_rollup import ContributionRollup
+
+INTERVALS = ('day', 'week', 'month')
+MAX_POINTS_LIMIT = 1000
+
+
+def bucket_expression(column, interval, dialect):
+    """SQL expression truncating a date ``column`` to the start of its day, ISO week or month."""
+    if interval == 'day':
+        return column
+    if dialect == 'sqlite':
+        if interval == 'week':
+            # Back up six days, then forward to the next Monday: the Monday on or before
+            return func.date(column, '-6 days', 'weekday 1')
+        return func.date(column, 'start of month')
+    return cast(func.date_trunc(interval, column), Date)
+
+
+def parse_series_args(args):
+    """Validate interval/from/to/max_points query arguments; raise ValueError on bad input."""
+    interval = args.get('interval', 'day')
+    if interval not in INTERVALS:
+        raise ValueError(f"interval must be one of: {', '.join(INTERVALS)}")
+    try:
+        start = date.fromisoformat(args['from']) if args.get('from') else None
+        end = date.fromisoformat(args['to']) if args.get('to') else None
+    except ValueError:
+        raise ValueError('from and to must be ISO dates (YYYY-MM-DD)')
+    max_points = args.get('max_points')
+    if max_points is not None:
+        try:
+            max_points = int(max_points)
+        except ValueError:
+            raise ValueError('max_points must be an integer')
+        if not 1 <= max_points <= MAX_POINTS_LIMIT:
+            raise ValueError(f'max_points must be between 1 and {MAX_POINTS_LIMIT}')
+    return {'interval': interval, 'start': start, 'end': end, 'max_points': max_points}
+
+
+def downsample(points, max_points):
+    """Merge runs of consecutive buckets so at most ``max_points`` remain; sums and counts are preserved."""
+    if not max_points or len(points) <= max_points:
+        return points
+    size = math.ceil(len(points) / max_points)
+    merged = []
+    for index in range(0, len(points), size):
+        run = points[index:index + size]
+        merged.append([run[0][0], sum(point[1] for point in run), sum(point[2] for point in run)])
+    return merged
+
+
+def contribution_series(group_id=None, member_id=None, interval='day', start=None, end=None, max_points=None):
+    """Return ``[[bucket_start, confirmed_sum, confirmed_count], ...]`` ordered by bucket."""
+    rollups = ContributionRollup.__table__
+    bucket = bucket_expression(rollups.c.day, interval, db.session.get_bind().dialect.name).label('bucket')
+    query = (
+        select(bucket, func.sum(rollups.c.confirmed_sum), func.sum(rollups.c.confirmed_count))
+        .group_by(bucket)
+        .having(func.sum(rollups.c.confirmed_count) > 0)
+        .order_by(bucket)
+    )
+    if group_id is not None:
+        query = query.where(rollups.c.group_id == group_id)
+    if member_id is not None:
+        query = query.where(rollups.c.member_id == member_id)
+    if start is not None:
+        query = query.where(rollups.c.day >= start)
+    if end is not None:
+        query = query.where(rollups.c.day <= end)
+
+    points = [[str(day), total or 0, int(count or 0)] for day, total, count in db.session.execute(query)]
+    return [[day, round(float(total), 2), count] for day, total, count in downsample(points, max_points)]
@@ -0,0 +1,81 @@
+# Set-based recomputation of member_stats.score, the one stored score that
+# Member.serialize() reports as contribution_score.
+#
+# The score is the member's confirmed contribution count. It is kept up to
+# date incrementally by apply_member_stats_delta(); this job repairs drift.
+# Members with no member_stats row have no confirmed contributions and a
+# score of 0, so only existing rows are rewritten. Groups are walked
+# in id order, chunk_size at a time; each chunk is one UPDATE ... FROM over a
+# GROUP BY subquery and its own short transaction, so a platform-wide run
+# never holds locks on more than one chunk of members. Rows whose score is
+# already correct are not rewritten.
+import logging
+from sqlalchemy import and_, func, select
+from server.extensions import db
+from server.models.contribution import Contribution
+from server.models.group import Group
+from server.models.member import Member
+from server.models.member_stats import MemberStats
+from server.services.jobs import job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def scores_select(first_group_id, last_group_id):
+    """Confirmed contribution count for every member of groups in the id range."""
+    return (
+        select(MemberStats.member_id, func.count(Contribution.id).label('score'))
+        .join(Member, Member.id == MemberStats.member_id)
+        .outerjoin(Contribution, and_(Contribution.member_id == MemberStats.member_id,
+                                      Contribution.status == 'confirmed'))
+        .where(Member.group_id.between(first_group_id, last_group_id))
+        .group_by(MemberStats.member_id)
+    )
+
+
+def recompute_group_scores(first_group_id, last_group_id):
+    """Rewrite drifted scores for members of groups in the id range; returns rows changed."""
+    scores = scores_select(first_group_id, last_group_id).subquery()
+    stats = MemberStats.__table__
+    result = db.session.execute(
+        stats.update()
+        .where(stats.c.member_id == scores.c.member_id)
+        .where(stats.c.score != scores.c.score)
+        .values(score=scores.c.score)
+    )
+    return result.rowcount
+
+
+def recompute_contribution_scores(chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Recompute every member's score, chunk_size groups per transaction.
+
+    ``progress(groups_done, groups_total, rows_changed)`` is called after each chunk.
+    Returns the total number of member rows changed.
+    """
+    total_groups = db.session.scalar(select(func.count(Group.id)))
+    done = changed = 0
+    last_id = 0
+    while True:
+        group_ids = db.session.scalars(
+            select(Group.id).where(Group.id > last_id).order_by(Group.id).limit(chunk_size)
+        ).all()
+        if not group_ids:
+            break
+        changed += recompute_group_scores(group_ids[0], group_ids[-1])
+        db.session.commit()
+        done += len(group_ids)
+        last_id = group_ids[-1]
+        if progress is not None:
+            progress(done, total_groups, changed)
+    return changed
+
+
+@job('members.recompute_scores')
+def recompute_scores_job(chunk_size=DEFAULT_CHUNK_SIZE):
+    def report(done, total, changed):
+        logger.info("Contribution scores: %s/%s groups, %s member(s) updated", done, total, changed)
+
+    changed = recompute_contribution_scores(chunk_size, progress=report)
+    logger.info("Contribution score recompute finished: %s member(s) updated", changed)
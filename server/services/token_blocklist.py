@@ -0,0 +1,141 @@
+# Revoked-token store consulted by flask_jwt_extended on every protected
+# request, so the check must stay O(1) and never touch the database.
+#
+# JWT_BLOCKLIST_URL unset   -> MemoryBlocklist (single process only): a bloom
+#                              filter answers "definitely not revoked" for
+#                              almost every request; only possible hits go
+#                              to an exact map of jti -> expiry. Refused when
+#                              WEB_CONCURRENCY > 1, since other workers would
+#                              keep accepting the token.
+# JWT_BLOCKLIST_URL=redis:// -> RedisBlocklist, shared by every worker. Any
+#                              Redis-protocol client works (fakeredis in tests).
+#
+# Entries expire with the token they revoke, and never before: a revocation
+# dropped early would make a logged-out token valid again.
+import hashlib
+import heapq
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, size_bits=1 << 20, hashes=4):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self._bits = bytearray(size_bits // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.hashes).digest()
+        for i in range(self.hashes):
+            yield int.from_bytes(digest[4 * i:4 * i + 4], 'big') % self.size_bits
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def clear(self):
+        self._bits = bytearray(self.size_bits // 8)
+
+
+class MemoryBlocklist:
+    def __init__(self, maxsize=100000, bloom_bits=1 << 20):
+        # maxsize is a warning threshold, not a cap; live entries are never evicted
+        self.maxsize = maxsize
+        self._bloom = BloomFilter(bloom_bits)
+        self._entries = {}
+        self._expiry_heap = []
+        self._lock = threading.Lock()
+        self._expired_since_rebuild = 0
+
+    def revoke(self, jti, expires_at):
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._sweep_expired()
+            self._entries[jti] = max(expires_at, self._entries.get(jti, 0))
+            heapq.heappush(self._expiry_heap, (expires_at, jti))
+            self._bloom.add(jti)
+            if len(self._entries) > self.maxsize:
+                logger.warning("Token blocklist holds %s live revocations (JWT_BLOCKLIST_SIZE %s); "
+                               "consider JWT_BLOCKLIST_URL", len(self._entries), self.maxsize)
+
+    def is_revoked(self, jti):
+        if jti not in self._bloom:
+            return False
+        with self._lock:
+            expires_at = self._entries.get(jti)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                self._sweep_expired()
+                return False
+            return True
+
+    def _sweep_expired(self):
+        now = time.time()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._expiry_heap)
+            if self._entries.get(jti, now + 1) <= now:
+                del self._entries[jti]
+                self._expired_since_rebuild += 1
+        # Bloom filters can't delete; rebuild once enough entries have expired
+        if self._expired_since_rebuild >= max(1000, len(self._entries)):
+            self._bloom.clear()
+            for jti in self._entries:
+                self._bloom.add(jti)
+            self._expired_since_rebuild = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBlocklist:
+    def __init__(self, client, prefix='chama:revoked:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url):
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def revoke(self, jti, expires_at):
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            self.client.set(self.prefix + jti, 1, ex=ttl)
+
+    def is_revoked(self, jti):
+        return bool(self.client.exists(self.prefix + jti))
+
+
+class TokenBlocklist:
+    """Proxy to the configured store so the JWT callback can be registered at import time."""
+
+    def __init__(self):
+        self.store = MemoryBlocklist()
+
+    def init_app(self, app):
+        url = app.config.get('JWT_BLOCKLIST_URL')
+        if url:
+            self.store = RedisBlocklist.from_url(url)
+        elif int(app.config.get('WEB_CONCURRENCY', 1)) > 1:
+            raise RuntimeError('JWT_BLOCKLIST_URL is required when running more than one worker; '
+                               'an in-process blocklist would not see revocations from other workers')
+        else:
+            self.store = MemoryBlocklist(maxsize=int(app.config.get('JWT_BLOCKLIST_SIZE', 100000)))
+        app.extensions['token_blocklist'] = self
+
+    def revoke(self, payload):
+        self.store.revoke(payload['jti'], payload.get('exp', time.time() + 86400))
+
+    def is_revoked(self, payload):
+        return self.store.is_revoked(payload['jti'])
+
+
+token_blocklist = TokenBlocklist()
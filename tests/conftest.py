@@ -0,0 +1,143 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings every test app starts from; a test can override any of them
+TEST_ENV = {
+    'JOBS_WORKERS': '0',
+    'PASSWORD_WORKERS': '0',
+    'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+    'RESPONSE_CACHE_TTL': '0',
+    'SOCKETIO_ASYNC_MODE': 'threading',
+    'SOCKETIO_COALESCE_SECONDS': '0',
+    'LOG_LEVEL': 'WARNING',
+    'JWT_SECRET_KEY': 'test-jwt-secret',
+}
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Build an app on a fresh SQLite file; keyword arguments override env settings.
+
+    ``create_tables=False`` leaves the schema to the test (e.g. to run migrations).
+    """
+    from server.extensions import db
+
+    apps = []
+
+    def factory(database_url=None, create_tables=True, **env):
+        for key in ('DATABASE_REPLICA_URL', 'RESPONSE_CACHE_URL', 'JWT_BLOCKLIST_URL', 'IDEMPOTENCY_URL'):
+            monkeypatch.delenv(key, raising=False)
+        settings = {**TEST_ENV, **env}
+        settings['DATABASE_URL'] = database_url or f"sqlite:///{tmp_path / f'app{len(apps)}.db'}"
+        for key, value in settings.items():
+            monkeypatch.setenv(key, str(value))
+
+        from server.app import create_app
+        app = create_app()
+        app.config['TESTING'] = True
+        if create_tables:
+            with app.app_context():
+                db.create_all()
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            if db.engine.dialect.name != 'sqlite':
+                db.drop_all()
+            for engine in db.engines.values():
+                engine.dispose()
+    # init_app() registers a metadata per configured bind on the shared extension;
+    # drop them so a later app without that bind can still create_all()
+    for key in [key for key in db.metadatas if key is not None]:
+        del db.metadatas[key]
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def database_url(request, tmp_path):
+    """Run a test on SQLite and, when TEST_POSTGRES_URL is set, on Postgres too."""
+    if request.param == 'postgresql':
+        url = os.getenv('TEST_POSTGRES_URL')
+        if not url:
+            pytest.skip('TEST_POSTGRES_URL is not set')
+        return url
+    # Concurrent tests wait on SQLite's write lock instead of failing at once
+    return f"sqlite:///{tmp_path / 'shared.db'}?timeout=30"
+
+
+@pytest.fixture
+def shared_redis(monkeypatch):
+    """Back every *_URL Redis store with one in-memory server, as several workers would share."""
+    import fakeredis
+    from server.services.cache import RedisBackend
+    from server.services.idempotency import RedisIdempotencyStore
+    from server.services.token_blocklist import RedisBlocklist
+
+    fake = fakeredis.FakeRedis()
+    monkeypatch.setattr(RedisBlocklist, 'from_url', classmethod(lambda cls, url: cls(fake)))
+    monkeypatch.setattr(RedisBackend, 'from_url', classmethod(lambda cls, url, ttl: cls(fake, ttl)))
+    monkeypatch.setattr(RedisIdempotencyStore, 'from_url', classmethod(lambda cls, url, ttl: cls(fake, ttl)))
+    return fake
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def auth_headers(user):
+    from server.services.principal import issue_tokens
+
+    access_token, _ = issue_tokens(user)
+    return {'Authorization': f'Bearer {access_token}'}
+
+
+def seed_ledger():
+    """Two groups of three active members, each with two confirmed and one pending contribution."""
+    from server.extensions import db
+    from server.models import Contribution, Group, Member, User
+
+    users = [User(username=f'user{i}', email=f'user{i}@chama.test', password='password123') for i in range(4)]
+    users[0].role = 'admin'
+    db.session.add_all(users)
+    db.session.commit()
+
+    groups = [Group(name=f'Group {i}', admin_id=users[0].id, target_amount=1000) for i in range(2)]
+    db.session.add_all(groups)
+    db.session.commit()
+
+    members = []
+    for group in groups:
+        for user in users[1:]:
+            member = Member(user_id=user.id, group_id=group.id, status='active')
+            db.session.add(member)
+            members.append(member)
+    db.session.commit()
+
+    receipt = 0
+    for member in members:
+        for status in ('confirmed', 'confirmed', 'pending'):
+            receipt += 1
+            db.session.add(Contribution(
+                member_id=member.id, group_id=member.group_id, amount=100, status=status,
+                receipt_number=f'R{receipt}'
+            ))
+    db.session.commit()
+    return {'users': users, 'groups': groups, 'members': members, 'headers': auth_headers(users[0])}
+
+
+@pytest.fixture
+def ledger(app):
+    return seed_ledger()
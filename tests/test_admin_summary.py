@@ -0,0 +1,18 @@
+from server.services.admin_summary import summary_cache
+from tests.conftest import auth_headers, seed_ledger
+
+
+def test_summary_counts_are_scalars_with_a_status_breakdown(client, app):
+    data = seed_ledger()
+    summary_cache.clear()
+    body = client.get('/api/admin/summary', headers=data['headers']).get_json()
+    assert body['mode'] == 'exact'
+    assert (body['users'], body['groups'], body['members'], body['active_members']) == (4, 2, 6, 6)
+    assert body['contributions'] == 18
+    assert body['contributions_by_status'] == {'pending': 6, 'confirmed': 12, 'rejected': 0}
+    assert body['confirmed_total'] == 1200.0
+
+
+def test_summary_is_for_admins_only(client, app):
+    data = seed_ledger()
+    assert client.get('/api/admin/summary', headers=auth_headers(data['users'][1])).status_code == 403
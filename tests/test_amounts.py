@@ -0,0 +1,92 @@
+from decimal import Decimal
+import pytest
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import text
+from server.extensions import db
+from server.models import Contribution, Group
+from server.models.contribution import MAX_AMOUNT, parse_amount
+from tests.conftest import seed_ledger
+from tests.test_migrations import MIGRATIONS
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('10', Decimal('10.00')),
+    (1.5, Decimal('1.50')),
+    (' 0.10 ', Decimal('0.10')),
+    ('9999999999.99', MAX_AMOUNT),
+])
+def test_parse_amount_accepts_two_place_positive_values(value, expected):
+    assert parse_amount(value) == expected
+
+
+@pytest.mark.parametrize('value', [
+    '0', '-5', 'abc', None, 'NaN', 'Infinity', '0.001', '1e-30',
+    '1e30', '12345678901.00', '10000000000',
+])
+def test_parse_amount_rejects_with_value_error(value):
+    with pytest.raises(ValueError):
+        parse_amount(value)
+
+
+@pytest.mark.parametrize('amount', ['1e30', '12345678901.00', '0.001'])
+def test_api_rejects_out_of_range_amounts(client, amount):
+    data = seed_ledger()
+    member = data['members'][0]
+    payload = {'member_id': member.id, 'group_id': member.group_id, 'amount': amount}
+    assert client.post('/api/contributions/', json=payload, headers=data['headers']).status_code == 400
+
+    contribution = member.contributions[0]
+    assert client.put(f'/api/contributions/{contribution.id}', json={'amount': amount}).status_code == 400
+
+
+def test_cents_add_up_exactly(app):
+    data = seed_ledger()
+    member = data['members'][0]
+    group = db.session.get(Group, member.group_id)
+    before = group.current_amount
+    for _ in range(10):
+        db.session.add(Contribution(member.id, member.group_id, '0.10', status='confirmed'))
+    db.session.commit()
+    db.session.refresh(group)
+    assert group.current_amount == before + Decimal('1.00')
+
+
+FLOAT_REVISION = 'e3a8c5f20d14'
+NUMERIC_REVISION = 'f7b2d9e4a6c1'
+
+
+def amounts():
+    return db.session.execute(text('SELECT amount FROM contributions ORDER BY id')).scalars().all()
+
+
+def test_float_amounts_migrate_to_cents_and_back(make_app):
+    app = make_app(create_tables=False)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS, revision=FLOAT_REVISION)
+        db.session.execute(text(
+            "INSERT INTO users (id, username, email, password_hash, role, is_active, is_verified) "
+            "VALUES (1, 'old', 'old@chama.test', 'x', 'member', 1, 0)"
+        ))
+        db.session.execute(text(
+            "INSERT INTO groups (id, name, target_amount, current_amount, is_public, admin_id, status) "
+            "VALUES (1, 'Old Group', 1000, 0, 1, 1, 'active')"
+        ))
+        db.session.execute(text(
+            "INSERT INTO members (id, user_id, group_id, join_date, status, is_admin) "
+            "VALUES (1, 1, 1, CURRENT_TIMESTAMP, 'active', 0)"
+        ))
+        for amount in (0.1, 0.2, 19.99, 100.0):
+            db.session.execute(text(
+                "INSERT INTO contributions (member_id, group_id, amount, created_at, status) "
+                "VALUES (1, 1, :amount, CURRENT_TIMESTAMP, 'confirmed')"
+            ), {'amount': amount})
+        db.session.commit()
+
+        upgrade(directory=MIGRATIONS, revision=NUMERIC_REVISION)
+        assert db.session.scalars(db.select(Contribution.amount).order_by(Contribution.id)).all() == [
+            Decimal('0.10'), Decimal('0.20'), Decimal('19.99'), Decimal('100.00')
+        ]
+        db.session.commit()
+
+        downgrade(directory=MIGRATIONS, revision=FLOAT_REVISION)
+        assert amounts() == [0.1, 0.2, 19.99, 100.0]
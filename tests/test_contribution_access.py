@@ -0,0 +1,60 @@
+import pytest
+from server.extensions import db
+from server.models import Contribution, Group
+from tests.conftest import auth_headers, seed_ledger
+
+
+@pytest.fixture
+def ledger_roles(app):
+    data = seed_ledger()
+    member = data['members'][0]
+    own = next(c for c in member.contributions if c.status == 'pending')
+    return {
+        **data,
+        'member': member,
+        'pending_id': own.id,
+        'member_headers': auth_headers(member.user),
+    }
+
+
+@pytest.mark.parametrize('action', ['confirm', 'reject'])
+def test_status_changes_require_a_token(client, ledger_roles, action):
+    assert client.post(f"/api/contributions/{ledger_roles['pending_id']}/{action}").status_code == 401
+
+
+@pytest.mark.parametrize('action', ['confirm', 'reject'])
+def test_members_cannot_move_money(client, ledger_roles, action):
+    response = client.post(f"/api/contributions/{ledger_roles['pending_id']}/{action}",
+                           headers=ledger_roles['member_headers'])
+    assert response.status_code == 403
+    assert db.session.get(Contribution, ledger_roles['pending_id']).status == 'pending'
+
+
+def test_group_admin_can_confirm(client, ledger_roles):
+    admin = ledger_roles['users'][1]
+    db.session.execute(db.update(Group).where(Group.id == ledger_roles['member'].group_id).values(admin_id=admin.id))
+    db.session.commit()
+    response = client.post(f"/api/contributions/{ledger_roles['pending_id']}/confirm", headers=auth_headers(admin))
+    assert response.status_code == 200
+
+
+def test_member_records_only_their_own_pending_contribution(client, ledger_roles):
+    member = ledger_roles['member']
+    headers = ledger_roles['member_headers']
+    own = {'member_id': member.id, 'group_id': member.group_id, 'amount': 50}
+    assert client.post('/api/contributions/', json=own, headers=headers).status_code == 201
+    assert client.post('/api/contributions/', json={**own, 'status': 'confirmed'}, headers=headers).status_code == 403
+
+    someone_else = next(m for m in ledger_roles['members'] if m.user_id != member.user_id)
+    other = {'member_id': someone_else.id, 'group_id': someone_else.group_id, 'amount': 50}
+    assert client.post('/api/contributions/', json=other, headers=headers).status_code == 403
+    assert client.post('/api/contributions/', json=own).status_code == 401
+
+
+def test_bulk_import_is_limited_to_managed_groups(client, ledger_roles):
+    member = ledger_roles['member']
+    rows = [{'member_id': member.id, 'group_id': member.group_id, 'amount': 10, 'status': 'confirmed'}]
+    response = client.post('/api/contributions/bulk', json=rows, headers=ledger_roles['member_headers'])
+    assert response.status_code == 403
+    assert response.get_json()['group_ids'] == [member.group_id]
+    assert client.post('/api/contributions/bulk', json=rows, headers=ledger_roles['headers']).status_code == 201
@@ -0,0 +1,100 @@
+import io
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from server.extensions import db
+from server.models import Contribution, Group, MemberStats
+from server.services.balances import find_balance_drift
+from tests.conftest import seed_ledger
+
+
+@pytest.fixture
+def importer(app, client):
+    data = seed_ledger()
+    member = data['members'][0]
+
+    def post(rows=None, **kwargs):
+        if rows is not None:
+            kwargs['json'] = rows
+        return client.post('/api/contributions/bulk', headers=data['headers'], **kwargs)
+
+    def row(**fields):
+        return {'member_id': member.id, 'group_id': member.group_id, 'amount': '10', **fields}
+
+    return post, row, member
+
+
+def receipt_row(receipt):
+    return db.session.scalars(db.select(Contribution).where(Contribution.receipt_number == receipt)).one()
+
+
+def test_bad_rows_are_reported_without_failing_the_batch(importer):
+    post, row, _ = importer
+    response = post([
+        row(receipt_number='OK-1'),
+        row(amount='1e30'),
+        row(amount='12345678901.00'),
+        row(note='x' * 256),
+        row(receipt_number='R' * 51),
+        row(status=['confirmed']),
+        row(created_at=12),
+        row(created_at='yesterday'),
+        row(member_id=2 ** 40),
+        row(group_id='abc'),
+        'not an object',
+    ])
+    assert response.status_code == 201, response.get_json()
+    body = response.get_json()
+    assert body['inserted'] == 1
+    assert [error['row'] for error in body['errors']] == list(range(1, 11))
+
+
+def test_numeric_receipt_numbers_are_stored_as_text(importer):
+    post, row, _ = importer
+    assert post([row(receipt_number=12345)]).get_json() == {'inserted': 1, 'errors': []}
+    assert receipt_row('12345').amount == Decimal('10.00')
+
+
+def test_mixed_naive_and_aware_timestamps_are_stored_as_utc(importer):
+    post, row, member = importer
+    response = post([
+        row(status='confirmed', receipt_number='NAIVE', created_at='2030-03-01T10:00:00'),
+        row(status='confirmed', receipt_number='AWARE', created_at='2030-03-01T12:00:00+03:00'),
+        row(status='confirmed', receipt_number='ZULU', created_at='2030-03-02T08:00:00Z'),
+    ])
+    assert response.get_json() == {'inserted': 3, 'errors': []}
+    assert receipt_row('AWARE').created_at == datetime(2030, 3, 1, 9, 0)
+    stats = db.session.get(MemberStats, member.id)
+    db.session.refresh(stats)
+    assert stats.last_contribution_at == datetime(2030, 3, 2, 8, 0)
+    assert find_balance_drift() == []
+
+
+def test_duplicates_and_strangers_are_row_errors(importer):
+    post, row, member = importer
+    stranger = next(m for m in db.session.scalars(db.select(type(member))) if m.group_id != member.group_id)
+    response = post([
+        row(receipt_number='R1'),              # already in the ledger
+        row(receipt_number='NEW'),
+        row(receipt_number='NEW'),             # repeated in the batch
+        row(member_id=stranger.id),            # member of another group
+    ])
+    body = response.get_json()
+    assert body['inserted'] == 1
+    assert [error['row'] for error in body['errors']] == [0, 2, 3]
+
+
+def test_csv_upload_updates_balances(importer):
+    post, _, member = importer
+    group = db.session.get(Group, member.group_id)
+    before = group.current_amount
+    csv = (
+        'member_id,group_id,amount,status,receipt_number\n'
+        f'{member.id},{member.group_id},25.50,confirmed,CSV-1\n'
+        f'{member.id},{member.group_id},oops,confirmed,CSV-2\n'
+    )
+    response = post(data={'file': (io.BytesIO(csv.encode()), 'statement.csv')})
+    assert response.get_json()['inserted'] == 1
+    db.session.refresh(group)
+    assert group.current_amount == before + Decimal('25.50')
+    assert find_balance_drift() == []
@@ -0,0 +1,28 @@
+from server.extensions import db
+from server.models import Contribution
+from server.services.pagination import DEFAULT_PAGE_SIZE
+
+
+def test_listing_without_paging_args_returns_a_bounded_page(client, ledger):
+    member = ledger['members'][0]
+    db.session.add_all([
+        Contribution(member_id=member.id, group_id=member.group_id, amount=10, receipt_number=f'P{i}')
+        for i in range(DEFAULT_PAGE_SIZE)
+    ])
+    db.session.commit()
+
+    body = client.get('/api/contributions/').get_json()
+    assert len(body['items']) == DEFAULT_PAGE_SIZE
+    assert body['next_cursor']
+
+
+def test_cursor_walks_every_row_once(client, ledger):
+    seen, cursor = [], None
+    while True:
+        query = {'limit': 5, **({'cursor': cursor} if cursor else {})}
+        body = client.get('/api/contributions/', query_string=query).get_json()
+        seen += [item['id'] for item in body['items']]
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(db.session.scalars(db.select(Contribution.id)).all())
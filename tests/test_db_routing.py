@@ -0,0 +1,143 @@
+import sqlite3
+import time
+import pytest
+from server.db_routing import PRIMARY_HEADER, REPLICA_BIND
+from server.extensions import db
+from server.models import Group, User
+from server.query_budget import assert_max_queries
+from tests.conftest import auth_headers, seed_ledger
+
+
+@pytest.fixture
+def instances(make_app, tmp_path):
+    """Two app instances (as two workers would be) sharing one primary and one replica."""
+    urls = {
+        'database_url': f"sqlite:///{tmp_path / 'primary.db'}",
+        'DATABASE_REPLICA_URL': f"sqlite:///{tmp_path / 'replica.db'}",
+    }
+    first, second = make_app(**urls), make_app(**urls)
+    with first.app_context():
+        db.metadata.create_all(db.engines[REPLICA_BIND])
+        user = User(username='writer', email='writer@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        headers = auth_headers(user)
+        # Stands in for a replica that lags behind the primary
+        replica = db.engines[REPLICA_BIND]
+        with replica.begin() as conn:
+            conn.execute(db.insert(Group).values(name='replica only', target_amount=1, admin_id=user.id))
+    return first.test_client(), second.test_client(), headers
+
+
+def group_names(client, **headers):
+    return {group['name'] for group in client.get('/api/groups/', headers=headers).get_json()}
+
+
+def test_reads_go_to_the_replica(instances):
+    first, second, _ = instances
+    assert group_names(first) == {'replica only'}
+    assert group_names(second) == {'replica only'}
+
+
+def test_write_pins_reads_on_another_instance(instances):
+    first, second, headers = instances
+    response = first.post('/api/groups/', json={'name': 'fresh', 'target_amount': 100}, headers=headers)
+    assert response.status_code == 201
+    until = response.headers[PRIMARY_HEADER]
+
+    # The replica has not caught up, so only a pinned read sees the new group
+    assert 'fresh' not in group_names(second)
+    assert 'fresh' in group_names(second, **{PRIMARY_HEADER: until})
+
+
+def test_reads_do_not_set_the_header(instances):
+    first, _, _ = instances
+    assert PRIMARY_HEADER not in first.get('/api/groups/').headers
+
+
+@pytest.mark.parametrize('until', [
+    lambda: time.time() - 1,        # expired
+    lambda: time.time() + 3600,     # further out than the server ever issues
+    lambda: 'soon',
+])
+def test_stale_or_forged_header_is_ignored(instances, until):
+    first, second, headers = instances
+    assert first.post('/api/groups/', json={'name': 'fresh', 'target_amount': 100}, headers=headers).status_code == 201
+    assert 'fresh' not in group_names(second, **{PRIMARY_HEADER: str(until())})
+
+
+def test_header_crosses_origins(make_app, tmp_path):
+    origin = 'https://frontend.example.com'
+    app = make_app(FRONTEND_ORIGIN=origin, DATABASE_REPLICA_URL=f"sqlite:///{tmp_path / 'replica.db'}")
+    client = app.test_client()
+    preflight = client.options('/api/groups/', headers={
+        'Origin': origin,
+        'Access-Control-Request-Method': 'GET',
+        'Access-Control-Request-Headers': PRIMARY_HEADER,
+    })
+    assert PRIMARY_HEADER.lower() in preflight.headers['Access-Control-Allow-Headers'].lower()
+    response = client.get('/api/groups/', headers={'Origin': origin})
+    assert PRIMARY_HEADER.lower() in response.headers['Access-Control-Expose-Headers'].lower()
+
+
+@pytest.fixture
+def cached_replica(make_app, tmp_path):
+    """A cached app whose replica only catches up when the test calls ``replicate()``."""
+    primary, replica = tmp_path / 'primary.db', tmp_path / 'replica.db'
+    app = make_app(database_url=f'sqlite:///{primary}', DATABASE_REPLICA_URL=f'sqlite:///{replica}',
+                   RESPONSE_CACHE_TTL=60, DB_REPLICA_STICKY_SECONDS=1)
+
+    def replicate():
+        with sqlite3.connect(primary) as source, sqlite3.connect(replica) as target:
+            source.backup(target)
+
+    with app.app_context():
+        data = seed_ledger()
+        replicate()
+        group = data['groups'][0]
+        pending = next(c for c in group.contributions if c.status == 'pending')
+        ids = {'group': group.id, 'pending': pending.id, 'headers': data['headers']}
+    # Requests run outside the test's app context, so g does not carry a pin between them
+    yield app.test_client(), ids, replicate
+
+
+def test_cache_is_not_filled_from_a_lagging_replica(cached_replica):
+    client, ids, replicate = cached_replica
+    url = f"/api/groups/{ids['group']}"
+    before = client.get(url).get_json()['current_amount']
+
+    confirm = client.post(f"/api/contributions/{ids['pending']}/confirm", headers=ids['headers'])
+    assert confirm.status_code == 200
+    pin = {PRIMARY_HEADER: confirm.headers[PRIMARY_HEADER]}
+
+    # The writer reads its own write, bypassing the cache
+    assert client.get(url, headers=pin).get_json()['current_amount'] == before + 100
+    # Other clients may see the lagging replica, but that answer is not cached
+    assert client.get(url).get_json()['current_amount'] == before
+    replicate()
+    assert client.get(url).get_json()['current_amount'] == before + 100
+
+
+def test_cache_fills_again_once_the_replica_has_caught_up(cached_replica):
+    client, ids, replicate = cached_replica
+    url = f"/api/groups/{ids['group']}"
+    assert client.post(f"/api/contributions/{ids['pending']}/confirm", headers=ids['headers']).status_code == 200
+    replicate()
+
+    time.sleep(1.1)
+    expected = client.get(url).get_json()
+    with assert_max_queries(0):
+        assert client.get(url).get_json() == expected
+
+
+def test_pinned_reads_bypass_the_cache(cached_replica):
+    client, ids, _ = cached_replica
+    url = f"/api/groups/{ids['group']}"
+    time.sleep(1.1)
+    client.get(url)
+    with assert_max_queries(0):
+        client.get(url)
+    pin = {PRIMARY_HEADER: str(time.time() + 0.5)}
+    with assert_max_queries(1) as statements:
+        client.get(url, headers=pin)
+    assert statements
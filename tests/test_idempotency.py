@@ -0,0 +1,86 @@
+import pytest
+from server.extensions import db
+from server.models import Contribution
+from server.services.idempotency import HEADER, idempotent
+from tests.conftest import auth_headers, seed_ledger
+
+
+def pending_contribution():
+    return db.session.scalars(db.select(Contribution).where(Contribution.status == 'pending')).first()
+
+
+def test_retry_after_lock_conflict_runs_again(app, client, monkeypatch):
+    data = seed_ledger()
+    contribution_id = pending_contribution().id
+    headers = {**data['headers'], HEADER: 'confirm-once'}
+
+    original = Contribution.confirm
+
+    def confirm_while_another_request_commits(self):
+        # Another request bumps the row version between our read and our commit
+        monkeypatch.setattr(Contribution, 'confirm', original)
+        with db.engine.begin() as conn:
+            conn.execute(db.update(Contribution).where(Contribution.id == self.id)
+                         .values(version_id=Contribution.version_id + 1))
+        original(self)
+
+    monkeypatch.setattr(Contribution, 'confirm', confirm_while_another_request_commits)
+    conflict = client.post(f'/api/contributions/{contribution_id}/confirm', headers=headers)
+    assert conflict.status_code == 409
+
+    retry = client.post(f'/api/contributions/{contribution_id}/confirm', headers=headers)
+    assert retry.status_code == 200
+    assert 'Idempotent-Replayed' not in retry.headers
+    assert retry.get_json()['status'] == 'confirmed'
+
+    replay = client.post(f'/api/contributions/{contribution_id}/confirm', headers=headers)
+    assert replay.headers['Idempotent-Replayed'] == 'true'
+    assert replay.get_json() == retry.get_json()
+
+
+def test_throttled_response_is_not_stored(app, client):
+    calls = []
+
+    @app.route('/api/throttled', methods=['POST'])
+    @idempotent
+    def throttled():
+        calls.append(1)
+        return ({'error': 'busy'}, 429) if len(calls) == 1 else ({'ok': True}, 200)
+
+    headers = {HEADER: 'throttle-once'}
+    assert client.post('/api/throttled', headers=headers).status_code == 429
+    assert client.post('/api/throttled', headers=headers).status_code == 200
+    assert len(calls) == 2
+
+
+def test_memory_store_is_refused_with_several_workers(make_app, shared_redis):
+    with pytest.raises(RuntimeError, match='IDEMPOTENCY_URL'):
+        make_app(WEB_CONCURRENCY=3, JWT_BLOCKLIST_URL='redis://fake')
+
+
+def test_shared_store_serves_retries_across_workers(make_app, shared_redis, tmp_path):
+    settings = {'database_url': f"sqlite:///{tmp_path / 'shared.db'}", 'WEB_CONCURRENCY': 2,
+                'JWT_BLOCKLIST_URL': 'redis://fake', 'IDEMPOTENCY_URL': 'redis://fake'}
+    first, second = make_app(**settings), make_app(**settings)
+    with first.app_context():
+        data = seed_ledger()
+        member = data['members'][0]
+        payload = {'member_id': member.id, 'group_id': member.group_id, 'amount': 50, 'receipt_number': 'RETRY-1'}
+        headers = {**data['headers'], HEADER: 'create-once'}
+
+    created = first.test_client().post('/api/contributions/', json=payload, headers=headers)
+    retried = second.test_client().post('/api/contributions/', json=payload, headers=headers)
+    assert created.status_code == retried.status_code == 201
+    assert retried.headers['Idempotent-Replayed'] == 'true'
+    with first.app_context():
+        assert db.session.scalar(db.select(db.func.count()).where(Contribution.receipt_number == 'RETRY-1')) == 1
+
+
+def test_keys_are_scoped_to_the_user(app, client):
+    data = seed_ledger()
+    other = auth_headers(data['users'][1])
+    member = data['members'][0]
+    payload = {'member_id': member.id, 'group_id': member.group_id, 'amount': 50}
+    assert client.post('/api/contributions/', json=payload, headers={**data['headers'], HEADER: 'k'}).status_code == 201
+    response = client.post('/api/contributions/', json=payload, headers={**other, HEADER: 'k'})
+    assert 'Idempotent-Replayed' not in response.headers
@@ -0,0 +1,204 @@
+from datetime import timedelta
+from decimal import Decimal
+import pytest
+from server.extensions import db
+from server.models import Contribution, ContributionRollup, Group, MemberStats
+from server.services.balances import (
+    find_balance_drift, member_stats_select, reconcile_group_balances, rollups_select
+)
+
+
+def money(value):
+    return Decimal(str(value or 0)).quantize(Decimal('0.01'))
+
+
+def stored_member_stats():
+    # Members whose last confirmed contribution went away keep a zeroed row
+    return {
+        stats.member_id: (money(stats.confirmed_total), stats.confirmed_count, stats.last_contribution_at)
+        for stats in db.session.scalars(db.select(MemberStats))
+        if stats.confirmed_count or money(stats.confirmed_total)
+    }
+
+
+def expected_member_stats():
+    return {
+        member_id: (money(total), count, last)
+        for member_id, total, count, last, _ in db.session.execute(member_stats_select())
+    }
+
+
+def stored_rollups():
+    return {
+        (rollup.group_id, rollup.member_id, str(rollup.day)): (money(rollup.confirmed_sum), rollup.confirmed_count)
+        for rollup in db.session.scalars(db.select(ContributionRollup))
+        if rollup.confirmed_count or money(rollup.confirmed_sum)
+    }
+
+
+def expected_rollups():
+    return {
+        (group_id, member_id, str(day)): (money(total), count)
+        for group_id, member_id, day, total, count in db.session.execute(rollups_select())
+    }
+
+
+def assert_ledger_consistent():
+    db.session.expire_all()
+    assert find_balance_drift() == []
+    assert stored_member_stats() == expected_member_stats()
+    assert stored_rollups() == expected_rollups()
+
+
+def contribution(member, status):
+    return db.session.scalars(
+        db.select(Contribution)
+        .where(Contribution.member_id == member.id, Contribution.status == status)
+        .order_by(Contribution.id)
+    ).first()
+
+
+def confirm_pending(ledger):
+    contribution(ledger['members'][0], 'pending').confirm()
+
+
+def reject_confirmed(ledger):
+    contribution(ledger['members'][0], 'confirmed').reject()
+
+
+def reconfirm_rejected(ledger):
+    contribution(ledger['members'][0], 'rejected').confirm()
+
+
+def edit_confirmed_amount(ledger):
+    contribution(ledger['members'][0], 'confirmed').amount = '250.75'
+
+
+def edit_pending_amount(ledger):
+    contribution(ledger['members'][0], 'pending').amount = '999.99'
+
+
+def move_confirmed_to_member(ledger):
+    contribution(ledger['members'][0], 'confirmed').member_id = ledger['members'][1].id
+
+
+def move_confirmed_to_group(ledger):
+    row, target = contribution(ledger['members'][0], 'confirmed'), ledger['members'][3]
+    row.group_id, row.member_id = target.group_id, target.id
+
+
+def move_confirming_and_editing(ledger):
+    row, target = contribution(ledger['members'][1], 'pending'), ledger['members'][4]
+    row.group_id, row.member_id = target.group_id, target.id
+    row.amount = '42.50'
+    row.status = 'confirmed'
+
+
+def backdate_confirmed(ledger):
+    row = contribution(ledger['members'][0], 'confirmed')
+    row.created_at = row.created_at - timedelta(days=3)
+
+
+def delete_confirmed(ledger):
+    db.session.delete(contribution(ledger['members'][0], 'confirmed'))
+
+
+def delete_pending(ledger):
+    db.session.delete(contribution(ledger['members'][2], 'pending'))
+
+
+def add_confirmed(ledger):
+    member = ledger['members'][2]
+    db.session.add(Contribution(member_id=member.id, group_id=member.group_id, amount='17.25', status='confirmed'))
+
+
+TRANSITIONS = {
+    'confirm': [confirm_pending],
+    'reject': [reject_confirmed],
+    'reject then confirm again': [reject_confirmed, reconfirm_rejected],
+    'edit confirmed amount': [edit_confirmed_amount],
+    'edit pending amount': [edit_pending_amount],
+    'move to another member': [move_confirmed_to_member],
+    'move to another group': [move_confirmed_to_group],
+    'move, edit and confirm at once': [move_confirming_and_editing],
+    'backdate': [backdate_confirmed],
+    'backdate the only confirmed': [delete_confirmed, backdate_confirmed],
+    'delete confirmed': [delete_confirmed],
+    'delete pending': [delete_pending],
+    'insert confirmed': [add_confirmed],
+    'everything in turn': [
+        confirm_pending, edit_confirmed_amount, reject_confirmed, reconfirm_rejected, move_confirmed_to_member,
+        move_confirmed_to_group, backdate_confirmed, move_confirming_and_editing, add_confirmed,
+        delete_pending, delete_confirmed,
+    ],
+}
+
+
+@pytest.mark.parametrize('steps', TRANSITIONS.values(), ids=TRANSITIONS.keys())
+def test_transitions_keep_balances_stats_and_rollups_in_step(ledger, steps):
+    assert_ledger_consistent()
+    for step in steps:
+        step(ledger)
+        db.session.commit()
+        assert_ledger_consistent()
+
+
+def test_rolled_back_transition_leaves_the_ledger_alone(ledger):
+    before = db.session.get(Group, ledger['groups'][0].id).current_amount
+    move_confirmed_to_group(ledger)
+    db.session.flush()
+    db.session.rollback()
+
+    assert db.session.get(Group, ledger['groups'][0].id).current_amount == before
+    assert_ledger_consistent()
+
+
+def drift_balances(ledger):
+    """Corrupt both balances behind the listeners' back."""
+    groups = Group.__table__
+    db.session.execute(groups.update().where(groups.c.id == ledger['groups'][0].id).values(current_amount=0))
+    db.session.execute(groups.update().where(groups.c.id == ledger['groups'][1].id).values(current_amount=1))
+    db.session.commit()
+
+
+def test_reconcile_reports_and_fixes_drift(ledger):
+    drift_balances(ledger)
+    first, second = (group.id for group in ledger['groups'])
+
+    assert reconcile_group_balances(fix=False) == [
+        (first, money(0), money(600)), (second, money(1), money(600))
+    ]
+    assert len(find_balance_drift()) == 2
+
+    assert len(reconcile_group_balances()) == 2
+    assert_ledger_consistent()
+    assert reconcile_group_balances() == []
+
+
+def test_reconcile_command(app, ledger):
+    drift_balances(ledger)
+    runner = app.test_cli_runner()
+
+    dry_run = runner.invoke(args=['balances', 'reconcile', '--dry-run'])
+    assert dry_run.exit_code == 0
+    assert f"Group {ledger['groups'][0].id}: stored 0.00 != confirmed 600.00" in dry_run.output
+    assert '2 drifted group balance(s) found.' in dry_run.output
+    assert len(find_balance_drift()) == 2
+
+    fix = runner.invoke(args=['balances', 'reconcile'])
+    assert fix.exit_code == 0 and '2 drifted group balance(s) fixed.' in fix.output
+    assert_ledger_consistent()
+
+    clean = runner.invoke(args=['balances', 'reconcile'])
+    assert 'All group balances match' in clean.output
+
+
+def test_rebuild_commands_restore_stats_and_rollups(app, ledger):
+    db.session.execute(MemberStats.__table__.update().values(confirmed_total=0, confirmed_count=0))
+    db.session.execute(ContributionRollup.__table__.delete())
+    db.session.commit()
+    runner = app.test_cli_runner()
+
+    assert runner.invoke(args=['balances', 'rebuild-member-stats']).exit_code == 0
+    assert runner.invoke(args=['balances', 'rebuild-rollups']).exit_code == 0
+    assert_ledger_consistent()
@@ -0,0 +1,48 @@
+import json
+import logging
+import pytest
+from sqlalchemy.exc import OperationalError
+from server.extensions import db
+from server.instrumentation import JsonFormatter
+from server.models import User
+from server.services.passwords import password_verifier
+
+
+def test_login_errors_are_logged_as_structured_exceptions(app, client, monkeypatch, caplog):
+    db.session.add(User(username='otieno', email='otieno@chama.test', password='password123'))
+    db.session.commit()
+
+    def broken_verify(*args, **kwargs):
+        raise RuntimeError('verifier down')
+
+    monkeypatch.setattr(password_verifier, 'verify', broken_verify)
+    # The 'server' logger does not propagate to root, where caplog listens
+    logging.getLogger('server').addHandler(caplog.handler)
+    try:
+        response = client.post('/api/auth/login', json={'username': 'otieno', 'password': 'password123'})
+    finally:
+        logging.getLogger('server').removeHandler(caplog.handler)
+
+    assert response.status_code == 500
+    [record] = [r for r in caplog.records if r.name == 'server.routes.auth']
+    assert record.exc_info and 'verifier down' in str(record.exc_info[1])
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry['message'] == 'Login failed' and 'RuntimeError' in entry['exc_info']
+
+
+def test_failed_statements_leave_no_timing_behind(make_app, caplog):
+    app = make_app(SLOW_QUERY_MS=0, SLOW_QUERY_EXPLAIN='false')
+    logging.getLogger('server').addHandler(caplog.handler)
+    try:
+        with app.app_context():
+            connection = db.session.connection()
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    connection.exec_driver_sql('SELECT * FROM no_such_table')
+            connection.exec_driver_sql('SELECT 1')
+            assert not [value for value in connection.info.values() if isinstance(value, list)]
+    finally:
+        logging.getLogger('server').removeHandler(caplog.handler)
+
+    [record] = [r for r in caplog.records if r.name == 'server.sql' and r.fields['statement'] == 'SELECT 1']
+    assert 0 <= record.fields['duration_ms'] < 1000
@@ -0,0 +1,110 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from server.extensions import db
+from server.models import Group, Member, User
+from server.models.group import GroupFull
+
+
+@pytest.fixture
+def race_app(make_app, database_url):
+    app = make_app(database_url=database_url)
+    with app.app_context():
+        db.session.execute(User.__table__.insert(), [
+            {'username': f'race_{i}', 'email': f'race_{i}@chama.test', 'password_hash': 'x', 'role': 'member',
+             'is_active': True, 'is_verified': False}
+            for i in range(24)
+        ])
+        db.session.commit()
+    yield app
+
+
+def new_group(app, name):
+    with app.app_context():
+        group = Group(name=name, admin_id=1, target_amount=1000)
+        db.session.add(group)
+        db.session.commit()
+        return group.id
+
+
+def join_concurrently(app, group_id, user_ids):
+    """Join ``group_id`` from one thread per user, all released at once; returns the outcomes."""
+    start = threading.Barrier(len(user_ids))
+
+    def join(user_id):
+        start.wait()
+        with app.app_context():
+            try:
+                for _ in range(50):
+                    try:
+                        db.session.add(Member(user_id=user_id, group_id=group_id))
+                        db.session.commit()
+                        return 'joined'
+                    except GroupFull:
+                        db.session.rollback()
+                        return 'full'
+                    except OperationalError:
+                        # SQLite "database is locked" / Postgres serialization failure
+                        db.session.rollback()
+                        time.sleep(0.01)
+                return 'gave up'
+            finally:
+                db.session.remove()
+
+    with ThreadPoolExecutor(len(user_ids)) as pool:
+        return list(pool.map(join, user_ids))
+
+
+def group_state(app, group_id):
+    with app.app_context():
+        group = db.session.get(Group, group_id)
+        where = Member.group_id == group_id
+        return {
+            'member_count': group.member_count,
+            'active_member_count': group.active_member_count,
+            'members': db.session.scalar(select(func.count(Member.id)).where(where)),
+            'active': db.session.scalar(select(func.count(Member.id)).where(where, Member.status == 'active')),
+            'admins': db.session.scalar(select(func.count(Member.id)).where(where, Member.is_admin.is_(True))),
+        }
+
+
+def test_simultaneous_first_joins_promote_exactly_one_admin(race_app):
+    for round_ in range(5):
+        group_id = new_group(race_app, f'Race {round_}')
+        users = [2 * round_ + 1, 2 * round_ + 2]
+        assert join_concurrently(race_app, group_id, users) == ['joined', 'joined']
+
+        state = group_state(race_app, group_id)
+        assert state['admins'] == 1
+        assert state['members'] == state['member_count'] == 2
+        assert state['active'] == state['active_member_count'] == 1
+
+
+def test_concurrent_joins_stop_at_the_cap(race_app):
+    race_app.config['GROUP_MEMBER_CAP'] = 5
+    group_id = new_group(race_app, 'Capped')
+
+    outcomes = join_concurrently(race_app, group_id, list(range(1, 17)))
+    assert outcomes.count('joined') == 5
+    assert outcomes.count('full') == 11
+
+    state = group_state(race_app, group_id)
+    assert state['members'] == state['member_count'] == 5
+    assert state['admins'] == 1
+
+
+def test_join_past_the_cap_raises_group_full(race_app):
+    race_app.config['GROUP_MEMBER_CAP'] = 2
+    group_id = new_group(race_app, 'Small')
+    with race_app.app_context():
+        for user_id in (1, 2):
+            db.session.add(Member(user_id=user_id, group_id=group_id))
+            db.session.commit()
+        db.session.add(Member(user_id=3, group_id=group_id))
+        with pytest.raises(GroupFull):
+            db.session.commit()
+        db.session.rollback()
+    assert group_state(race_app, group_id)['member_count'] == 2
@@ -0,0 +1,40 @@
+from sqlalchemy.dialects import postgresql
+from server.extensions import db
+from server.models import Member, User
+from server.services import member_search
+
+
+def add_member(username, email, group):
+    user = User(username=username, email=email, password='password123')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(Member(user_id=user.id, group_id=group.id, status='active'))
+    db.session.commit()
+
+
+def usernames(client, headers, term):
+    response = client.get('/api/member/search', query_string={'q': term}, headers=headers)
+    assert response.status_code == 200, response.data
+    return [row['username'] for row in response.get_json()]
+
+
+def test_fallback_search_matches_email(client, ledger):
+    assert usernames(client, ledger['headers'], 'user2@chama') == ['user2', 'user2']
+
+
+def test_like_wildcards_in_the_term_match_literally(client, ledger):
+    group = ledger['groups'][0]
+    add_member('amy_k', 'amy@chama.test', group)
+    add_member('amyxk', 'amyx@chama.test', group)
+    add_member('pct', '100%club@chama.test', group)
+
+    assert usernames(client, ledger['headers'], 'amy_k') == ['amy_k']
+    assert usernames(client, ledger['headers'], '100%') == ['pct']
+    assert usernames(client, ledger['headers'], '%') == ['pct']
+
+
+def test_postgres_search_escapes_the_pattern(app):
+    statement = member_search._postgres_search('a_b%', 10)
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert str(compiled).count('ESCAPE') == 3
+    assert '%a\\_b\\%%' in compiled.params.values()
@@ -0,0 +1,64 @@
+import os
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import text
+from server.extensions import db
+from server.models import Group, Member
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'server', 'migrations')
+SEARCH_TRIGGERS = {'user_search_ai', 'user_search_ad', 'user_search_au'}
+
+
+@pytest.fixture
+def migrated_app(make_app):
+    app = make_app(create_tables=False)
+    with app.app_context():
+        yield app
+
+
+def sqlite_triggers():
+    return set(db.session.scalars(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")))
+
+
+def test_full_upgrade_keeps_search_triggers(migrated_app):
+    upgrade(directory=MIGRATIONS)
+    assert SEARCH_TRIGGERS <= sqlite_triggers()
+
+
+def test_user_registered_after_upgrade_is_searchable(migrated_app):
+    from tests.conftest import auth_headers
+
+    upgrade(directory=MIGRATIONS)
+    client = migrated_app.test_client()
+    response = client.post('/api/auth/register', json={
+        'username': 'wanjiku', 'email': 'wanjiku@chama.test', 'password': 'password123'
+    })
+    assert response.status_code == 201, response.data
+    user_id = response.get_json()['user']['id']
+
+    group = Group(name='Search Group', admin_id=user_id, target_amount=1000)
+    db.session.add(group)
+    db.session.commit()
+    db.session.add(Member(user_id=user_id, group_id=group.id, status='active'))
+    db.session.commit()
+
+    from server.models import User
+    headers = auth_headers(db.session.get(User, user_id))
+    found = client.get('/api/member/search', query_string={'q': 'wanj'}, headers=headers).get_json()
+    assert [row['username'] for row in found] == ['wanjiku']
+
+
+def test_upgrade_restores_triggers_dropped_by_older_revisions(migrated_app):
+    upgrade(directory=MIGRATIONS, revision='a4c61e8d2f93')
+    for name in SEARCH_TRIGGERS:
+        db.session.execute(text(f'DROP TRIGGER {name}'))
+    db.session.execute(text(
+        "INSERT INTO users (username, email, password_hash, role, is_active, is_verified) "
+        "VALUES ('missed', 'missed@chama.test', 'x', 'member', 1, 0)"
+    ))
+    db.session.commit()
+
+    upgrade(directory=MIGRATIONS)
+    assert SEARCH_TRIGGERS <= sqlite_triggers()
+    matches = db.session.execute(text("SELECT rowid FROM user_search WHERE user_search MATCH '\"missed\"*'")).all()
+    assert len(matches) == 1
@@ -0,0 +1,61 @@
+import threading
+import pytest
+from server.extensions import db
+from server.models import User
+from server.services.passwords import password_verifier
+
+CREDENTIALS = {'username': 'wanjiru', 'password': 'password123'}
+
+
+@pytest.fixture
+def verifier():
+    yield password_verifier
+    if password_verifier._executor is not None:
+        password_verifier._executor.shutdown()
+        password_verifier._executor = None
+
+
+def register(client):
+    return client.post('/api/auth/register', json={**CREDENTIALS, 'email': 'wanjiru@chama.test'})
+
+
+def test_sync_workers_hash_inline(make_app, verifier):
+    app = make_app(GUNICORN_WORKER_CLASS='sync', PASSWORD_WORKERS=2)
+    client = app.test_client()
+
+    assert verifier.workers == 0 and verifier._slots is None
+    assert register(client).status_code == 201
+    assert client.post('/api/auth/login', json=CREDENTIALS).status_code == 200
+    assert verifier._executor is None
+
+
+def test_gthread_workers_hash_on_the_pool(make_app, verifier):
+    app = make_app(GUNICORN_WORKER_CLASS='gthread', PASSWORD_WORKERS=1)
+    client = app.test_client()
+
+    assert verifier.workers == 1
+    assert register(client).status_code == 201
+    assert client.post('/api/auth/login', json=CREDENTIALS).status_code == 200
+    assert client.post('/api/auth/login', json={**CREDENTIALS, 'password': 'wrong'}).status_code == 401
+    assert verifier._executor is not None
+
+
+def test_saturated_pool_sheds_register_and_login(make_app, verifier):
+    app = make_app(GUNICORN_WORKER_CLASS='gthread', PASSWORD_WORKERS=1)
+    client = app.test_client()
+    assert register(client).status_code == 201
+
+    verifier._slots = threading.BoundedSemaphore(1)
+    verifier._slots.acquire()  # another request holds the only slot
+    try:
+        login = client.post('/api/auth/login', json=CREDENTIALS)
+        second = client.post('/api/auth/register', json={
+            'username': 'kamau', 'email': 'kamau@chama.test', 'password': 'password123'
+        })
+    finally:
+        verifier._slots.release()
+
+    assert login.status_code == 429 and login.headers['Retry-After'] == '1'
+    assert second.status_code == 429 and second.headers['Retry-After'] == '1'
+    with app.app_context():
+        assert db.session.query(User).filter_by(username='kamau').count() == 0
@@ -0,0 +1,35 @@
+import pytest
+from server.query_budget import QueryBudgetExceeded, assert_max_queries
+
+
+def test_assert_max_queries_fails_when_over_budget(app):
+    from server.extensions import db
+    from sqlalchemy import text
+
+    with pytest.raises(QueryBudgetExceeded):
+        with assert_max_queries(1):
+            db.session.execute(text('SELECT 1'))
+            db.session.execute(text('SELECT 2'))
+
+
+# Statement budgets per list endpoint. The ledger fixture has six members and
+# eighteen contributions, so a per-row lazy load blows well past these.
+@pytest.mark.parametrize('path, budget', [
+    ('/api/member/', 2),
+    ('/api/member/group/{group_id}', 2),
+    ('/api/member/search?q=user', 3),
+    ('/api/contributions/?limit=50', 2),
+    ('/api/groups/', 1),
+    ('/api/users/', 1),
+])
+def test_list_endpoint_statement_budget(client, ledger, path, budget):
+    path = path.format(group_id=ledger['groups'][0].id)
+    with assert_max_queries(budget):
+        response = client.get(path, headers=ledger['headers'])
+    assert response.status_code == 200, response.data
+
+
+def test_request_budget_config_raises_under_testing(app, client, ledger):
+    app.config['SQL_QUERY_BUDGET'] = 0
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/api/groups/')
@@ -0,0 +1,51 @@
+import time
+from server.extensions import socketio
+from server.services.principal import issue_tokens
+from tests.conftest import seed_ledger
+
+
+def wait_for(client, done, timeout=2):
+    """Collect events until ``done(event)`` holds for one of them or ``timeout`` passes."""
+    deadline = time.monotonic() + timeout
+    received = []
+    while time.monotonic() < deadline:
+        received += client.get_received()
+        if any(done(event) for event in received):
+            return received
+        time.sleep(0.02)
+    return received
+
+
+def test_unpatched_process_defaults_to_threads(make_app):
+    make_app(SOCKETIO_ASYNC_MODE='')
+    assert socketio.async_mode == 'threading'
+
+
+def test_coalesced_balance_reaches_the_group_room(make_app):
+    app = make_app(SOCKETIO_ASYNC_MODE='', SOCKETIO_COALESCE_SECONDS=0.05)
+    with app.app_context():
+        data = seed_ledger()
+        group = data['groups'][0]
+        pending = next(c for c in group.contributions if c.status == 'pending')
+        group_id, pending_id = group.id, pending.id
+        token, _ = issue_tokens(data['users'][0])
+
+    socket = socketio.test_client(app, auth={'token': token})
+    assert socket.is_connected()
+    assert socket.emit('join_group', {'group_id': group_id}, callback=True) == {'joined': group_id}
+
+    response = app.test_client().post(f'/api/contributions/{pending_id}/confirm', headers=data['headers'])
+    assert response.status_code == 200
+    # A flush left over from seeding may land first with the older balance; the latest push wins
+    received = wait_for(socket, lambda event: event['name'] == 'group.balance'
+                        and event['args'][0]['current_amount'] == 700.0)
+    names = [event['name'] for event in received]
+    assert 'contribution.confirmed' in names
+    balances = [event['args'][0] for event in received if event['name'] == 'group.balance']
+    assert balances[-1] == {'group_id': group_id, 'current_amount': 700.0}
+    socket.disconnect()
+
+
+def test_refuses_connections_without_a_token(make_app):
+    app = make_app()
+    assert not socketio.test_client(app).is_connected()
@@ -0,0 +1,88 @@
+import pytest
+from server.extensions import db
+from server.models import Contribution
+from server.query_budget import assert_max_queries
+from server.services.cache import RedisBackend, response_cache
+from tests.conftest import seed_ledger
+
+
+@pytest.fixture
+def cached(make_app):
+    app = make_app(RESPONSE_CACHE_TTL=60)
+    with app.app_context():
+        data = seed_ledger()
+        yield app.test_client(), data
+
+
+def balance(client, group_id):
+    return client.get(f'/api/groups/{group_id}').get_json()['current_amount']
+
+
+def pending_contribution(group_id):
+    return db.session.scalars(
+        db.select(Contribution).where(Contribution.group_id == group_id, Contribution.status == 'pending')
+    ).first()
+
+
+def confirmed_contribution(group_id):
+    return db.session.scalars(
+        db.select(Contribution).where(Contribution.group_id == group_id, Contribution.status == 'confirmed')
+    ).first()
+
+
+def test_group_reads_are_served_from_cache(cached):
+    client, data = cached
+    group_id = data['groups'][0].id
+    first = client.get(f'/api/groups/{group_id}')
+    with assert_max_queries(0):
+        second = client.get(f'/api/groups/{group_id}')
+    assert second.get_json() == first.get_json()
+    assert client.get(f'/api/groups/{group_id}', headers={'If-None-Match': first.get_etag()[0]}).status_code == 304
+
+
+def test_confirm_invalidates_group_balance(cached):
+    client, data = cached
+    group_id = data['groups'][0].id
+    before = balance(client, group_id)
+    contribution_id = pending_contribution(group_id).id
+
+    assert client.post(f'/api/contributions/{contribution_id}/confirm', headers=data['headers']).status_code == 200
+    assert balance(client, group_id) == before + 100
+    assert any(
+        row['id'] == contribution_id and row['status'] == 'confirmed'
+        for row in client.get('/api/contributions/', query_string={'group_id': group_id}).get_json()['items']
+    )
+
+
+def test_update_invalidates_group_balance(cached):
+    client, data = cached
+    group_id = data['groups'][0].id
+    before = balance(client, group_id)
+    contribution_id = confirmed_contribution(group_id).id
+
+    assert client.put(f'/api/contributions/{contribution_id}', json={'amount': 250}).status_code == 200
+    assert balance(client, group_id) == before + 150
+
+
+def test_delete_invalidates_group_balance_and_listing(cached):
+    client, data = cached
+    group_id = data['groups'][0].id
+    before = balance(client, group_id)
+    listing = client.get('/api/contributions/', query_string={'group_id': group_id}).get_json()['items']
+    contribution_id = confirmed_contribution(group_id).id
+
+    assert client.delete(f'/api/contributions/{contribution_id}').status_code == 200
+    assert balance(client, group_id) == before - 100
+    after = client.get('/api/contributions/', query_string={'group_id': group_id}).get_json()['items']
+    assert len(after) == len(listing) - 1
+
+
+def test_local_cache_is_off_with_several_workers(make_app, shared_redis):
+    make_app(RESPONSE_CACHE_TTL=60, WEB_CONCURRENCY=3, JWT_BLOCKLIST_URL='redis://fake', IDEMPOTENCY_URL='redis://fake')
+    assert not response_cache.enabled
+
+
+def test_shared_cache_stays_on_with_several_workers(make_app, shared_redis):
+    make_app(RESPONSE_CACHE_TTL=60, WEB_CONCURRENCY=3, JWT_BLOCKLIST_URL='redis://fake',
+             IDEMPOTENCY_URL='redis://fake', RESPONSE_CACHE_URL='redis://fake')
+    assert response_cache.enabled and isinstance(response_cache.backend, RedisBackend)
@@ -0,0 +1,37 @@
+from server.extensions import db
+from server.models import Member, MemberStats
+from server.services.scores import recompute_contribution_scores
+from tests.conftest import seed_ledger
+
+
+def serialized_scores(client, headers):
+    return {row['id']: row['contribution_score'] for row in client.get('/api/member/', headers=headers).get_json()}
+
+
+def test_recompute_repairs_the_score_members_report(app, client):
+    data = seed_ledger()
+    headers = data['headers']
+    # seed_ledger confirms two contributions per member
+    assert set(serialized_scores(client, headers).values()) == {2}
+
+    db.session.execute(db.update(MemberStats).values(score=0))
+    db.session.commit()
+    assert set(serialized_scores(client, headers).values()) == {0}
+
+    chunks = []
+    changed = recompute_contribution_scores(chunk_size=1, progress=lambda *args: chunks.append(args))
+    assert changed == len(data['members'])
+    assert chunks[-1] == (len(data['groups']), len(data['groups']), changed)
+    assert set(serialized_scores(client, headers).values()) == {2}
+    assert recompute_contribution_scores() == 0
+
+
+def test_confirm_moves_the_reported_score(app, client):
+    data = seed_ledger()
+    member = data['members'][0]
+    pending = next(c for c in member.contributions if c.status == 'pending')
+    assert client.post(f'/api/contributions/{pending.id}/confirm', headers=data['headers']).status_code == 200
+
+    db.session.expire_all()
+    assert db.session.get(Member, member.id).serialize()['contribution_score'] == 3
+    assert recompute_contribution_scores() == 0
@@ -0,0 +1,77 @@
+import time
+import fakeredis
+import pytest
+from server.services import token_blocklist as blocklist_module
+from server.services.token_blocklist import MemoryBlocklist, RedisBlocklist
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(blocklist_module.time, 'time', lambda: now[0])
+    return now
+
+
+def test_memory_revocation_lasts_until_token_expiry(clock):
+    store = MemoryBlocklist()
+    store.revoke('jti-1', clock[0] + 60)
+    clock[0] += 59
+    assert store.is_revoked('jti-1')
+    clock[0] += 2
+    assert not store.is_revoked('jti-1')
+    assert len(store) == 0
+
+
+def test_memory_store_never_evicts_live_revocations(clock):
+    store = MemoryBlocklist(maxsize=3)
+    for i in range(10):
+        store.revoke(f'jti-{i}', clock[0] + 3600)
+    assert all(store.is_revoked(f'jti-{i}') for i in range(10))
+
+
+def test_memory_store_sweeps_expired_entries_on_revoke(clock):
+    store = MemoryBlocklist()
+    store.revoke('short', clock[0] + 10)
+    store.revoke('long', clock[0] + 1000)
+    clock[0] += 20
+    store.revoke('new', clock[0] + 1000)
+    assert len(store) == 2
+    assert store.is_revoked('long') and not store.is_revoked('short')
+
+
+def test_redis_revocation_is_shared_and_expires_with_the_token():
+    server = fakeredis.FakeServer()
+    worker_a = RedisBlocklist(fakeredis.FakeRedis(server=server))
+    worker_b = RedisBlocklist(fakeredis.FakeRedis(server=server))
+
+    worker_a.revoke('jti-1', time.time() + 120)
+    assert worker_b.is_revoked('jti-1')
+    assert not worker_b.is_revoked('jti-2')
+    assert 0 < worker_b.client.ttl(worker_b.prefix + 'jti-1') <= 121
+
+
+def test_memory_blocklist_is_refused_with_several_workers(make_app):
+    with pytest.raises(RuntimeError, match='JWT_BLOCKLIST_URL'):
+        make_app(WEB_CONCURRENCY=3)
+
+
+def test_logged_out_token_is_rejected_through_redis(make_app, shared_redis):
+    from server.extensions import db
+    from server.models import User
+
+    app = make_app(JWT_BLOCKLIST_URL='redis://fake', IDEMPOTENCY_URL='redis://fake', WEB_CONCURRENCY=3)
+    client = app.test_client()
+    with app.app_context():
+        db.session.add(User(username='amina', email='amina@chama.test', password='password123'))
+        db.session.commit()
+
+    tokens = client.post('/api/auth/login', json={'username': 'amina', 'password': 'password123'}).get_json()
+    headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+    response = client.post('/api/auth/logout', headers=headers, json={'refresh_token': tokens['refresh_token']})
+    assert response.status_code == 200
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+    refresh = {'Authorization': f"Bearer {tokens['refresh_token']}"}
+    assert client.post('/api/auth/refresh', headers=refresh).status_code == 401
+    assert len(shared_redis.keys('chama:revoked:*')) == 2